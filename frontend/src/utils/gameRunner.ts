@@ -5,6 +5,7 @@ export class GameRunner {
   private gameId: string | null = null
   private eventSource: EventSource | null = null
   private terminal: any
+  private streamedThinking: Set<string> = new Set()
 
   constructor(terminal: any) {
     this.terminal = terminal
@@ -67,6 +68,9 @@ export class GameRunner {
       case 'round_started':
         this.formatRoundStart(event.data)
         break
+      case 'player_thinking_delta':
+        this.formatThinkingDelta(event.data)
+        break
       case 'player_thinking':
         this.formatPlayerThinking(event.data)
         break
@@ -95,7 +99,20 @@ export class GameRunner {
     this.writeLine(`\n📍 Round ${data.round} Started`)
   }
 
+  private formatThinkingDelta(data: any): void {
+    if (data.index === 0) {
+      this.writeLine(`\n🤔 ${data.player} is thinking...`)
+      this.streamedThinking.add(data.player)
+    }
+    this.terminal?.write(data.delta.replace(/\n/g, '\r\n  '))
+  }
+
   private formatPlayerThinking(data: any): void {
+    // Thinking already shown live via player_thinking_delta
+    if (this.streamedThinking.delete(data.player)) {
+      this.writeLine('')
+      return
+    }
     this.writeLine(`\n🤔 ${data.player} is thinking...`)
     if (data.thinking) {
       this.writeLine(data.thinking.split('\n').map((line: string) => `  ${line}`).join('\n'))
@@ -1,20 +1,54 @@
 import logging
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, List, Optional
 import asyncio
 import json
 from datetime import datetime
 from src.utils.json_utils import game_json_dumps
 from fastapi import Request
 import time
+from .types import GameEventType
 
 logger = logging.getLogger(__name__)
 
+# Sent to live subscribers only: a thinking delta is superseded by its turn's player_thinking event
+TRANSIENT_EVENTS = (GameEventType.PLAYER_THINKING_DELTA.value,)
+
 class GameEventManager:
-    def __init__(self, game_id: str):
+    """Fans game events out to SSE subscribers
+
+    Games emit as fast as they compute. Each event is stamped with a
+    ``playback_offset``: seconds since the first event, plus the pauses the
+    runtime asked for with ``pace``. Subscribers replay events on that
+    timeline, so pacing happens per connection instead of in the game.
+    Every emitted event except ``TRANSIENT_EVENTS`` is also kept in
+    ``history`` so a game can be checkpointed and resumed with its event
+    log intact, without the history growing with each streamed chunk.
+    """
+
+    def __init__(self, game_id: str, history: Optional[List[Dict[str, Any]]] = None):
         self.game_id = game_id
         self.subscribers = []
+        self.history: List[Dict[str, Any]] = list(history or [])
         self.logger = logging.getLogger(f"event_manager_{game_id}")
+        self._clock_started: Optional[float] = None
+        # A resumed game continues the playback timeline where it stopped
+        self._playback_delay = self.history[-1].get("playback_offset", 0.0) if self.history else 0.0
+
+    def pace(self, seconds: float):
+        """Suggest a pause of ``seconds`` before the next event, without sleeping"""
+        self._playback_delay += seconds
+
+    def playback_offset(self) -> float:
+        """Suggested playback time for an event emitted now"""
+        now = time.monotonic()
+        if self._clock_started is None:
+            self._clock_started = now
+        return round(now - self._clock_started + self._playback_delay, 3)
     
+    def get_event_history(self) -> List[Dict[str, Any]]:
+        """All events emitted so far, oldest first"""
+        return list(self.history)
+
     def _format_sse_event(self, event: Dict[str, Any]) -> str:
         """Format event as SSE data"""
         event_json = game_json_dumps(event)
@@ -27,10 +61,15 @@ class GameEventManager:
             "type": event_type,
             "name": event_name,
             "data": data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "playback_offset": self.playback_offset()
         }
-        
-        # Send to all subscribers
+        await self.publish(event)
+
+    async def publish(self, event: Dict[str, Any]):
+        """Record an already built event and send it to all subscribers (replays use this directly)"""
+        if event.get("name") not in TRANSIENT_EVENTS:
+            self.history.append(event)
         for queue in self.subscribers:
             await queue.put(event)
     
@@ -46,10 +85,20 @@ class GameEventManager:
         """Emit an error event"""
         await self.emit_system("error", {"error": error_message})
     
-    async def subscribe(self, request: Request) -> AsyncGenerator[str, None]:
-        """Subscribe to game events"""
+    async def subscribe(self, request: Request, paced: bool = True, from_start: bool = False) -> AsyncGenerator[str, None]:
+        """Subscribe to game events
+
+        When ``paced``, events are held back until their playback offset
+        (relative to the first event this subscriber sees); otherwise they
+        are sent as soon as they are emitted. With ``from_start`` the events
+        emitted before subscribing are sent first.
+        """
         try:
             queue = asyncio.Queue()
+            anchor: Optional[float] = None
+            if from_start:
+                for event in self.history:
+                    queue.put_nowait(event)
             self.subscribers.append(queue)
             self.logger.info(f"New subscriber added. Total subscribers: {len(self.subscribers)}")
             
@@ -65,6 +114,14 @@ class GameEventManager:
                         event = await asyncio.wait_for(queue.get(), timeout=30.0)
                         if event is None:  # Shutdown signal
                             break
+
+                        if paced:
+                            now = time.monotonic()
+                            if anchor is None:
+                                anchor = now - event["playback_offset"]
+                            wait = anchor + event["playback_offset"] - now
+                            if wait > 0:
+                                await asyncio.sleep(wait)
                         
                         # Format and send event - remove double data: wrapping
                         event_data = json.dumps(event)
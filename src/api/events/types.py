@@ -4,6 +4,7 @@ class GameEventType(Enum):
     # Game lifecycle events
     GAME_CREATED = "game_created"
     GAME_STARTED = "game_started"
+    GAME_RESUMED = "game_resumed"
     GAME_ENDED = "game_ended"
     
     # Round events
@@ -12,6 +13,7 @@ class GameEventType(Enum):
     
     # Player events
     PLAYER_THINKING = "player_thinking"
+    PLAYER_THINKING_DELTA = "player_thinking_delta"
     PLAYER_ACTION = "player_action"
     
     # System events
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, HTTPException
+from typing import Dict, Any, Optional
+import logging
+from src.utils.llm_providers.breaker import breaker_stats
+from src.utils.llm_providers.context_cache import get_context_cache
+from src.utils.llm_providers.limiter import limiter_stats
+from src.utils.llm_providers.metrics import get_metrics
+from src.utils.llm_providers.registry import get_registry
+from src.utils.llm_providers.tracing import get_trace_recorder
+
+logger = logging.getLogger("llm_router")
+
+router = APIRouter(prefix="/llm", tags=["llm"])
+
+@router.get("/breakers")
+async def get_breakers() -> Dict[str, Any]:
+    """Circuit breaker state per provider/model"""
+    return {"breakers": breaker_stats()}
+
+@router.get("/breakers/{name}")
+async def get_breaker_state(name: str) -> Dict[str, Any]:
+    """Circuit breaker state for one provider/model, e.g. ``gemini:gemini-2.0-flash``"""
+    breakers = breaker_stats()
+    if name not in breakers:
+        raise HTTPException(status_code=404, detail=f"No circuit breaker named {name}")
+    return breakers[name]
+
+@router.get("/health")
+async def get_llm_health() -> Dict[str, Any]:
+    """Breakers, rate limiters, context cache and provider pool in one view"""
+    recorder = get_trace_recorder()
+    return {
+        "breakers": breaker_stats(),
+        "limiters": limiter_stats(),
+        "context_cache": get_context_cache().stats(),
+        "registry": get_registry().stats(),
+        "tracing": recorder.stats() if recorder else None
+    }
+
+@router.get("/usage/{game_id}")
+async def get_game_usage(game_id: str) -> Dict[str, Any]:
+    """Tokens, latency and cost so far for a running game"""
+    return get_metrics().game_summary(game_id)
+
+@router.get("/traces")
+async def get_traces(game_id: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+    """Recently sampled prompt/response traces, optionally for one game"""
+    recorder = get_trace_recorder()
+    if recorder is None:
+        raise HTTPException(status_code=404, detail="LLM tracing is disabled")
+    return {"traces": recorder.recent(game_id, limit), "stats": recorder.stats()}
@@ -1,14 +1,16 @@
 from fastapi import APIRouter, HTTPException, Request, BackgroundTasks
-from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 from pydantic import BaseModel, ValidationError
 from typing import Dict, Optional, List, Any, AsyncGenerator
+from collections import OrderedDict
 import uuid
 import logging
 import asyncio
 import json
 from concurrent.futures import ThreadPoolExecutor
-from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime, ROUND_MODES
+from src.spaces.merchants_1o1.runtime.replay import GameReplay, ReplayError
+from src.core.checkpoint import get_checkpoint_store, get_recording_store
 from datetime import datetime
 from src.utils.logger import GameLogger
 from src.utils.json_utils import game_json_dumps
@@ -38,6 +40,9 @@ os.makedirs(GAME_LOGS_DIR, exist_ok=True)
 
 # Store active games
 active_games: Dict[str, tuple[NegotiationRuntime, GameEventManager]] = {}
+# Replays are kept apart from live games; the oldest are dropped beyond MAX_REPLAYS
+MAX_REPLAYS = 32
+active_replays: "OrderedDict[str, tuple[GameReplay, GameEventManager]]" = OrderedDict()
 game_loggers = {}
 
 # Initialize fileverse client
@@ -78,6 +83,12 @@ class GameResponse(BaseModel):
 class GameStartRequest(BaseModel):
     strategy_advisory: str
 
+class ReplayRequest(BaseModel):
+    game_id: Optional[str] = None  # a recorded (or still active) game to replay
+    events: Optional[List[Dict[str, Any]]] = None  # or an event stream supplied directly
+    speed: float = 1.0  # playback multiplier; 0 plays as fast as possible
+    verify: bool = True
+
 def log_event(event_type: str, event_name: str, data: Dict[str, Any]):
     """Format and log game events"""
     timestamp = data.get('timestamp', '')
@@ -220,8 +231,8 @@ async def game_stream(game: NegotiationRuntime) -> AsyncGenerator[str, None]:
                     'type': 'game_over',
                     'winner': result['winner'],
                     'final_standings': result['final_statuses'],
-                    'conversation_history': result['conversation_memory'].messages,
-                    'transfer_history': result['conversation_memory'].transfers
+                    'conversation_history': result['conversation_memory']['messages'],
+                    'transfer_history': result['conversation_memory']['transfers']
                 }
                 yield f"data: {json.dumps(completion_event)}\n\n"
 
@@ -246,9 +257,20 @@ async def game_stream(game: NegotiationRuntime) -> AsyncGenerator[str, None]:
 @router.post("/games")
 async def create_game(
     background_tasks: BackgroundTasks,
-    debug: Optional[bool] = False
+    debug: Optional[bool] = False,
+    combined_turns: Optional[bool] = None,
+    round_mode: Optional[str] = None
 ):
-    """Create a new game"""
+    """Create a new game
+
+    ``combined_turns`` asks each player for thinking and action in one
+    structured LLM call (defaults to ``spaces.merchants_1o1.combined_turns``).
+    ``round_mode=simultaneous`` has both players decide from the round-start
+    state at the same time, with their transfers applied together.
+    """
+    if round_mode is not None and round_mode not in ROUND_MODES:
+        raise HTTPException(400, f"round_mode must be one of: {', '.join(ROUND_MODES)}")
+
     # Set debug mode in environment BEFORE creating anything
     if debug:
         os.environ['DEBUG_MODE'] = 'true'
@@ -261,7 +283,12 @@ async def create_game(
     game_logger = GameLogger(game_id, log_dir=GAME_LOGS_DIR)
     
     # Initialize game with event manager
-    game = NegotiationRuntime(logger=game_logger, event_manager=event_manager)
+    game = NegotiationRuntime(
+        logger=game_logger,
+        event_manager=event_manager,
+        combined_turns=combined_turns,
+        round_mode=round_mode
+    )
     active_games[game_id] = (game, event_manager)
     
     # Log the actual number of rounds
@@ -273,6 +300,8 @@ async def create_game(
         "status": "created",
         "debug_mode": debug,
         "max_rounds": game.max_rounds,
+        "turn_mode": game.turn_mode,
+        "round_mode": game.round_mode,
         "players": {
             "Marco Polo": {"coins": 10},
             "Trader Joe": {"coins": 10}
@@ -282,7 +311,9 @@ async def create_game(
     return {
         "game_id": game_id, 
         "debug_mode": debug,
-        "max_rounds": game.max_rounds
+        "max_rounds": game.max_rounds,
+        "turn_mode": game.turn_mode,
+        "round_mode": game.round_mode
     }
 
 @router.post("/games/{game_id}/start")
@@ -312,25 +343,115 @@ async def start_game(
         
         return {"status": "Game started successfully"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting game: {str(e)}")
         raise HTTPException(500, f"Error starting game: {str(e)}")
 
+@router.post("/games/{game_id}/resume")
+async def resume_game(game_id: str, background_tasks: BackgroundTasks):
+    """Resume a game from its last checkpoint, continuing after the last completed turn"""
+    existing = active_games.get(game_id)
+    if existing and existing[0].state != "error":
+        raise HTTPException(409, "Game is still active")
+
+    store = get_checkpoint_store()
+    checkpoint = store.load(game_id) if store else None
+    if checkpoint is None:
+        raise HTTPException(404, "No checkpoint found for game")
+
+    # Keep current subscribers attached when the game failed in this process
+    event_manager = existing[1] if existing else GameEventManager(game_id, history=checkpoint.get("events"))
+    game = NegotiationRuntime.from_checkpoint(
+        checkpoint,
+        logger=GameLogger(game_id, log_dir=GAME_LOGS_DIR),
+        event_manager=event_manager,
+        checkpoints=store
+    )
+    active_games[game_id] = (game, event_manager)
+    background_tasks.add_task(game.run_game)
+    logger.info(f"Resuming game {game_id} at round {game.round} ({game.turns_done} turns done)")
+
+    return {
+        "game_id": game_id,
+        "status": "resumed",
+        "round": game.round,
+        "turns_done": game.turns_done,
+        "max_rounds": game.max_rounds,
+        "turn_mode": game.turn_mode,
+        "round_mode": game.round_mode
+    }
+
+@router.post("/replays")
+async def create_replay(request: ReplayRequest):
+    """Replay a recorded game through the normal events endpoint, with no LLM calls
+
+    The recording's transfers are first re-applied through the game rules;
+    a recording whose standings do not follow is refused unless
+    ``verify`` is false. Subscribe to ``/games/{game_id}/events`` with the
+    returned id to watch it at ``speed``.
+    """
+    events = request.events
+    if events is None and request.game_id:
+        store = get_recording_store()
+        recording = store.load(request.game_id) if store else None
+        if recording:
+            events = recording.get("events")
+        elif request.game_id in active_games:
+            events = active_games[request.game_id][1].get_event_history()
+        elif request.game_id in active_replays:
+            events = active_replays[request.game_id][0].events
+    if not events:
+        raise HTTPException(404 if request.game_id else 400, "No recorded events to replay")
+
+    try:
+        replay = GameReplay(events, speed=request.speed)
+        report = replay.verify() if request.verify else None
+    except (ReplayError, KeyError, TypeError) as e:
+        raise HTTPException(400, f"Unreplayable recording: {str(e)}")
+    if report and not report["ok"]:
+        raise HTTPException(422, {"message": "Recorded standings do not follow from the transfers", "verification": report})
+
+    event_manager = GameEventManager(replay.game_id)
+    active_replays[replay.game_id] = (replay, event_manager)
+    while len(active_replays) > MAX_REPLAYS:
+        evicted, _ = active_replays.popitem(last=False)
+        logger.info(f"Evicted replay {evicted}")
+    await replay.play(event_manager)  # subscribers pace the events by their playback offsets
+
+    return {
+        "game_id": replay.game_id,
+        "source_game_id": request.game_id or replay.source_game_id,
+        "events": len(events),
+        "speed": request.speed,
+        "verification": report
+    }
+
 def get_event_manager(game_id: str) -> GameEventManager:
-    """Get or create event manager for a game"""
-    if game_id not in active_games:
+    """Get or create event manager for a game or replay"""
+    entry = active_games.get(game_id) or active_replays.get(game_id)
+    if entry is None:
         raise HTTPException(404, "Game not found")
-        
-    game, event_manager = active_games[game_id]
+
+    game, event_manager = entry
     return event_manager
 
 @router.get("/games/{game_id}/events")
 async def stream_game_events(
     game_id: str,
     request: Request,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    paced: bool = True,
+    from_start: bool = False
 ) -> EventSourceResponse:
-    """Stream game events using Server-Sent Events (SSE)"""
+    """Stream game events using Server-Sent Events (SSE)
+
+    Events are replayed on their ``playback_offset`` timeline; pass
+    ``paced=false`` to receive them as soon as they are produced and pace
+    on the client instead. ``from_start`` first sends the events emitted
+    before connecting; replays always stream from the start.
+    """
     try:
         # Get or create event manager for this game
         event_manager = get_event_manager(game_id)
@@ -340,7 +461,11 @@ async def stream_game_events(
         
         # Return SSE response
         return EventSourceResponse(
-            event_manager.subscribe(request),
+            event_manager.subscribe(
+                request,
+                paced=paced,
+                from_start=from_start or game_id in active_replays
+            ),
             media_type="text/event-stream",
             headers={
                 'Cache-Control': 'no-cache',
@@ -405,15 +530,19 @@ async def run_game(game_id: str):
             
             # Player 1's turn
             logger.info("Processing Player 1's turn")
-            for event in game.process_player1_turn():
+            for event in await game.aprocess_player1_turn():
+                if event.get("emitted"):
+                    continue  # a concurrent turn already sent it as its call completed
                 await event_manager.emit(event["type"], event["name"], event["data"])
-                await asyncio.sleep(0.5)  # Add delay between events
+                event_manager.pace(0.5)  # Playback pause between events
             
             # Player 2's turn
             logger.info("Processing Player 2's turn")
-            for event in game.process_player2_turn():
+            for event in await game.aprocess_player2_turn():
+                if event.get("emitted"):
+                    continue  # a concurrent turn already sent it as its call completed
                 await event_manager.emit(event["type"], event["name"], event["data"])
-                await asyncio.sleep(0.5)  # Add delay between events
+                event_manager.pace(0.5)  # Playback pause between events
             
             # Round end
             await event_manager.emit_system("round_ended", {
@@ -424,7 +553,7 @@ async def run_game(game_id: str):
             
             round_num += 1
             game.round = round_num  # Update round number
-            await asyncio.sleep(1)  # Pause between rounds
+            event_manager.pace(1)  # Playback pause between rounds
         
         # Game end
         logger.info("Game completed")
@@ -489,12 +618,13 @@ async def run_game(game_id: str):
 async def get_game_status(game_id: str):
     logger.info(f"Getting status for game: {game_id}")
     
-    if game_id not in active_games:
+    entry = active_games.get(game_id) or active_replays.get(game_id)
+    if entry is None:
         logger.warning(f"Game not found: {game_id}")
         raise HTTPException(404, "Game not found")
     
     try:
-        game, _ = active_games[game_id]
+        game, _ = entry
         standings = game.get_player_statuses()
         logs = game.get_logs()
         
@@ -540,57 +670,6 @@ async def run_game(game_id: str):
         logger.error(f"Error running game: {str(e)}")
         raise HTTPException(500, f"Error running game: {str(e)}")
 
-@router.get("/stream/{game_id}")
-async def stream_game(game_id: str, request: Request):
-    async def event_generator():
-        game_logger = GameLogger(game_id, log_dir=GAME_LOGS_DIR)
-        runtime = NegotiationRuntime(logger=game_logger)  # Pass only the logger
-        
-        try:
-            # Start game
-            event = game_logger.log_game_start({
-                "Marco Polo": {"coins": 10},
-                "Trader Joe": {"coins": 10}
-            })
-            yield f"data: {json.dumps(event)}\n\n"
-            
-            # Run game
-            for round_num in range(1, 6):
-                # Round start
-                event = game_logger.log_round_start(round_num, runtime.get_player_status())
-                yield f"data: {json.dumps(event)}\n\n"
-                
-                # Player 1's turn
-                events = runtime.process_player1_turn()
-                for event in events:
-                    yield f"data: {json.dumps(event)}\n\n"
-                    await asyncio.sleep(0.1)  # Small delay for readability
-                
-                # Player 2's turn
-                events = runtime.process_player2_turn()
-                for event in events:
-                    yield f"data: {json.dumps(event)}\n\n"
-                    await asyncio.sleep(0.1)
-                
-                # Round summary
-                event = game_logger.log_round_summary(round_num, runtime.get_round_summary())
-                yield f"data: {json.dumps(event)}\n\n"
-                
-                if round_num < 5:
-                    await asyncio.sleep(1)  # Pause between rounds
-            
-            # Game end
-            event = game_logger.log_game_end()
-            yield f"data: {json.dumps(event)}\n\n"
-            
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'content': str(e)})}\n\n"
-
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream"
-    )
-
 async def upload_game_summary(game_id: str, events: list) -> dict:
     """Upload game summary to Fileverse"""
     try:
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.utils.llm_providers.metrics import get_metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    """LLM call counters, token totals and latency histograms for Prometheus"""
+    return PlainTextResponse(get_metrics().render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -2,7 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import logging
-from .routers import merchants_1o1
+from .routers import merchants_1o1, llm, metrics
+from src.utils.config import Config
+from src.utils.llm_providers.registry import get_registry
+import asyncio
 
 # Configure logging
 logging.basicConfig(
@@ -33,10 +36,14 @@ app.add_middleware(
 
 # Include routers
 app.include_router(merchants_1o1.router)
+app.include_router(llm.router)
+app.include_router(metrics.router)
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Starting up Silly Merchants API server")
+    if Config().network_config.get('pool', {}).get('prewarm'):
+        await asyncio.to_thread(get_registry().prewarm)
 
 def run_server():
     """Run the FastAPI server"""
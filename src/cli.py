@@ -2,9 +2,9 @@ import os
 import subprocess
 from pathlib import Path
 from dotenv import load_dotenv
-from .spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime as OneOnOneTrading
 from .spaces.merchants_multi.runtime.negotiation import NegotiationScene as MultiplayerTrading
 from .core.config import GameConfig
+from .simulation import run_batch
 
 def run_1o1():
     """Run 1v1 trading game"""
@@ -15,9 +15,8 @@ def run_1o1():
     print(f"Max Rounds: {config.max_rounds}")
     print(f"Initial Balance: {config.initial_balance}")
     
-    # Create and run game - players are initialized in constructor
-    game = OneOnOneTrading(max_rounds=config.max_rounds)
-    result = game.run()
+    # Run one headless game with the configured providers
+    result = run_batch(space="merchants_1o1", games=1, concurrency=1, provider="real", rounds=config.max_rounds)["games"][0]
     
     # Print final results
     print("\nFinal Results:")
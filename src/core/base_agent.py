@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Union
 from ..utils.llm_providers import BaseLLMProvider
+from ..utils.llm_providers.prompt import Prompt
 
 class BaseAgent(ABC):
     def __init__(self, name: str, model: str, backup_model: str, llm_provider: BaseLLMProvider):
@@ -15,14 +16,20 @@ class BaseAgent(ABC):
         """Define the agent's base role, personality, and expertise"""
         pass
     
-    def generate_response(self, context_prompt: str, system_prompt: str = None, **kwargs) -> str:
-        """Generate response by combining role prompt with context-specific prompt"""
-        full_prompt = f"{self._role_prompt}\n\n{context_prompt}"
+    def generate_response(self, context_prompt: Union[str, Prompt], system_prompt: str = None, **kwargs) -> str:
+        """Generate response by combining role prompt with context-specific prompt
+
+        The role prompt (or a Prompt's static part) is sent as the static
+        prefix so providers with context caching only process it once.
+        """
+        if isinstance(context_prompt, Prompt):
+            static_prefix, prompt = context_prompt.static, context_prompt.dynamic
+        else:
+            static_prefix, prompt = self._role_prompt, context_prompt
         return self.llm.generate(
-            full_prompt, 
-            self.model, 
-            self.backup_model, 
+            prompt,
             system_prompt=system_prompt,
+            static_prefix=static_prefix,
             **kwargs
         )
 
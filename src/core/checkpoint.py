@@ -0,0 +1,87 @@
+from typing import Dict, List, Any, Optional
+import json
+import logging
+import os
+import threading
+from src.utils.config import Config
+from src.utils.json_utils import game_json_dumps
+
+logger = logging.getLogger(__name__)
+
+class CheckpointStore:
+    """Latest checkpoint of each in-flight game, one JSON file per game
+
+    Writes go to a temporary file that is then renamed over the previous
+    checkpoint, so a worker dying mid-write leaves the last complete turn
+    on disk.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, game_id: str) -> str:
+        if not game_id or os.sep in game_id or game_id.startswith("."):
+            raise ValueError(f"Invalid game id: {game_id!r}")
+        return os.path.join(self.directory, f"{game_id}.json")
+
+    def save(self, game_id: str, state: Dict[str, Any]):
+        path = self._path(game_id)
+        tmp_path = f"{path}.tmp"
+        payload = game_json_dumps(state)
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+    def load(self, game_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(game_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.error(f"Unreadable checkpoint for game {game_id}: {str(e)}")
+            return None
+
+    def delete(self, game_id: str):
+        try:
+            os.remove(self._path(game_id))
+        except FileNotFoundError:
+            pass
+
+    def list_games(self) -> List[str]:
+        """Ids of games with a checkpoint on disk"""
+        return sorted(name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json"))
+
+# Default for ``checkpoints=`` / ``recordings=`` arguments: use the configured store (None turns it off)
+CONFIGURED_STORE: Any = object()
+
+_store: Optional[CheckpointStore] = None
+_recordings: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """Get the process-wide checkpoint store from ``game.checkpoints`` (None when disabled)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            settings = Config().game_config.get('checkpoints', {}) or {}
+            if not settings.get('enabled', True):
+                return None
+            _store = CheckpointStore(settings.get('directory', os.path.join('logs', 'checkpoints')))
+        return _store
+
+def get_recording_store() -> Optional[CheckpointStore]:
+    """Get the store of finished games' event streams from ``game.recordings`` (None when disabled)"""
+    global _recordings
+    with _store_lock:
+        if _recordings is None:
+            settings = Config().game_config.get('recordings', {}) or {}
+            if not settings.get('enabled', True):
+                return None
+            _recordings = CheckpointStore(settings.get('directory', os.path.join('logs', 'recordings')))
+        return _recordings
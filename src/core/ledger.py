@@ -0,0 +1,230 @@
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from array import array
+import threading
+
+class LedgerError(ValueError):
+    """A transfer (or batch) the ledger refuses to apply"""
+
+def _whole(amount: Any) -> Any:
+    """Whole-number floats from parsed JSON (``3.0``) count as coins; anything else is left for validation"""
+    return int(amount) if isinstance(amount, float) and amount.is_integer() else amount
+
+def check_transfer(sender: str, recipient: str, amount: int, balances: Dict[str, int]) -> Tuple[bool, str]:
+    """Validate one transfer against ``balances``; the reason explains a refusal"""
+    amount = _whole(amount)
+    if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0:
+        return False, "Transfer amount must be positive"
+    if sender not in balances:
+        return False, f"Invalid sender: {sender}"
+    if recipient not in balances:
+        return False, f"Invalid recipient: {recipient}"
+    if sender == recipient:
+        return False, f"{sender} cannot transfer to themselves"
+    if amount > balances[sender]:
+        return False, f"{sender} doesn't have enough coins for this transfer"
+    return True, "Transfer valid"
+
+class LedgerEntry:
+    """One applied balance change; ``sender`` is None for an adjustment (a balance set directly)"""
+
+    __slots__ = ("seq", "round", "sender", "recipient", "amount")
+
+    def __init__(self, seq: int, round_num: int, sender: Optional[str], recipient: str, amount: int):
+        self.seq = seq
+        self.round = round_num
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+
+    @property
+    def is_transfer(self) -> bool:
+        return self.sender is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'seq': self.seq,
+            'round': self.round,
+            'sender': self.sender,
+            'recipient': self.recipient,
+            'amount': self.amount
+        }
+
+class CoinLedger:
+    """Event-sourced coin balances shared by the merchants spaces
+
+    Every change is appended to ``entries`` and applied to an array of
+    balances indexed by seat, so balance lookups are O(1) and nothing
+    ever rescans the log. ``close_round`` freezes a copy of the balances,
+    making end-of-round standings an O(1) lookup too. Agents attached
+    with ``for_agents`` read and write their ``coins`` through the ledger.
+    """
+
+    def __init__(self, balances: Dict[str, int]):
+        self.players: List[str] = list(balances)
+        self._index = {name: seat for seat, name in enumerate(self.players)}
+        self.initial: Dict[str, int] = dict(balances)
+        self._balances = array('q', balances.values())
+        self.entries: List[LedgerEntry] = []
+        self._by_round: Dict[int, List[LedgerEntry]] = {}
+        # Balances at the end of each closed round; round 0 is the start of the game
+        self._closed: List[array] = [array('q', self._balances)]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_agents(cls, agents: Dict[str, Any]) -> "CoinLedger":
+        """Ledger seeded from the agents' current coins, attached to every agent"""
+        ledger = cls({name: agent.coins for name, agent in agents.items()})
+        for agent in agents.values():
+            agent.ledger = ledger
+        return ledger
+
+    @property
+    def closed_through(self) -> int:
+        """Last round frozen by ``close_round``"""
+        return len(self._closed) - 1
+
+    @property
+    def current_round(self) -> int:
+        """Round that new entries belong to by default"""
+        return len(self._closed)
+
+    def balance(self, name: str) -> int:
+        return self._balances[self._index[name]]
+
+    def balances(self) -> Dict[str, int]:
+        return dict(zip(self.players, self._balances))
+
+    def total(self) -> int:
+        return sum(self._balances)
+
+    def snapshot(self, round_num: int) -> Dict[str, int]:
+        """Balances at the end of ``round_num`` (0 is the start; an open round gives the current balances)"""
+        if round_num < 0:
+            raise LedgerError(f"Invalid round: {round_num}")
+        if round_num > self.closed_through:
+            return self.balances()
+        return dict(zip(self.players, self._closed[round_num]))
+
+    def round_entries(self, round_num: int) -> List[LedgerEntry]:
+        return list(self._by_round.get(round_num, ()))
+
+    def round_transfers(self, round_num: int) -> List[LedgerEntry]:
+        return [e for e in self._by_round.get(round_num, ()) if e.is_transfer]
+
+    def validate(
+        self,
+        sender: str,
+        recipient: str,
+        amount: int,
+        balances: Optional[Dict[str, int]] = None
+    ) -> Tuple[bool, str]:
+        """Validate against current balances, or ``balances`` (e.g. what the sender could see)"""
+        return check_transfer(sender, recipient, amount, self.balances() if balances is None else balances)
+
+    def _append(self, round_num: int, sender: Optional[str], recipient: str, amount: int) -> LedgerEntry:
+        entry = LedgerEntry(len(self.entries), round_num, sender, recipient, amount)
+        self.entries.append(entry)
+        self._by_round.setdefault(round_num, []).append(entry)
+        return entry
+
+    def transfer(self, sender: str, recipient: str, amount: int, round_num: Optional[int] = None) -> Optional[LedgerEntry]:
+        """Apply one transfer; returns None (and changes nothing) if it is invalid"""
+        amount = _whole(amount)
+        with self._lock:
+            if not self.validate(sender, recipient, amount)[0]:
+                return None
+            self._balances[self._index[sender]] -= amount
+            self._balances[self._index[recipient]] += amount
+            return self._append(round_num or self.current_round, sender, recipient, amount)
+
+    def apply(self, transfers: Iterable[Tuple[str, str, int]], round_num: Optional[int] = None) -> List[LedgerEntry]:
+        """Apply ``(sender, recipient, amount)`` transfers all or nothing
+
+        Each transfer is validated against the balances left by the ones
+        before it; the first invalid one raises ``LedgerError`` and leaves
+        the ledger untouched.
+        """
+        transfers = [(sender, recipient, _whole(amount)) for sender, recipient, amount in transfers]
+        with self._lock:
+            running = self.balances()
+            for sender, recipient, amount in transfers:
+                valid, reason = check_transfer(sender, recipient, amount, running)
+                if not valid:
+                    raise LedgerError(reason)
+                running[sender] -= amount
+                running[recipient] += amount
+            round_num = round_num or self.current_round
+            for name, coins in running.items():
+                self._balances[self._index[name]] = coins
+            return [self._append(round_num, sender, recipient, amount) for sender, recipient, amount in transfers]
+
+    def settle(self, orders: Dict[str, Iterable[Dict[str, Any]]], round_num: Optional[int] = None) -> List[LedgerEntry]:
+        """Apply transfers decided simultaneously, each sender limited to its current coins
+
+        ``orders`` maps senders to ``{"recipient", "amount"}`` transfers.
+        Invalid ones are skipped; coins received in the same batch cannot be
+        passed on, so the outcome does not depend on the order of senders.
+        """
+        budgets = self.balances()
+        accepted = []
+        for sender, transfers in orders.items():
+            for transfer in transfers:
+                recipient, amount = transfer.get('recipient'), _whole(transfer.get('amount'))
+                if check_transfer(sender, recipient, amount, budgets)[0]:
+                    budgets[sender] -= amount
+                    accepted.append((sender, recipient, amount))
+        # Outflows fit the starting coins, so the batch applies in any order
+        return self.apply(accepted, round_num)
+
+    def adjust(self, name: str, coins: int, round_num: Optional[int] = None) -> Optional[LedgerEntry]:
+        """Set a balance directly, logged as an adjustment entry"""
+        with self._lock:
+            seat = self._index[name]
+            delta = coins - self._balances[seat]
+            if not delta:
+                return None
+            self._balances[seat] = coins
+            return self._append(round_num or self.current_round, None, name, delta)
+
+    def close_round(self, round_num: Optional[int] = None):
+        """Freeze the balances as the end of ``round_num`` (and of any skipped rounds before it)"""
+        with self._lock:
+            round_num = round_num or self.current_round
+            while self.closed_through < round_num:
+                self._closed.append(array('q', self._balances))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'initial': self.initial,
+            'entries': [e.to_dict() for e in self.entries],
+            'closed_through': self.closed_through
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoinLedger":
+        return cls.replay(data['initial'], data.get('entries', []), data.get('closed_through', 0))
+
+    @classmethod
+    def replay(
+        cls,
+        initial: Dict[str, int],
+        entries: Iterable[Dict[str, Any]],
+        closed_through: Optional[int] = None
+    ) -> "CoinLedger":
+        """Rebuild a ledger from its log without revalidating each entry
+
+        Round snapshots are rebuilt as the log crosses round boundaries;
+        ``closed_through`` defaults to the round before the last entry's.
+        """
+        ledger = cls(initial)
+        index, balances = ledger._index, ledger._balances
+        for e in entries:
+            while ledger.closed_through < e['round'] - 1:
+                ledger._closed.append(array('q', balances))
+            if e['sender'] is not None:
+                balances[index[e['sender']]] -= e['amount']
+            balances[index[e['recipient']]] += e['amount']
+            ledger._append(e['round'], e['sender'], e['recipient'], e['amount'])
+        if closed_through:
+            ledger.close_round(closed_through)
+        return ledger
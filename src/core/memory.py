@@ -0,0 +1,258 @@
+from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter, deque
+from datetime import datetime
+from src.utils.llm_providers.limiter import estimate_tokens
+
+# Largest coin flows listed in the folded-history summary
+SUMMARY_FLOWS = 10
+
+class MessageRecord:
+    """One public message"""
+
+    __slots__ = ("round", "speaker", "message", "timestamp")
+
+    def __init__(self, round_num: int, speaker: str, message: str, timestamp: Optional[datetime] = None):
+        self.round = round_num
+        self.speaker = speaker
+        self.message = message
+        self.timestamp = timestamp or datetime.now()
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)  # dict-style access used by transcripts
+
+    def render(self) -> str:
+        return f"Round {self.round} - {self.speaker}: {self.message}\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'round': self.round,
+            'speaker': self.speaker,
+            'message': self.message,
+            'timestamp': self.timestamp.isoformat()
+        }
+
+class TransferRecord:
+    """One completed coin transfer"""
+
+    __slots__ = ("round", "sender", "recipient", "amount", "timestamp")
+
+    def __init__(self, round_num: int, sender: str, recipient: str, amount: int, timestamp: Optional[datetime] = None):
+        self.round = round_num
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+        self.timestamp = timestamp or datetime.now()
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+    def render(self) -> str:
+        return f"Round {self.round} - {self.sender} → {self.recipient}: {self.amount} coins\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'round': self.round,
+            'sender': self.sender,
+            'recipient': self.recipient,
+            'amount': self.amount,
+            'timestamp': self.timestamp.isoformat()
+        }
+
+class ConversationMemory:
+    """Append-only game memory shared by the merchants spaces
+
+    Records are indexed by round as they are appended, and the rendered
+    lines of the last ``window`` messages and transfers are kept in
+    bounded deques, so per-turn context and round lookups cost the same
+    in round 50 as in round 1. The rendered context is cached until the
+    next append.
+
+    With ``keep_rounds`` set, the context instead shows the last
+    ``keep_rounds`` rounds verbatim; older rounds are folded, once each,
+    into running totals plus an optional ``narrative`` written by a
+    summariser (see ``pending_narrative``). ``max_context_tokens`` caps
+    the rendered context, dropping the oldest verbatim lines first. The
+    full record lists are kept either way for results and checkpoints.
+    """
+
+    def __init__(
+        self,
+        players_per_round: int = 2,
+        window: int = 5,
+        keep_rounds: Optional[int] = None,
+        max_context_tokens: Optional[int] = None
+    ):
+        self.players_per_round = players_per_round
+        self.window = window
+        self.keep_rounds = keep_rounds
+        self.max_context_tokens = max_context_tokens
+        self.messages: List[MessageRecord] = []
+        self.transfers: List[TransferRecord] = []
+        self._rounds: Dict[int, Tuple[List[MessageRecord], List[TransferRecord]]] = {}
+        self._recent_messages: deque = deque(maxlen=window)
+        self._recent_transfers: deque = deque(maxlen=window)
+        self._context: Optional[str] = None
+        # Folded history: rounds up to ``folded_through`` only survive as these totals
+        self.latest_round = 0
+        self.folded_through = 0
+        self._flows: Dict[Tuple[str, str], List[int]] = {}
+        self._spoken: Counter = Counter()
+        self.narrative: Optional[str] = None
+        self.narrative_through = 0
+
+    @property
+    def current_round(self) -> int:
+        """Round implied by the number of messages so far"""
+        return len(self.messages) // self.players_per_round + 1
+
+    def _round(self, round_num: int) -> Tuple[List[MessageRecord], List[TransferRecord]]:
+        entry = self._rounds.get(round_num)
+        if entry is None:
+            entry = self._rounds[round_num] = ([], [])
+        return entry
+
+    def add_message(self, speaker: str, message: str, round_num: Optional[int] = None) -> MessageRecord:
+        record = MessageRecord(round_num or self.current_round, speaker, message)
+        self.messages.append(record)
+        self._round(record.round)[0].append(record)
+        self._recent_messages.append(record.render())
+        self._appended(record.round)
+        return record
+
+    def add_transfer(self, sender: str, recipient: str, amount: int, round_num: Optional[int] = None) -> TransferRecord:
+        # Without an explicit round, a transfer belongs to the message it followed
+        record = TransferRecord(round_num or (self.messages[-1].round if self.messages else 1), sender, recipient, amount)
+        self.transfers.append(record)
+        self._round(record.round)[1].append(record)
+        self._recent_transfers.append(record.render())
+        self._appended(record.round)
+        return record
+
+    def _appended(self, round_num: int):
+        self._context = None
+        if round_num > self.latest_round:
+            self.latest_round = round_num
+            if self.keep_rounds is not None:
+                self._fold(self.latest_round - self.keep_rounds)
+
+    def _fold(self, through: int):
+        """Fold rounds up to ``through`` into the running totals, each round once"""
+        for round_num in range(self.folded_through + 1, through + 1):
+            messages, transfers = self._rounds.get(round_num, ((), ()))
+            for m in messages:
+                self._spoken[m.speaker] += 1
+            for t in transfers:
+                flow = self._flows.setdefault((t.sender, t.recipient), [0, 0])
+                flow[0] += t.amount
+                flow[1] += 1
+        self.folded_through = max(self.folded_through, through)
+
+    def pending_narrative(self) -> Optional[Tuple[int, str]]:
+        """Round and text a summariser should condense, if rounds were folded since the last narrative
+
+        The text is the previous narrative plus only the newly folded
+        rounds, so summarising stays cheap however long the game runs.
+        """
+        if self.folded_through <= self.narrative_through:
+            return None
+        parts = [f"Story so far (rounds 1-{self.narrative_through}):\n{self.narrative}\n"] if self.narrative else []
+        for round_num in range(self.narrative_through + 1, self.folded_through + 1):
+            messages, transfers = self._rounds.get(round_num, ((), ()))
+            parts.extend(m.render() for m in messages)
+            parts.extend(t.render() for t in transfers)
+        return self.folded_through, "".join(parts)
+
+    def set_narrative(self, narrative: str, through: int):
+        """Install a summary covering rounds up to ``through`` (stale summaries are ignored)"""
+        if through > self.narrative_through and narrative:
+            self.narrative = narrative.strip()
+            self.narrative_through = through
+            self._context = None
+
+    def round_messages(self, round_num: int) -> List[MessageRecord]:
+        entry = self._rounds.get(round_num)
+        return list(entry[0]) if entry else []
+
+    def round_transfers(self, round_num: int) -> List[TransferRecord]:
+        entry = self._rounds.get(round_num)
+        return list(entry[1]) if entry else []
+
+    @staticmethod
+    def _render(message_lines, transfer_lines) -> str:
+        parts = ["\nRecent conversation:\n", *message_lines]
+        if transfer_lines:
+            parts.append("\nRecent transfers:\n")
+            parts.extend(transfer_lines)
+        return "".join(parts)
+
+    def _history_summary(self) -> str:
+        flows = sorted(self._flows.items(), key=lambda item: item[1][0], reverse=True)[:SUMMARY_FLOWS]
+        parts = [f"\nEarlier rounds (1-{self.folded_through}):\n"]
+        if self.narrative:
+            parts.append(f"{self.narrative}\n")
+        if flows:
+            parts.append("Coins moved: " + "; ".join(
+                f"{sender} → {recipient}: {amount} coins in {count} transfers"
+                for (sender, recipient), (amount, count) in flows
+            ) + "\n")
+        if self._spoken:
+            parts.append("Messages: " + ", ".join(f"{speaker} {count}" for speaker, count in self._spoken.items()) + "\n")
+        return "".join(parts)
+
+    def _compacted_context(self) -> str:
+        kept = range(self.folded_through + 1, self.latest_round + 1)
+        message_lines = [m.render() for r in kept for m in self._rounds.get(r, ((), ()))[0]]
+        transfer_lines = [t.render() for r in kept for t in self._rounds.get(r, ((), ()))[1]]
+        summary = self._history_summary() if self.folded_through else ""
+        context = summary + self._render(message_lines, transfer_lines)
+        if self.max_context_tokens is None:
+            return context
+        # Over the cap: drop the oldest verbatim lines, then cut the summary
+        while estimate_tokens(context) > self.max_context_tokens and (message_lines or transfer_lines):
+            if message_lines and (not transfer_lines or len(message_lines) >= len(transfer_lines)):
+                message_lines.pop(0)
+            else:
+                transfer_lines.pop(0)
+            context = summary + self._render(message_lines, transfer_lines)
+        limit = self.max_context_tokens * 4
+        return context if len(context) <= limit else context[:limit]
+
+    def get_recent_context(self, n_messages: Optional[int] = None) -> str:
+        """Get recent conversation context"""
+        if self.keep_rounds is not None and n_messages is None:
+            if self._context is None:
+                self._context = self._compacted_context()
+            return self._context
+        if n_messages is None or n_messages == self.window:
+            if self._context is None:
+                self._context = self._render(self._recent_messages, self._recent_transfers)
+            return self._context
+        recent = self.messages[-n_messages:] if n_messages > 0 else []
+        transfers = self.transfers[-n_messages:] if n_messages > 0 else []
+        return self._render(
+            [m.render() for m in recent],
+            [t.render() for t in transfers] if self.transfers else []
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert memory to dictionary for serialization"""
+        return {
+            'messages': [m.to_dict() for m in self.messages],
+            'transfers': [t.to_dict() for t in self.transfers]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **settings) -> "ConversationMemory":
+        """Rebuild memory (and its indexes) from ``to_dict`` output; ``settings`` go to the constructor"""
+        memory = cls(**settings)
+        # Append in round order: a later round folds earlier ones, so their transfers must already be in
+        records = [(m['round'], 0, m) for m in data.get('messages', [])]
+        records += [(t['round'], 1, t) for t in data.get('transfers', [])]
+        for _, is_transfer, r in sorted(records, key=lambda record: record[:2]):
+            if is_transfer:
+                memory.add_transfer(r['sender'], r['recipient'], r['amount'], round_num=r['round'])
+                memory.transfers[-1].timestamp = datetime.fromisoformat(r['timestamp'])
+            else:
+                memory.add_message(r['speaker'], r['message'], round_num=r['round'])
+                memory.messages[-1].timestamp = datetime.fromisoformat(r['timestamp'])
+        return memory
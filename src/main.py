@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routers import merchants_1o1
+from src.api.routers import merchants_1o1, llm, metrics
 from src.api.middleware.validation import log_request_body
 from src.utils.config import Config
+from src.utils.llm_providers.registry import get_registry
+import asyncio
 import uvicorn
 import multiprocessing
 
@@ -30,6 +32,13 @@ async def log_requests(request: Request, call_next):
 
 # Include routers
 app.include_router(merchants_1o1.router)
+app.include_router(llm.router)
+app.include_router(metrics.router)
+
+@app.on_event("startup")
+async def prewarm_llm_providers():
+    if config.network_config.get('pool', {}).get('prewarm'):
+        await asyncio.to_thread(get_registry().prewarm)
 
 @app.get("/health")
 async def health_check():
@@ -40,7 +49,8 @@ async def health_check():
             "debug_mode": config.debug_mode,
             "game_rounds": config.game_rounds,
             "workers": multiprocessing.cpu_count()
-        }
+        },
+        "llm": get_registry().stats()
     }
 
 if __name__ == "__main__":
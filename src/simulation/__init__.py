@@ -0,0 +1,11 @@
+from .batch import BatchSimulator, summarize, run_batch
+from .tournament import Tournament, EloRatings, PairingTest
+
+__all__ = [
+    'BatchSimulator',
+    'summarize',
+    'run_batch',
+    'Tournament',
+    'EloRatings',
+    'PairingTest'
+]
@@ -0,0 +1,201 @@
+from typing import Dict, List, Any, Optional, Union
+import asyncio
+import json
+import logging
+import os
+import statistics
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from src.utils.config import Config
+from src.utils.llm_providers.base import BaseLLMProvider
+from src.utils.llm_providers.cache import with_cache
+from src.utils.llm_providers.metrics import get_metrics
+from src.utils.llm_providers.stub import StubProvider
+
+logger = logging.getLogger(__name__)
+
+SPACES = ("merchants_1o1", "merchants_multi")
+PROVIDERS = ("real", "cached", "stub")
+
+class BatchSimulator:
+    """Runs many merchants games headlessly, without the API server or SSE
+
+    Games run on one event loop, at most ``concurrency`` at a time:
+    ``merchants_1o1`` games use the async runtime directly, while the
+    synchronous ``merchants_multi`` scenes run in worker threads. Every
+    agent uses ``provider``: ``real`` keeps the configured providers,
+    ``cached`` forces the response cache on top of them, ``stub`` answers
+    offline, and a provider instance is shared by all agents as given.
+    """
+
+    def __init__(
+        self,
+        space: str = "merchants_1o1",
+        games: int = 10,
+        concurrency: int = 4,
+        provider: Union[str, BaseLLMProvider] = "stub",
+        rounds: Optional[int] = None,
+        strategy: Optional[str] = None,
+        opponent_strategy: Optional[str] = None,
+        round_mode: Optional[str] = None,
+        output_dir: Optional[str] = None
+    ):
+        if space not in SPACES:
+            raise ValueError(f"Unknown space: {space} (expected one of {', '.join(SPACES)})")
+        if isinstance(provider, str) and provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider: {provider} (expected one of {', '.join(PROVIDERS)})")
+        self.space = space
+        self.games = games
+        self.concurrency = max(1, concurrency)
+        self.provider = provider
+        self.rounds = rounds
+        self.strategy = strategy
+        self.opponent_strategy = opponent_strategy
+        self.round_mode = round_mode
+        self.output_dir = output_dir
+        self.batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.game_logger = logging.getLogger(f"simulation.{space}")
+
+    def _game_provider(self) -> Optional[BaseLLMProvider]:
+        """Provider handed to a game's constructors; None keeps the configured ones"""
+        if self.provider == "stub":
+            return StubProvider()  # built before the agents, so no real provider is ever created
+        if isinstance(self.provider, str):
+            return None
+        return self.provider
+
+    def _use_provider(self, agents: List[Any]):
+        """Force the response cache on top of the agents' configured providers"""
+        if self.provider != "cached":
+            return
+        cache_config = {**(Config().llm_config.get('cache', {}) or {}), "enabled": True}
+        for agent in agents:
+            # 1o1 agents call ``llm_provider``, multi agents (BaseAgent) call ``llm``
+            attr = "llm_provider" if hasattr(agent, "llm_provider") else "llm"
+            setattr(agent, attr, with_cache(getattr(agent, attr), cache_config))
+
+    async def play_1o1(self, strategy: Optional[str] = None, opponent_strategy: Optional[str] = None) -> Dict[str, Any]:
+        """Play one merchants_1o1 game; strategies default to the batch's"""
+        # Imported lazily so a multi-only batch does not load the 1o1 space
+        from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+        runtime = NegotiationRuntime(
+            logger=self.game_logger,
+            round_mode=self.round_mode,
+            llm_provider=self._game_provider(),
+            checkpoints=None  # a batch game is cheaper to rerun than to checkpoint
+        )
+        if self.rounds:
+            runtime.max_rounds = self.rounds
+        if strategy or self.strategy:
+            runtime.set_strategy(strategy or self.strategy)
+        if opponent_strategy or self.opponent_strategy:
+            runtime.set_opponent_strategy(opponent_strategy or self.opponent_strategy)
+        self._use_provider([runtime.player1, runtime.player2, runtime.coordinator])
+        await runtime.run_game()
+        return {
+            "game_id": runtime.game_id,
+            "winner": runtime.get_winner(),
+            "final_statuses": runtime.get_player_statuses(),
+            "rounds": runtime.max_rounds,
+            "usage": get_metrics().end_game(runtime.game_id)
+        }
+
+    def _play_multi(self) -> Dict[str, Any]:
+        from src.spaces.merchants_multi.runtime.negotiation import NegotiationScene
+        scene = NegotiationScene(
+            max_rounds=self.rounds or Config().get_space_config('merchants_multi')['rounds'],
+            logger=self.game_logger,
+            llm_provider=self._game_provider()
+        )
+        self._use_provider([*scene.players.values(), scene.coordinator])
+        result = scene.run_scene()
+        statuses = result['final_statuses']
+        # run_scene names the first player on ties; report them like 1o1 does
+        leaders = [p for p, c in statuses.items() if c == max(statuses.values())]
+        return {
+            "game_id": scene.game_id,
+            "winner": leaders[0] if len(leaders) == 1 else "Tie",
+            "final_statuses": statuses,
+            "rounds": scene.max_rounds,
+            "usage": result.get('usage')
+        }
+
+    async def _play(self, index: int, slots: asyncio.Semaphore, results: List[Dict[str, Any]], out) -> None:
+        async with slots:
+            started = time.perf_counter()
+            try:
+                if self.space == "merchants_1o1":
+                    result = await self.play_1o1()
+                else:
+                    result = await asyncio.to_thread(self._play_multi)
+                result["error"] = None
+            except Exception as e:
+                logger.error(f"Simulated game {index} failed: {str(e)}")
+                result = {"game_id": str(uuid.uuid4()), "winner": None, "final_statuses": {}, "error": str(e)}
+            result.update(index=index, space=self.space, duration=round(time.perf_counter() - started, 4))
+            results.append(result)
+            if out:
+                out.write(json.dumps(result) + "\n")
+
+    async def arun(self) -> Dict[str, Any]:
+        """Play the whole batch; returns per-game results and the aggregate summary"""
+        slots = asyncio.Semaphore(self.concurrency)
+        results: List[Dict[str, Any]] = []
+        out = None
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            out = open(os.path.join(self.output_dir, f"{self.space}_{self.batch_id}_games.jsonl"), "w")
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._play(i, slots, results, out) for i in range(self.games)))
+        finally:
+            if out:
+                out.close()
+        results.sort(key=lambda r: r["index"])
+        summary = summarize(results, time.perf_counter() - started)
+        summary.update(
+            space=self.space,
+            provider=self.provider if isinstance(self.provider, str) else type(self.provider).__name__,
+            concurrency=self.concurrency
+        )
+        if self.output_dir:
+            with open(os.path.join(self.output_dir, f"{self.space}_{self.batch_id}_summary.json"), "w") as f:
+                json.dump(summary, f, indent=2)
+        logger.info(f"Simulated {len(results)} {self.space} games at {summary['games_per_minute']} games/min")
+        return {"games": results, "summary": summary}
+
+    def run(self) -> Dict[str, Any]:
+        """Blocking ``arun`` for scripts and the CLI"""
+        return asyncio.run(self.arun())
+
+def _distribution(values: List[int]) -> Dict[str, Any]:
+    return {
+        "mean": round(statistics.mean(values), 3),
+        "stdev": round(statistics.pstdev(values), 3),
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+        "histogram": dict(sorted(Counter(values).items()))
+    }
+
+def summarize(results: List[Dict[str, Any]], elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """Win rates and final-coin distributions over finished games"""
+    finished = [r for r in results if not r.get("error")]
+    wins = Counter(r["winner"] for r in finished)
+    players = sorted({p for r in finished for p in r["final_statuses"]})
+    return {
+        "games": len(results),
+        "completed": len(finished),
+        "failed": len(results) - len(finished),
+        "wins": dict(wins),
+        "win_rate": {name: round(count / len(finished), 4) for name, count in wins.items()} if finished else {},
+        "coins": {p: _distribution([r["final_statuses"][p] for r in finished if p in r["final_statuses"]]) for p in players},
+        "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+        "games_per_minute": round(len(results) * 60 / elapsed, 1) if elapsed else None
+    }
+
+def run_batch(**kwargs) -> Dict[str, Any]:
+    """Run a batch with ``BatchSimulator`` arguments and return its results"""
+    return BatchSimulator(**kwargs).run()
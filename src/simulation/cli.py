@@ -0,0 +1,104 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import yaml
+from .batch import BatchSimulator, SPACES, PROVIDERS
+from .tournament import Tournament, FORMATS
+
+def main(argv=None):
+    """Run a headless batch of merchants games and print the summary"""
+    parser = argparse.ArgumentParser(description="Run many merchants games without the API server")
+    parser.add_argument("--space", choices=SPACES, default="merchants_1o1")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--provider", choices=PROVIDERS, default="stub")
+    parser.add_argument("--rounds", type=int, default=None)
+    parser.add_argument("--strategy", default=None, help="strategy advisory for merchants_1o1 player 1")
+    parser.add_argument("--opponent-strategy", default=None, help="strategy advisory for merchants_1o1 player 2")
+    parser.add_argument("--round-mode", default=None, help="merchants_1o1 round mode")
+    parser.add_argument("--output-dir", default="logs/simulations")
+    parser.add_argument("--verbose", action="store_true", help="show per-game logs")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Per-turn game and provider logs would drown the summary at batch scale
+        logging.disable(logging.INFO)
+
+    result = BatchSimulator(
+        space=args.space,
+        games=args.games,
+        concurrency=args.concurrency,
+        provider=args.provider,
+        rounds=args.rounds,
+        strategy=args.strategy,
+        opponent_strategy=args.opponent_strategy,
+        round_mode=args.round_mode,
+        output_dir=args.output_dir
+    ).run()
+    print(json.dumps(result["summary"], indent=2))
+    return result["summary"]
+
+def tournament_main(argv=None):
+    """Rank strategy advisories against each other and print the leaderboard"""
+    parser = argparse.ArgumentParser(description="Run a merchants_1o1 strategy tournament")
+    parser.add_argument("strategies", help="YAML or JSON file mapping strategy names to advisory texts")
+    parser.add_argument("--format", choices=FORMATS, default="round_robin")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--provider", choices=PROVIDERS, default="stub")
+    parser.add_argument("--rounds", type=int, default=None)
+    parser.add_argument("--budget-usd", type=float, default=None, help="stop scheduling games past this LLM spend")
+    parser.add_argument("--max-games", type=int, default=None)
+    parser.add_argument("--games-per-pairing", type=int, default=20)
+    parser.add_argument("--margin", type=float, default=0.15, help="score edge over 0.5 the sequential test looks for")
+    parser.add_argument("--output-dir", default="logs/tournaments")
+    parser.add_argument("--verbose", action="store_true", help="show per-game logs")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    with open(args.strategies, "r") as f:
+        strategies = yaml.safe_load(f)  # JSON is valid YAML
+
+    standings = Tournament(
+        strategies,
+        format=args.format,
+        concurrency=args.concurrency,
+        provider=args.provider,
+        rounds=args.rounds,
+        budget_usd=args.budget_usd,
+        max_games=args.max_games,
+        games_per_pairing=args.games_per_pairing,
+        margin=args.margin,
+        output_dir=args.output_dir
+    ).run()
+    print(json.dumps(standings, indent=2))
+    return standings
+
+def replay_main(argv=None):
+    """Verify recorded merchants_1o1 games offline; exits non-zero on any mismatch"""
+    # Imported lazily so batch runs do not load the 1o1 space up front
+    from src.spaces.merchants_1o1.runtime.replay import ReplayError, ReplayVerifier, list_recordings, load_recording
+    parser = argparse.ArgumentParser(description="Re-apply recorded games' transfers and check their standings")
+    parser.add_argument("recordings", nargs="+", help="recording files (JSON or JSONL) or directories of them")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.recordings:
+        paths.extend(list_recordings(path) if os.path.isdir(path) else [path])
+    reports = {}
+    for path in paths:
+        try:
+            reports[path] = ReplayVerifier(load_recording(path)).verify()
+        except (ReplayError, KeyError, TypeError, ValueError) as e:
+            reports[path] = {"ok": False, "mismatches": [f"unreplayable: {str(e)}"]}
+    print(json.dumps(reports, indent=2))
+    failed = [path for path, report in reports.items() if not report["ok"]]
+    if failed:
+        sys.exit(f"{len(failed)} of {len(reports)} recordings failed verification")
+    return reports
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+from typing import Dict, List, Any, Optional, Tuple, Union
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from src.utils.llm_providers.base import BaseLLMProvider
+from .batch import BatchSimulator
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("round_robin", "swiss")
+
+# Seat names in merchants_1o1; strategies swap seats every game to cancel first-mover advantage
+SEATS = ("Marco Polo", "Trader Joe")
+
+class EloRatings:
+    """Incrementally updated Elo ratings; a draw scores 0.5"""
+
+    def __init__(self, names: List[str], k: float = 24.0, initial: float = 1500.0):
+        self.k = k
+        self.ratings: Dict[str, float] = {name: initial for name in names}
+        self.games: Dict[str, int] = {name: 0 for name in names}
+
+    def expected(self, a: str, b: str) -> float:
+        """Expected score of ``a`` against ``b``"""
+        return 1.0 / (1.0 + 10 ** ((self.ratings[b] - self.ratings[a]) / 400.0))
+
+    def update(self, a: str, b: str, score_a: float):
+        delta = self.k * (score_a - self.expected(a, b))
+        self.ratings[a] += delta
+        self.ratings[b] -= delta
+        self.games[a] += 1
+        self.games[b] += 1
+
+    def leaderboard(self) -> List[Dict[str, Any]]:
+        ranked = sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+        return [{"strategy": name, "rating": round(rating, 1), "games": self.games[name]} for name, rating in ranked]
+
+class PairingTest:
+    """Wald SPRT on one pairing's score, run in both directions
+
+    Each game scores 1, 0.5 or 0 for strategy ``a``. One test weighs
+    "``a`` scores ``0.5 + margin``" against "even", the mirrored test does
+    the same for ``b``. The pairing is decided once either alternative is
+    accepted, or both are rejected ("even"), or ``max_games`` is reached.
+    ``max_errors`` failed games in a row end it as "failed".
+    """
+
+    def __init__(
+        self,
+        a: str,
+        b: str,
+        margin: float = 0.15,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+        min_games: int = 2,
+        max_games: int = 20,
+        max_errors: int = 3
+    ):
+        self.a = a
+        self.b = b
+        self.min_games = min_games
+        self.max_games = max_games
+        self.max_errors = max_errors
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+        p1 = 0.5 + margin
+        self._win = math.log(p1 / 0.5)
+        self._loss = math.log((1 - p1) / 0.5)
+        self.llr_a = 0.0
+        self.llr_b = 0.0
+        self.games = 0
+        self.score_a = 0.0
+        self.errors = 0  # failed games in a row
+        self.decision: Optional[str] = None
+
+    def fail(self):
+        self.errors += 1
+        if self.errors >= self.max_errors:
+            self.decision = "failed"
+
+    def add(self, score_a: float):
+        self.errors = 0
+        self.games += 1
+        self.score_a += score_a
+        self.llr_a += score_a * self._win + (1 - score_a) * self._loss
+        self.llr_b += (1 - score_a) * self._win + score_a * self._loss
+        if self.games < self.min_games:
+            return
+        if self.llr_a >= self.upper:
+            self.decision = self.a
+        elif self.llr_b >= self.upper:
+            self.decision = self.b
+        elif self.llr_a <= self.lower and self.llr_b <= self.lower:
+            self.decision = "even"
+        elif self.games >= self.max_games:
+            self.decision = "undecided"
+
+    @property
+    def decided(self) -> bool:
+        return self.decision is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "a": self.a,
+            "b": self.b,
+            "games": self.games,
+            "score_a": self.score_a,
+            "decision": self.decision,
+            "errors": self.errors,
+            "llr_a": round(self.llr_a, 3),
+            "llr_b": round(self.llr_b, 3)
+        }
+
+class Tournament:
+    """Ranks ``strategy_advisory`` texts by playing merchants_1o1 games between them
+
+    Games are scheduled in waves: ``round_robin`` gives every undecided
+    pairing one game per wave, ``swiss`` pairs strategies with adjacent
+    ratings among the undecided pairings (``swiss_rounds`` waves). A wave
+    runs at most ``concurrency`` games at a time. After each game the Elo
+    ratings and the pairing's sequential test are updated, and decided
+    pairings get no more games. Scheduling stops when everything is
+    decided, ``max_games`` have been played, or ``budget_usd`` of LLM spend
+    (as recorded by the metrics registry) would be exceeded. Failed games
+    count towards ``max_games``, and a pairing whose games fail
+    ``max_errors`` times in a row is dropped.
+    """
+
+    def __init__(
+        self,
+        strategies: Dict[str, str],
+        format: str = "round_robin",
+        concurrency: int = 4,
+        provider: Union[str, BaseLLMProvider] = "stub",
+        rounds: Optional[int] = None,
+        budget_usd: Optional[float] = None,
+        max_games: Optional[int] = None,
+        games_per_pairing: int = 20,
+        min_games: int = 2,
+        margin: float = 0.15,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+        k: float = 24.0,
+        swiss_rounds: Optional[int] = None,
+        max_errors: int = 3,
+        output_dir: Optional[str] = None
+    ):
+        if len(strategies) < 2:
+            raise ValueError("A tournament needs at least two strategies")
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format} (expected one of {', '.join(FORMATS)})")
+        self.strategies = strategies
+        self.format = format
+        self.concurrency = max(1, concurrency)
+        self.budget_usd = budget_usd
+        self.max_games = max_games
+        self.swiss_rounds = swiss_rounds or 2 * games_per_pairing
+        self.output_dir = output_dir
+        self.simulator = BatchSimulator(games=0, provider=provider, rounds=rounds)
+        self.ratings = EloRatings(list(strategies), k=k)
+        self.pairings: Dict[Tuple[str, str], PairingTest] = {
+            (a, b): PairingTest(a, b, margin, alpha, beta, min_games, games_per_pairing, max_errors)
+            for a, b in itertools.combinations(strategies, 2)
+        }
+        self.results: List[Dict[str, Any]] = []
+        self.spent_usd = 0.0
+        self.stopped_by: Optional[str] = None
+
+    def _open(self) -> List[PairingTest]:
+        return [p for p in self.pairings.values() if not p.decided]
+
+    def _swiss_wave(self) -> List[PairingTest]:
+        """Pair strategies with the closest ratings, each at most once per wave"""
+        ranked = sorted(self.strategies, key=lambda name: self.ratings.ratings[name], reverse=True)
+        open_pairs = {(p.a, p.b): p for p in self._open()}
+        used, wave = set(), []
+        for i, a in enumerate(ranked):
+            if a in used:
+                continue
+            for b in ranked[i + 1:]:
+                pairing = open_pairs.get((a, b)) or open_pairs.get((b, a))
+                if b not in used and pairing:
+                    wave.append(pairing)
+                    used.update((a, b))
+                    break
+        return wave
+
+    def _budget_left(self, planned: int) -> int:
+        """How many of ``planned`` games fit in the game cap and the spend budget"""
+        allowed = planned
+        if self.max_games is not None:
+            allowed = min(allowed, self.max_games - len(self.results))
+            if allowed <= 0:
+                self.stopped_by = "max_games"
+        if self.budget_usd is not None and allowed > 0:
+            # Reserve the average cost so far for every game about to start
+            average = self.spent_usd / len(self.results) if self.results else 0.0
+            remaining = self.budget_usd - self.spent_usd
+            fit = int(remaining // average) if average > 0 else (allowed if remaining > 0 else 0)
+            allowed = min(allowed, fit)
+            if allowed <= 0:
+                self.stopped_by = "budget"
+        return max(0, allowed)
+
+    async def _play(self, pairing: PairingTest, slots: asyncio.Semaphore):
+        # Alternate seats so each strategy moves first in half the games
+        first, second = (pairing.a, pairing.b) if pairing.games % 2 == 0 else (pairing.b, pairing.a)
+        async with slots:
+            if pairing.decided:
+                return
+            started = time.perf_counter()
+            try:
+                game = await self.simulator.play_1o1(self.strategies[first], self.strategies[second])
+            except Exception as e:
+                logger.error(f"Tournament game {first} vs {second} failed: {str(e)}")
+                pairing.fail()
+                self.results.append({
+                    "game_id": None,
+                    "first": first,
+                    "second": second,
+                    "winner": None,
+                    "error": str(e),
+                    "duration": round(time.perf_counter() - started, 4)
+                })
+                return
+        winner = game["winner"]
+        score_first = 0.5 if winner == "Tie" else float(winner == SEATS[0])
+        score_a = score_first if first == pairing.a else 1 - score_first
+        self.spent_usd += ((game.get("usage") or {}).get("total") or {}).get("cost_usd", 0.0)
+        self.ratings.update(pairing.a, pairing.b, score_a)
+        pairing.add(score_a)
+        self.results.append({
+            "game_id": game["game_id"],
+            "first": first,
+            "second": second,
+            "winner": winner if winner == "Tie" else dict(zip(SEATS, (first, second)))[winner],
+            "final_statuses": game["final_statuses"],
+            "error": None,
+            "duration": round(time.perf_counter() - started, 4)
+        })
+        if pairing.decided:
+            logger.info(f"Pairing {pairing.a} vs {pairing.b} decided after {pairing.games} games: {pairing.decision}")
+
+    async def arun(self) -> Dict[str, Any]:
+        """Play until every pairing is decided or the budget runs out; returns the leaderboard"""
+        slots = asyncio.Semaphore(self.concurrency)
+        waves = 0
+        while True:
+            wave = self._open() if self.format == "round_robin" else self._swiss_wave()
+            if not wave:
+                self.stopped_by = self.stopped_by or "decided"
+                break
+            if self.format == "swiss" and waves >= self.swiss_rounds:
+                self.stopped_by = "swiss_rounds"
+                break
+            wave = wave[:self._budget_left(len(wave))]
+            if not wave:
+                break
+            await asyncio.gather(*(self._play(pairing, slots) for pairing in wave))
+            waves += 1
+        standings = self.standings()
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"tournament_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            with open(path, "w") as f:
+                json.dump({**standings, "games": self.results}, f, indent=2)
+        return standings
+
+    def run(self) -> Dict[str, Any]:
+        """Blocking ``arun`` for scripts and the CLI"""
+        return asyncio.run(self.arun())
+
+    def standings(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "leaderboard": self.ratings.leaderboard(),
+            "pairings": [p.to_dict() for p in self.pairings.values()],
+            "games_played": len(self.results),
+            "games_failed": sum(1 for r in self.results if r.get("error")),
+            "spent_usd": round(self.spent_usd, 6),
+            "stopped_by": self.stopped_by
+        }
@@ -1,19 +1,23 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Union, Tuple
 from ....utils.llm_providers.openrouter import OpenRouterProvider
 from ....utils.config import Config
+import json
 import logging
 from src.utils.logger import GameLogger
-from src.utils.llm_providers.fallback import FallbackProvider
+from src.utils.llm_providers.base import BaseLLMProvider
+from src.utils.llm_providers.registry import get_routed_provider
+from src.utils.llm_providers.prompt import Prompt
 
 logger = logging.getLogger(__name__)
 
 class NegotiationAgent:
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         config = Config()
         model_config = config.llm_config['models']['player1']  # Default to player1 config
         
         self.name = name
-        self.coins = 10  # Starting coins
+        self.ledger = None  # set by CoinLedger.for_agents; balances then live in the ledger
+        self._coins = 10  # Starting coins
         self.round = 1
         
         # Initialize logger
@@ -22,7 +26,7 @@ class NegotiationAgent:
         # Initialize LLM provider
         self.model = model_config['default']
         self.backup_model = model_config['backup']
-        self.llm_provider = FallbackProvider()
+        self.llm_provider = llm_provider or get_routed_provider('fallback')
         
         self.logger.info(f"Agent {name} initialized with {self.coins} coins")
     
@@ -30,7 +34,20 @@ class NegotiationAgent:
         """Override this method to provide role-specific prompt"""
         raise NotImplementedError
     
+    @property
+    def coins(self) -> int:
+        return self.ledger.balance(self.name) if self.ledger else self._coins
+
+    @coins.setter
+    def coins(self, value: int):
+        if self.ledger:
+            self.ledger.adjust(self.name, value)
+        else:
+            self._coins = value
+
     def transfer_coins(self, amount: int, recipient: 'NegotiationAgent') -> bool:
+        if self.ledger:
+            return self.ledger.transfer(self.name, recipient.name, amount) is not None
         if amount <= self.coins and amount > 0:
             self.coins -= amount
             recipient.coins += amount
@@ -39,13 +56,31 @@ class NegotiationAgent:
     
     def get_status(self) -> str:
         return f"{self.name} has {self.coins} coins"
+
+    @staticmethod
+    def _prompt_kwargs(prompt: Union[str, Prompt], response_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a Prompt's static part as a cacheable prefix"""
+        kwargs = {"prompt": prompt}
+        if isinstance(prompt, Prompt):
+            kwargs = {"prompt": prompt.dynamic, "static_prefix": prompt.static}
+        if response_schema:
+            kwargs["response_schema"] = response_schema
+        return kwargs
     
-    def generate_response(self, prompt: str, temperature: float = 0.7) -> str:
-        """Generate response using LLM"""
+    def generate_response(
+        self,
+        prompt: Union[str, Prompt],
+        temperature: float = 0.7,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate response using LLM
+
+        ``response_schema`` constrains the reply to that JSON schema.
+        """
         try:
             response = self.llm_provider.generate(
                 model=self.model,
-                prompt=prompt,
+                **self._prompt_kwargs(prompt, response_schema),
                 temperature=temperature
             )
             return response
@@ -56,7 +91,7 @@ class NegotiationAgent:
                 self.logger.info(f"Trying backup model {self.backup_model}")
                 response = self.llm_provider.generate(
                     model=self.backup_model,
-                    prompt=prompt,
+                    **self._prompt_kwargs(prompt, response_schema),
                     temperature=temperature
                 )
                 return response
@@ -64,6 +99,66 @@ class NegotiationAgent:
                 self.logger.error(f"Backup model failed: {str(e)}")
                 raise
 
+    async def agenerate_response(
+        self,
+        prompt: Union[str, Prompt],
+        temperature: float = 0.7,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate response using LLM without blocking the event loop"""
+        try:
+            return await self.llm_provider.agenerate(
+                model=self.model,
+                **self._prompt_kwargs(prompt, response_schema),
+                temperature=temperature
+            )
+        except Exception as e:
+            self.logger.error(f"Error generating response: {str(e)}")
+            # Try backup model
+            try:
+                self.logger.info(f"Trying backup model {self.backup_model}")
+                return await self.llm_provider.agenerate(
+                    model=self.backup_model,
+                    **self._prompt_kwargs(prompt, response_schema),
+                    temperature=temperature
+                )
+            except Exception as e:
+                self.logger.error(f"Backup model failed: {str(e)}")
+                raise
+
+    async def astream_response(self, prompt: Union[str, Prompt], temperature: float = 0.7) -> AsyncIterator[str]:
+        """Stream the LLM response chunk by chunk"""
+        started = False
+        try:
+            async for chunk in self.llm_provider.astream(
+                model=self.model,
+                **self._prompt_kwargs(prompt),
+                temperature=temperature
+            ):
+                started = True
+                yield chunk
+        except Exception as e:
+            self.logger.error(f"Error streaming response: {str(e)}")
+            if started:
+                raise
+            # Nothing was streamed yet, so the backup model can take over
+            self.logger.info(f"Trying backup model {self.backup_model}")
+            yield await self.llm_provider.agenerate(
+                model=self.backup_model,
+                **self._prompt_kwargs(prompt),
+                temperature=temperature
+            )
+
+    def _split_turn(self, response: str) -> Tuple[str, Dict[str, Any]]:
+        """Split a single-call turn reply into private thinking and the public action"""
+        try:
+            thinking = json.loads(response).get("thinking") or ""
+        except (json.JSONDecodeError, AttributeError):
+            thinking = ""
+        action = self._parse_action(response)
+        action.pop("thinking", None)
+        return thinking, action
+
     def get_player_statuses(self) -> Dict[str, int]:
         """Get current player statuses"""
         return {"coins": self.coins} 
\ No newline at end of file
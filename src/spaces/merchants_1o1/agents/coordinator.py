@@ -2,13 +2,18 @@ from typing import Dict, Optional, List, Any
 from .base import NegotiationAgent
 import json
 import re
+from ....core.ledger import check_transfer
 from ....utils.config import Config
-from ....utils.llm_providers.openrouter import OpenRouterProvider
+from ....utils.llm_providers.base import BaseLLMProvider
+from ....utils.llm_providers.prompt import PromptBuilder
+from ....utils.llm_providers.schemas import ACTION_SCHEMA, SUMMARY_SCHEMA
+from ....utils.llm_providers.metrics import call_labels
+from ..data.prompts import NegotiationPrompts
 from ....utils.logger import logger
 
 class CoordinatorAgent(NegotiationAgent):
-    def __init__(self, name: str):
-        super().__init__(name)
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
+        super().__init__(name, llm_provider)
         
         # Override model config with coordinator-specific config
         config = Config()
@@ -26,11 +31,29 @@ class CoordinatorAgent(NegotiationAgent):
     def evaluate_round(self, round_num: int, player_statuses: Dict[str, Any]) -> str:
         """Evaluate the current round state"""
         prompt = (
-            f"Round {round_num} Status:\n"
-            f"Player standings: {player_statuses}\n\n"
-            "Provide a brief, impartial analysis of the current game state."
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .dynamic(
+                f"Round {round_num} Status:\n"
+                f"Player standings: {player_statuses}\n\n"
+                "Provide a brief, impartial analysis of the current game state."
+            )
+            .build()
         )
-        return self.generate_response(prompt, temperature=0.7)
+        with call_labels(phase="evaluate"):
+            return self.generate_response(prompt, temperature=0.7)
+
+    async def asummarize_history(self, history: str) -> str:
+        """Condense folded rounds (and the previous narrative) for ``ConversationMemory``"""
+        prompt = (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.COORDINATOR_HISTORY)
+            .dynamic(history)
+            .build()
+        )
+        with call_labels(phase="memory"):
+            return await self.agenerate_response(prompt, temperature=0.3)
 
     def process(self, *args, **kwargs):
         """Process different coordinator actions"""
@@ -59,32 +82,21 @@ class CoordinatorAgent(NegotiationAgent):
         except:
             pass
         
-        prompt = f"""
-        As a bilingual host, format this player's response and add entertaining commentary in both languages.
-
-        Player: {player_name}
-        Available Coins: {available_coins}
-        Raw Response: ```{raw_response}```
-        
-        Format as JSON:
-        {{
-            "thinking": "🎙️ [English Commentary] Strategic analysis here\\n🎭 [中文点评] 你的精彩评论",
-            "message": "player's message in English",
-            "transfers": [
-                {{"recipient": "player_name", "amount": number}}
-            ]
-        }}
-
-        Requirements:
-        - Keep player's message in English for accuracy
-        - Provide commentary in both English and Chinese
-        - Validate transfers (max: {available_coins} coins)
-        - Use emojis and entertaining tone
-        - Create dramatic moments
-        """
+        prompt = (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.COORDINATOR_FORMAT)
+            .dynamic(
+                f"Player: {player_name}\n"
+                f"Available Coins: {available_coins} (max transfer: {available_coins} coins)\n"
+                f"Raw Response: ```{raw_response}```"
+            )
+            .build()
+        )
         
         try:
-            formatted = self.llm.generate(prompt)
+            with call_labels(phase="format"):
+                formatted = self.generate_response(prompt, response_schema=ACTION_SCHEMA)
             result = json.loads(formatted)
             return self._validate_transfers(result, available_coins)
         except json.JSONDecodeError:
@@ -115,40 +127,21 @@ class CoordinatorAgent(NegotiationAgent):
                 }
                 formatted_actions.append(formatted_action)
 
-        prompt = f"""
-        Create an exciting bilingual summary for round {round_num}!
-
-        Round Actions:
-        {json.dumps(formatted_actions, indent=2, ensure_ascii=False)}
-
-        Current Balances:
-        {json.dumps(player_balances, indent=2, ensure_ascii=False)}
-
-        Respond in this JSON format:
-        {{
-            "round_summary": {{
-                "highlights": {{
-                    "en": "Most exciting moves and strategies",
-                    "zh": "本回合最激动人心的操作和策略"
-                }},
-                "alliances": {{
-                    "en": "Analysis of alliances and betrayals",
-                    "zh": "联盟与背叛的情况分析"
-                }},
-                "impact": {{
-                    "en": "How coin distribution affects the game",
-                    "zh": "金币分布的变化对游戏的影响"
-                }},
-                "next_round": {{
-                    "en": "Expectations for next round",
-                    "zh": "对下一回合的期待和预测"
-                }}
-            }}
-        }}
-        """
+        prompt = (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.COORDINATOR_SUMMARY)
+            .dynamic(
+                f"Round: {round_num}\n\n"
+                f"Round Actions:\n{json.dumps(formatted_actions, indent=2, ensure_ascii=False)}\n\n"
+                f"Current Balances:\n{json.dumps(player_balances, indent=2, ensure_ascii=False)}"
+            )
+            .build()
+        )
         
         try:
-            summary = self.llm.generate(prompt)
+            with call_labels(phase="summary"):
+                summary = self.generate_response(prompt, response_schema=SUMMARY_SCHEMA)
             parsed_summary = json.loads(summary)
             return json.dumps(parsed_summary, ensure_ascii=False, indent=2)
         except Exception as e:
@@ -170,11 +163,10 @@ class CoordinatorAgent(NegotiationAgent):
             }, ensure_ascii=False, indent=2)
 
     def _is_valid_format(self, data: Dict) -> bool:
-        """Check if the response follows the required format"""
+        """Check if the response follows the required format (thinking is optional)"""
         return (
             isinstance(data, dict) and
-            "thinking" in data and
-            isinstance(data["thinking"], str) and
+            isinstance(data.get("thinking", ""), str) and
             "message" in data and
             isinstance(data["message"], str) and
             "transfers" in data and
@@ -207,19 +199,7 @@ class CoordinatorAgent(NegotiationAgent):
     def validate_transfer(self, sender: str, recipient: str, amount: int, 
                          player_balances: Dict[str, int]) -> tuple[bool, str]:
         """Validate a proposed coin transfer"""
-        if amount <= 0:
-            return False, "Transfer amount must be positive"
-        
-        if sender not in player_balances:
-            return False, f"Invalid sender: {sender}"
-            
-        if recipient not in player_balances:
-            return False, f"Invalid recipient: {recipient}"
-            
-        if amount > player_balances[sender]:
-            return False, f"{sender} doesn't have enough coins for this transfer"
-            
-        return True, "Transfer valid"
+        return check_transfer(sender, recipient, amount, player_balances)
 
 class GameCoordinator:
     def __init__(self):
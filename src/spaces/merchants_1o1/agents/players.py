@@ -1,18 +1,21 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, AsyncIterator, Tuple
 from .base import NegotiationAgent
 from ..data.prompts import NegotiationPrompts
 import json
 from ....utils.config import Config
-from ....utils.llm_providers.fallback import FallbackProvider
+from ....utils.llm_providers.base import BaseLLMProvider
+from ....utils.llm_providers.prompt import Prompt, PromptBuilder
+from ....utils.llm_providers.schemas import ACTION_SCHEMA, TURN_SCHEMA
+from ....utils.llm_providers.metrics import call_labels
 from ....utils import logger
 import logging
 
 logger = logging.getLogger(__name__)
 
 class Player1(NegotiationAgent):
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         # Call parent constructor first
-        super().__init__(name)
+        super().__init__(name, llm_provider)
         
         # Initialize strategy
         self.strategy_advisory = """
@@ -36,53 +39,46 @@ class Player1(NegotiationAgent):
     def _get_role_prompt(self) -> str:
         return NegotiationPrompts.PLAYER1_BASE
 
-    def _get_thinking_prompt(self, context: Dict[str, Any]) -> str:
-        """Generate deep thinking prompt for strategic analysis"""
+    def _turn_state(self, context: Dict[str, Any]) -> str:
+        """Per-turn game state shared by the thinking and action prompts"""
         return (
             f"Current round: {context['round']} of 5\n"
             f"Your coins: {self.coins}\n"
-            f"Other players' status:\n{context['player_statuses']}\n\n"
-            "=== DEEP THINKING (Private Analysis) ===\n"
-            "As Marco Polo, analyze the current situation. This is your private thought process that others cannot see.\n\n"
-            f"Strategic Advisory:\n{context['strategy']}\n\n"
-            "Consider and analyze deeply:\n"
-            "1. Trust Assessment:\n"
-            "   - Analyze Trader Joe's past behavior patterns\n"
-            "   - Evaluate likelihood of cooperation vs betrayal\n"
-            "2. Game Theory Analysis:\n"
-            "   - Calculate optimal coin distribution\n"
-            "   - Evaluate risk/reward ratios\n"
-            "3. Strategic Planning:\n"
-            "   - Plan next 2-3 moves ahead\n"
-            "   - Consider bluffing or misdirection\n"
-            "4. Psychological Warfare:\n"
-            "   - Identify opponent's weaknesses\n"
-            "   - Plan manipulation tactics\n\n"
-            "Provide your complete private strategic analysis."
+            f"Other players' status:\n{context['player_statuses']}"
+        )
+
+    def _get_thinking_prompt(self, context: Dict[str, Any]) -> Prompt:
+        """Generate deep thinking prompt for strategic analysis"""
+        return (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.PLAYER1_THINKING)
+            .dynamic(self._turn_state(context))
+            .dynamic(f"Strategic Advisory:\n{context['strategy']}")
+            .dynamic("Provide your complete private strategic analysis.")
+            .build()
         )
 
-    def _get_action_prompt(self, context: Dict[str, Any]) -> str:
+    def _get_action_prompt(self, context: Dict[str, Any]) -> Prompt:
         """Generate action prompt with clear sections"""
         return (
-            f"Current round: {context['round']} of 5\n"
-            f"Your coins: {self.coins}\n"
-            f"Other players' status:\n{context['player_statuses']}\n\n"
-            "Based on your deep analysis, generate your next move with these sections:\n\n"
-            "=== SPEAK (Public Communication) ===\n"
-            "Create a diplomatic message to Trader Joe that aligns with your strategy.\n"
-            "This will be visible to others.\n\n"
-            "=== ACTION (Game Moves) ===\n"
-            "Decide on coin transfers that support your strategy.\n\n"
-            "Respond with this exact JSON structure:\n"
-            "{\n"
-            '    "message": "Your diplomatic message to Trader Joe",\n'
-            '    "transfers": [{"recipient": "Trader Joe", "amount": number}]\n'
-            "}\n\n"
-            "Requirements:\n"
-            "- Message should be strategic but not reveal your true intentions\n"
-            "- Transfers must be numbers, not strings\n"
-            "- No markdown or explanations in the response\n"
-            "- Only the JSON object is allowed"
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.PLAYER1_ACTION)
+            .dynamic(self._turn_state(context))
+            .build()
+        )
+
+    def _get_turn_prompt(self, context: Dict[str, Any]) -> Prompt:
+        """Single-call prompt: the thinking brief plus the combined reply format"""
+        return (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.PLAYER1_THINKING)
+            .static(NegotiationPrompts.PLAYER1_TURN)
+            .dynamic(self._turn_state(context))
+            .dynamic(f"Strategic Advisory:\n{context['strategy']}")
+            .build()
         )
 
     def process(self, *args, **kwargs) -> Dict[str, Any]:
@@ -111,7 +107,8 @@ class Player1(NegotiationAgent):
                 action_prompt = self._get_action_prompt(context)
                 response = self.generate_response(
                     action_prompt,
-                    temperature=0.7
+                    temperature=0.7,
+                    response_schema=ACTION_SCHEMA
                 )
                 
                 try:
@@ -139,34 +136,62 @@ class Player1(NegotiationAgent):
             
         raise ValueError(f"Unknown action: {action}")
 
-    def generate_thinking(self, strategy: str = None) -> str:
-        """Generate deep strategic thinking"""
-        strategy = strategy or self.strategy_advisory
-        context = {
+    def _turn_context(self, strategy: str = None) -> Dict[str, Any]:
+        """Build the prompt context for the current turn"""
+        return {
             'round': self.round,
             'player_statuses': self.get_player_statuses(),
-            'strategy': strategy
+            'strategy': strategy or self.strategy_advisory
         }
-        thinking_prompt = self._get_thinking_prompt(context)
-        thinking = self.generate_response(thinking_prompt, temperature=0.9)
-        return thinking
+
+    def _parse_action(self, response: str) -> Dict[str, Any]:
+        """Parse the raw action response"""
+        action = json.loads(response)
+        return {
+            "message": action.get("message", "No message"),
+            "transfers": action.get("transfers", [])
+        }
+
+    def generate_thinking(self, strategy: str = None) -> str:
+        """Generate deep strategic thinking"""
+        thinking_prompt = self._get_thinking_prompt(self._turn_context(strategy))
+        with call_labels(phase="thinking"):
+            return self.generate_response(thinking_prompt, temperature=0.9)
+
+    async def agenerate_thinking(self, strategy: str = None) -> str:
+        """Generate deep strategic thinking without blocking the event loop"""
+        thinking_prompt = self._get_thinking_prompt(self._turn_context(strategy))
+        with call_labels(phase="thinking"):
+            return await self.agenerate_response(thinking_prompt, temperature=0.9)
+
+    async def astream_thinking(self, strategy: str = None) -> AsyncIterator[str]:
+        """Stream deep strategic thinking chunk by chunk"""
+        thinking_prompt = self._get_thinking_prompt(self._turn_context(strategy))
+        with call_labels(phase="thinking"):
+            async for chunk in self.astream_response(thinking_prompt, temperature=0.9):
+                yield chunk
 
     def generate_action(self, strategy: str = None) -> Dict[str, Any]:
         """Generate action based on strategy"""
-        strategy = strategy or self.strategy_advisory
-        context = {
-            'round': self.round,
-            'player_statuses': self.get_player_statuses(),
-            'strategy': strategy
-        }
-        action_prompt = self._get_action_prompt(context)
+        action_prompt = self._get_action_prompt(self._turn_context(strategy))
         try:
-            response = self.generate_response(action_prompt, temperature=0.7)
-            action = json.loads(response)
+            with call_labels(phase="action"):
+                response = self.generate_response(action_prompt, temperature=0.7, response_schema=ACTION_SCHEMA)
+            return self._parse_action(response)
+        except Exception as e:
+            self.logger.error(f"Error generating action: {str(e)}")
             return {
-                "message": action.get("message", "No message"),
-                "transfers": action.get("transfers", [])
+                "message": "Error occurred while deciding action",
+                "transfers": []
             }
+
+    async def agenerate_action(self, strategy: str = None) -> Dict[str, Any]:
+        """Generate action based on strategy without blocking the event loop"""
+        action_prompt = self._get_action_prompt(self._turn_context(strategy))
+        try:
+            with call_labels(phase="action"):
+                response = await self.agenerate_response(action_prompt, temperature=0.7, response_schema=ACTION_SCHEMA)
+            return self._parse_action(response)
         except Exception as e:
             self.logger.error(f"Error generating action: {str(e)}")
             return {
@@ -174,11 +199,41 @@ class Player1(NegotiationAgent):
                 "transfers": []
             }
 
+    def generate_turn(self, strategy: str = None) -> Tuple[str, Dict[str, Any]]:
+        """Generate private thinking and the public action in one call"""
+        turn_prompt = self._get_turn_prompt(self._turn_context(strategy))
+        try:
+            with call_labels(phase="turn"):
+                response = self.generate_response(turn_prompt, temperature=0.7, response_schema=TURN_SCHEMA)
+            return self._split_turn(response)
+        except Exception as e:
+            self.logger.error(f"Error generating turn: {str(e)}")
+            return "", {
+                "message": "Error occurred while deciding action",
+                "transfers": []
+            }
+
+    async def agenerate_turn(self, strategy: str = None) -> Tuple[str, Dict[str, Any]]:
+        """Generate private thinking and the public action in one call without blocking the event loop"""
+        turn_prompt = self._get_turn_prompt(self._turn_context(strategy))
+        try:
+            with call_labels(phase="turn"):
+                response = await self.agenerate_response(turn_prompt, temperature=0.7, response_schema=TURN_SCHEMA)
+            return self._split_turn(response)
+        except Exception as e:
+            self.logger.error(f"Error generating turn: {str(e)}")
+            return "", {
+                "message": "Error occurred while deciding action",
+                "transfers": []
+            }
+
 class Player2(NegotiationAgent):
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         # Call parent constructor first
-        super().__init__(name)
+        super().__init__(name, llm_provider)
         self.logger.info(f"Player2 {name} initialized")
+        # Trader Joe plays on instinct unless given an advisory (e.g. in tournaments)
+        self.strategy_advisory: Optional[str] = None
         
         # Override model config with player2-specific config
         config = Config()
@@ -186,42 +241,57 @@ class Player2(NegotiationAgent):
         self.model = model_config['default']
         self.backup_model = model_config['backup']
 
+    def set_strategy(self, strategy: str):
+        """Set the strategy for this player"""
+        if not strategy or not strategy.strip():
+            self.logger.warning("Empty strategy provided, keeping current strategy")
+            return
+        self.strategy_advisory = strategy
+        self.logger.info(f"Strategy set for {self.name}: {strategy[:100]}...")
+
     def _get_role_prompt(self) -> str:
         return NegotiationPrompts.PLAYER2_BASE
 
-    def _get_thinking_prompt(self, context: Dict[str, Any]) -> str:
-        """Generate thinking prompt for strategic analysis"""
+    def _turn_state(self, context: Dict[str, Any]) -> str:
+        """Per-turn game state shared by the thinking and action prompts"""
         return (
             f"Current round: {context['round']} of 5\n"
             f"Your coins: {self.coins}\n"
-            f"Other players' status:\n{context['player_statuses']}\n\n"
-            "As Trader Joe, analyze the current situation and plan your strategy.\n"
-            "Consider:\n"
-            "- Marco Polo's previous actions and patterns\n"
-            "- Potential counter-strategies\n"
-            "- Risk assessment of different approaches\n"
-            "- Optimal timing for cooperation or competition\n\n"
-            "Provide your private strategic analysis."
+            f"Other players' status:\n{context['player_statuses']}"
         )
 
-    def _get_action_prompt(self, context: Dict[str, Any]) -> str:
+    def _get_thinking_prompt(self, context: Dict[str, Any]) -> Prompt:
+        """Generate thinking prompt for strategic analysis"""
+        return (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.PLAYER2_THINKING)
+            .dynamic(self._turn_state(context))
+            .dynamic(f"Strategic Advisory:\n{context['strategy']}" if context.get('strategy') else "")
+            .dynamic("Provide your private strategic analysis.")
+            .build()
+        )
+
+    def _get_action_prompt(self, context: Dict[str, Any]) -> Prompt:
         """Generate action prompt for Trader Joe"""
         return (
-            f"Current round: {context['round']} of 5\n"
-            f"Your coins: {self.coins}\n"
-            f"Other players' status:\n{context['player_statuses']}\n\n"
-            "As Trader Joe, generate your next trading action.\n"
-            "You must respond with a valid JSON object using this exact structure:\n"
-            "{\n"
-            '    "message": "your message to Marco Polo",\n'
-            '    "transfers": [{"recipient": "Marco Polo", "amount": number}]\n'
-            "}\n"
-            "Important:\n"
-            "- Respond with ONLY the JSON object\n"
-            "- No markdown formatting\n"
-            "- No explanations\n"
-            "- amount must be a number\n"
-            "- transfers can be empty list []"
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.PLAYER2_ACTION)
+            .dynamic(self._turn_state(context))
+            .build()
+        )
+
+    def _get_turn_prompt(self, context: Dict[str, Any]) -> Prompt:
+        """Single-call prompt: the thinking brief plus the combined reply format"""
+        return (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.PLAYER2_THINKING)
+            .static(NegotiationPrompts.PLAYER2_TURN)
+            .dynamic(self._turn_state(context))
+            .dynamic(f"Strategic Advisory:\n{context['strategy']}" if context.get('strategy') else "")
+            .build()
         )
 
     def process(self, *args, **kwargs) -> Dict[str, Any]:
@@ -253,7 +323,8 @@ class Player2(NegotiationAgent):
             
             response = self.generate_response(
                 action_prompt,
-                temperature=0.7  # Lower temperature for more consistent JSON
+                temperature=0.7,  # Lower temperature for more consistent JSON
+                response_schema=ACTION_SCHEMA
             )
             
             try:
@@ -269,25 +340,16 @@ class Player2(NegotiationAgent):
                 }
         raise ValueError(f"Unknown action: {action}")
 
-    def generate_thinking(self) -> str:
-        """Generate deep strategic thinking"""
-        context = {
+    def _turn_context(self) -> Dict[str, Any]:
+        """Build the prompt context for the current turn"""
+        return {
             'round': self.round,
-            'player_statuses': self.get_player_statuses()
+            'player_statuses': self.get_player_statuses(),
+            'strategy': self.strategy_advisory
         }
-        thinking_prompt = self._get_thinking_prompt(context)
-        thinking = self.generate_response(thinking_prompt, temperature=0.9)
-        return thinking
 
-    def generate_action(self) -> Dict[str, Any]:
-        """Generate action based on thinking"""
-        context = {
-            'round': self.round,
-            'player_statuses': self.get_player_statuses()
-        }
-        action_prompt = self._get_action_prompt(context)
-        response = self.generate_response(action_prompt, temperature=0.7)
-        
+    def _parse_action(self, response: str) -> Dict[str, Any]:
+        """Parse the raw action response"""
         try:
             action_dict = json.loads(response)
             return action_dict
@@ -295,4 +357,51 @@ class Player2(NegotiationAgent):
             return {
                 "message": "Error processing response",
                 "transfers": []
-            } 
\ No newline at end of file
+            }
+
+    def generate_thinking(self) -> str:
+        """Generate deep strategic thinking"""
+        thinking_prompt = self._get_thinking_prompt(self._turn_context())
+        with call_labels(phase="thinking"):
+            return self.generate_response(thinking_prompt, temperature=0.9)
+
+    async def agenerate_thinking(self) -> str:
+        """Generate deep strategic thinking without blocking the event loop"""
+        thinking_prompt = self._get_thinking_prompt(self._turn_context())
+        with call_labels(phase="thinking"):
+            return await self.agenerate_response(thinking_prompt, temperature=0.9)
+
+    async def astream_thinking(self) -> AsyncIterator[str]:
+        """Stream deep strategic thinking chunk by chunk"""
+        thinking_prompt = self._get_thinking_prompt(self._turn_context())
+        with call_labels(phase="thinking"):
+            async for chunk in self.astream_response(thinking_prompt, temperature=0.9):
+                yield chunk
+
+    def generate_action(self) -> Dict[str, Any]:
+        """Generate action based on thinking"""
+        action_prompt = self._get_action_prompt(self._turn_context())
+        with call_labels(phase="action"):
+            response = self.generate_response(action_prompt, temperature=0.7, response_schema=ACTION_SCHEMA)
+        return self._parse_action(response)
+
+    async def agenerate_action(self) -> Dict[str, Any]:
+        """Generate action without blocking the event loop"""
+        action_prompt = self._get_action_prompt(self._turn_context())
+        with call_labels(phase="action"):
+            response = await self.agenerate_response(action_prompt, temperature=0.7, response_schema=ACTION_SCHEMA)
+        return self._parse_action(response)
+
+    def generate_turn(self) -> Tuple[str, Dict[str, Any]]:
+        """Generate private thinking and the public action in one call"""
+        turn_prompt = self._get_turn_prompt(self._turn_context())
+        with call_labels(phase="turn"):
+            response = self.generate_response(turn_prompt, temperature=0.7, response_schema=TURN_SCHEMA)
+        return self._split_turn(response)
+
+    async def agenerate_turn(self) -> Tuple[str, Dict[str, Any]]:
+        """Generate private thinking and the public action in one call without blocking the event loop"""
+        turn_prompt = self._get_turn_prompt(self._turn_context())
+        with call_labels(phase="turn"):
+            response = await self.agenerate_response(turn_prompt, temperature=0.7, response_schema=TURN_SCHEMA)
+        return self._split_turn(response)
@@ -35,4 +35,153 @@ class NegotiationPrompts:
     - You can see your opponent's move before deciding
     - Use this information advantage wisely
     - Consider both short-term and long-term gains
-    """ 
\ No newline at end of file
+    """
+
+    # Static turn instructions, kept apart from the per-turn game state so
+    # they can be sent as a cacheable prefix
+    PLAYER1_THINKING = (
+        "=== DEEP THINKING (Private Analysis) ===\n"
+        "As Marco Polo, analyze the current situation. This is your private thought process that others cannot see.\n\n"
+        "Consider and analyze deeply:\n"
+        "1. Trust Assessment:\n"
+        "   - Analyze Trader Joe's past behavior patterns\n"
+        "   - Evaluate likelihood of cooperation vs betrayal\n"
+        "2. Game Theory Analysis:\n"
+        "   - Calculate optimal coin distribution\n"
+        "   - Evaluate risk/reward ratios\n"
+        "3. Strategic Planning:\n"
+        "   - Plan next 2-3 moves ahead\n"
+        "   - Consider bluffing or misdirection\n"
+        "4. Psychological Warfare:\n"
+        "   - Identify opponent's weaknesses\n"
+        "   - Plan manipulation tactics"
+    )
+
+    PLAYER1_ACTION = (
+        "Based on your deep analysis, generate your next move with these sections:\n\n"
+        "=== SPEAK (Public Communication) ===\n"
+        "Create a diplomatic message to Trader Joe that aligns with your strategy.\n"
+        "This will be visible to others.\n\n"
+        "=== ACTION (Game Moves) ===\n"
+        "Decide on coin transfers that support your strategy.\n\n"
+        "Respond with this exact JSON structure:\n"
+        "{\n"
+        '    "message": "Your diplomatic message to Trader Joe",\n'
+        '    "transfers": [{"recipient": "Trader Joe", "amount": number}]\n'
+        "}\n\n"
+        "Requirements:\n"
+        "- Message should be strategic but not reveal your true intentions\n"
+        "- Transfers must be numbers, not strings\n"
+        "- No markdown or explanations in the response\n"
+        "- Only the JSON object is allowed"
+    )
+
+    PLAYER2_THINKING = (
+        "As Trader Joe, analyze the current situation and plan your strategy.\n"
+        "Consider:\n"
+        "- Marco Polo's previous actions and patterns\n"
+        "- Potential counter-strategies\n"
+        "- Risk assessment of different approaches\n"
+        "- Optimal timing for cooperation or competition"
+    )
+
+    PLAYER2_ACTION = (
+        "As Trader Joe, generate your next trading action.\n"
+        "You must respond with a valid JSON object using this exact structure:\n"
+        "{\n"
+        '    "message": "your message to Marco Polo",\n'
+        '    "transfers": [{"recipient": "Marco Polo", "amount": number}]\n'
+        "}\n"
+        "Important:\n"
+        "- Respond with ONLY the JSON object\n"
+        "- No markdown formatting\n"
+        "- No explanations\n"
+        "- amount must be a number\n"
+        "- transfers can be empty list []"
+    )
+
+    # Single-call turns: the private analysis and the public move in one reply
+    PLAYER1_TURN = (
+        "Do your private analysis and decide your move in a single response.\n\n"
+        "Respond with this exact JSON structure:\n"
+        "{\n"
+        '    "thinking": "Your private strategic analysis (never shown to Trader Joe)",\n'
+        '    "message": "Your diplomatic message to Trader Joe",\n'
+        '    "transfers": [{"recipient": "Trader Joe", "amount": number}]\n'
+        "}\n\n"
+        "Requirements:\n"
+        "- The message must not reveal the thinking\n"
+        "- Transfers must be numbers, not strings\n"
+        "- Only the JSON object is allowed"
+    )
+
+    PLAYER2_TURN = (
+        "As Trader Joe, analyze the situation and decide your trading action in a single response.\n"
+        "You must respond with a valid JSON object using this exact structure:\n"
+        "{\n"
+        '    "thinking": "your private analysis (never shown to Marco Polo)",\n'
+        '    "message": "your message to Marco Polo",\n'
+        '    "transfers": [{"recipient": "Marco Polo", "amount": number}]\n'
+        "}\n"
+        "Important:\n"
+        "- Respond with ONLY the JSON object\n"
+        "- amount must be a number\n"
+        "- transfers can be empty list []"
+    )
+
+    # Static coordinator instructions, sent as a cacheable prefix
+    COORDINATOR_FORMAT = """
+        As a bilingual host, format this player's response and add entertaining commentary in both languages.
+
+        Format as JSON:
+        {
+            "thinking": "🎙️ [English Commentary] Strategic analysis here\\n🎭 [中文点评] 你的精彩评论",
+            "message": "player's message in English",
+            "transfers": [
+                {"recipient": "player_name", "amount": number}
+            ]
+        }
+
+        Requirements:
+        - Keep player's message in English for accuracy
+        - Provide commentary in both English and Chinese
+        - Validate transfers against the player's available coins
+        - Use emojis and entertaining tone
+        - Create dramatic moments
+        """
+
+    COORDINATOR_HISTORY = """
+        Condense the game history below into a short narrative for the players' memory.
+
+        Requirements:
+        - At most 120 words of plain English, no JSON
+        - Keep who trusted, helped or betrayed whom, and any promises still open
+        - Keep net coin movements between players
+        - Drop greetings, repetition and commentary
+        """
+
+    COORDINATOR_SUMMARY = """
+        Create an exciting bilingual summary of the round described below!
+
+        Respond in this JSON format:
+        {
+            "round_summary": {
+                "highlights": {
+                    "en": "Most exciting moves and strategies",
+                    "zh": "本回合最激动人心的操作和策略"
+                },
+                "alliances": {
+                    "en": "Analysis of alliances and betrayals",
+                    "zh": "联盟与背叛的情况分析"
+                },
+                "impact": {
+                    "en": "How coin distribution affects the game",
+                    "zh": "金币分布的变化对游戏的影响"
+                },
+                "next_round": {
+                    "en": "Expectations for next round",
+                    "zh": "对下一回合的期待和预测"
+                }
+            }
+        }
+        """
@@ -1,7 +1,11 @@
 import os
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from src.core.checkpoint import CONFIGURED_STORE, CheckpointStore, get_checkpoint_store, get_recording_store
+from src.core.ledger import CoinLedger
+from src.core.memory import ConversationMemory
 from src.utils.config import Config
 from src.utils.logger import GameLogger
 from ..agents.players import Player1, Player2
@@ -10,80 +14,47 @@ import json
 import re
 import uuid
 import asyncio
-from src.api.events.types import GameEventType
+import contextvars
+import time
 from src.utils.fileverse_client import FileverseClient
 from colorama import Fore, Style
 from src.utils.json_utils import game_json_dumps
+from src.utils.llm_providers.base import BaseLLMProvider
+from src.utils.llm_providers.metrics import call_labels, get_metrics
 
-class ConversationMemory:
-    def __init__(self):
-        self.messages = []
-        self.transfers = []
-    
-    def add_message(self, speaker: str, message: str):
-        self.messages.append({
-            'round': len(self.messages) // 2 + 1,  # 2 players per round
-            'speaker': speaker,
-            'message': message,
-            'timestamp': datetime.now()
-        })
-    
-    def add_transfer(self, sender: str, recipient: str, amount: int):
-        self.transfers.append({
-            'round': len(self.messages) // 2 + 1,
-            'sender': sender,
-            'recipient': recipient,
-            'amount': amount,
-            'timestamp': datetime.now()
-        })
-    
-    def get_recent_context(self, n_messages: int = 5) -> str:
-        """Get recent conversation context"""
-        recent = self.messages[-n_messages:] if self.messages else []
-        context = "\nRecent conversation:\n"
-        for msg in recent:
-            context += f"Round {msg['round']} - {msg['speaker']}: {msg['message']}\n"
-        
-        if self.transfers:
-            context += "\nRecent transfers:\n"
-            for transfer in self.transfers[-n_messages:]:
-                context += f"Round {transfer['round']} - {transfer['sender']} → {transfer['recipient']}: {transfer['amount']} coins\n"
-        
-        return context
+# Round modes: players take turns, or both decide from the round-start state
+SEQUENTIAL = "sequential"
+SIMULTANEOUS = "simultaneous"
+ROUND_MODES = (SEQUENTIAL, SIMULTANEOUS)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert memory to dictionary for serialization"""
-        return {
-            'messages': [
-                {
-                    'round': msg['round'],
-                    'speaker': msg['speaker'],
-                    'message': msg['message'],
-                    'timestamp': msg['timestamp'].isoformat()  # Convert datetime to string
-                }
-                for msg in self.messages
-            ],
-            'transfers': [
-                {
-                    'round': transfer['round'],
-                    'sender': transfer['sender'],
-                    'recipient': transfer['recipient'],
-                    'amount': transfer['amount'],
-                    'timestamp': transfer['timestamp'].isoformat()  # Convert datetime to string
-                }
-                for transfer in self.transfers
-            ]
-        }
+# Player turns per round; a simultaneous round completes both at once
+TURNS_PER_ROUND = 2
 
 class NegotiationRuntime:
-    def __init__(self, logger=None, event_manager=None):
+    def __init__(
+        self,
+        logger=None,
+        event_manager=None,
+        concurrent_turns: Optional[bool] = None,
+        combined_turns: Optional[bool] = None,
+        round_mode: Optional[str] = None,
+        checkpoints: Optional[CheckpointStore] = CONFIGURED_STORE,
+        llm_provider: Optional[BaseLLMProvider] = None,
+        recordings: Optional[CheckpointStore] = CONFIGURED_STORE
+    ):
         self.state = "created"  # States: created -> running -> complete/error
         self.logger = logger or GameLogger(str(uuid.uuid4()))
         self.event_manager = event_manager
+        self.game_id = getattr(event_manager, "game_id", None) or str(uuid.uuid4())
         self.log_messages = []  # Add this to store logs
-        self.player1 = Player1("Marco Polo")
-        self.player2 = Player2("Trader Joe")
+        # Agents use the routed providers unless one is given (e.g. a stub for offline runs)
+        self.player1 = Player1("Marco Polo", llm_provider)
+        self.player2 = Player2("Trader Joe", llm_provider)
         self.round = 1
+        self.turns_done = 0  # completed player turns in the current round
+        # Stores default to the configured ones; an explicit None turns persistence off
+        self.checkpoints = get_checkpoint_store() if checkpoints is CONFIGURED_STORE else checkpoints
+        self.recordings = get_recording_store() if recordings is CONFIGURED_STORE else recordings
         
         # Get config and set debug mode
         config = Config()
@@ -93,18 +64,38 @@ class NegotiationRuntime:
         # Log configuration
         self.logger.info(f"Game initialized with {self.max_rounds} rounds (Debug mode: {self.debug_mode})")
         
-        # Reduce delays in debug mode
+        # Suggested playback pauses for spectators (reduced in debug mode); the
+        # game itself never sleeps, subscribers pace events by playback_offset
         self.turn_delay = 0.2 if self.debug_mode else 0.5
         self.round_delay = 0.5 if self.debug_mode else 1.0
         
         space_config = config.get_space_config('merchants_1o1')
         self.player_order = space_config['players']
+        # Thinking and action prompts are independent, so both calls can be in flight at once
+        self.concurrent_turns = space_config.get('concurrent_turns', False) if concurrent_turns is None else concurrent_turns
+        # Turn events a concurrent turn already emitted as its calls completed, by player
+        self._streamed_events: Dict[str, List[Dict[str, Any]]] = {}
+        # One structured call per turn instead of separate thinking and action calls
+        self.combined_turns = space_config.get('combined_turns', False) if combined_turns is None else combined_turns
+        self.round_mode = round_mode or space_config.get('round_mode', SEQUENTIAL)
+        if self.round_mode not in ROUND_MODES:
+            raise ValueError(f"Unknown round mode: {self.round_mode} (expected one of {', '.join(ROUND_MODES)})")
+        self.latency_saved = 0.0
         self.players = {
             self.player_order[0]: self.player1,
             self.player_order[1]: self.player2
         }
-        self.coordinator = CoordinatorAgent('Coordinator')
-        self.memory = ConversationMemory()
+        self.ledger = CoinLedger.for_agents(self.players)
+        self.coordinator = CoordinatorAgent('Coordinator', llm_provider)
+        # Long games fold older rounds into a summary so prompts stop growing
+        memory_config = space_config.get('memory', {}) or {}
+        self.memory_settings = {
+            'keep_rounds': memory_config.get('keep_rounds'),
+            'max_context_tokens': memory_config.get('max_context_tokens')
+        }
+        self.llm_summary = memory_config.get('llm_summary', False)
+        self._summary_task: Optional[asyncio.Task] = None
+        self.memory = ConversationMemory(**self.memory_settings)
         self.system_prompt = self._get_system_prompt()
         self.strategy_advisory = """
         Strategy for Marco Polo:
@@ -140,66 +131,171 @@ class NegotiationRuntime:
         """Format datetime for JSON serialization"""
         return dt.isoformat() if isinstance(dt, datetime) else str(dt)
 
+    @property
+    def turn_mode(self) -> str:
+        """How each player turn calls the LLM: combined, concurrent or sequential"""
+        if self.combined_turns:
+            return "combined"
+        return "concurrent" if self.concurrent_turns else "sequential"
+
+    def get_event_history(self) -> List[Dict[str, Any]]:
+        """Events emitted for this game so far"""
+        return self.event_manager.get_event_history() if self.event_manager else []
+
+    def _persisted_events(self) -> List[Dict[str, Any]]:
+        """Event history to write to disk
+
+        Streamed thinking chunks are left out: each turn's
+        ``player_thinking`` event already carries the full text.
+        """
+        from src.api.events.types import GameEventType
+        delta = GameEventType.PLAYER_THINKING_DELTA.value
+        return [e for e in self.get_event_history() if e.get("name") != delta]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Everything needed to continue the game after the last completed turn"""
+        return {
+            "game_id": self.game_id,
+            "state": self.state,
+            "round": self.round,
+            "turns_done": self.turns_done,
+            "max_rounds": self.max_rounds,
+            "balances": self.get_player_statuses(),
+            "ledger": self.ledger.to_dict(),
+            "strategy": self.strategy_advisory,
+            "player1_strategy": self.player1.strategy_advisory,
+            "player2_strategy": self.player2.strategy_advisory,
+            "concurrent_turns": self.concurrent_turns,
+            "combined_turns": self.combined_turns,
+            "round_mode": self.round_mode,
+            "latency_saved": self.latency_saved,
+            "memory": self.memory.to_dict(),
+            "memory_settings": self.memory_settings,
+            "narrative": {"text": self.memory.narrative, "through": self.memory.narrative_through},
+            "events": self._persisted_events(),
+            "saved_at": datetime.now().isoformat()
+        }
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        checkpoint: Dict[str, Any],
+        logger=None,
+        event_manager=None,
+        checkpoints: Optional[CheckpointStore] = CONFIGURED_STORE,
+        recordings: Optional[CheckpointStore] = CONFIGURED_STORE,
+        llm_provider: Optional[BaseLLMProvider] = None
+    ) -> "NegotiationRuntime":
+        """Rebuild a runtime from ``snapshot`` output; ``run_game`` continues from there"""
+        runtime = cls(
+            logger=logger,
+            event_manager=event_manager,
+            concurrent_turns=checkpoint["concurrent_turns"],
+            combined_turns=checkpoint["combined_turns"],
+            round_mode=checkpoint["round_mode"],
+            checkpoints=checkpoints,
+            recordings=recordings,
+            llm_provider=llm_provider
+        )
+        runtime.game_id = checkpoint["game_id"]
+        runtime.round = checkpoint["round"]
+        runtime.turns_done = checkpoint["turns_done"]
+        runtime.max_rounds = checkpoint["max_rounds"]
+        if checkpoint.get("ledger"):
+            runtime.ledger = CoinLedger.from_dict(checkpoint["ledger"])
+            for player in runtime.players.values():
+                player.ledger = runtime.ledger
+        else:
+            for name, coins in checkpoint["balances"].items():
+                runtime.players[name].coins = coins
+        runtime.strategy_advisory = checkpoint["strategy"]
+        runtime.player1.strategy_advisory = checkpoint["player1_strategy"]
+        runtime.player2.strategy_advisory = checkpoint.get("player2_strategy")
+        runtime.latency_saved = checkpoint.get("latency_saved", 0.0)
+        runtime.memory_settings = checkpoint.get("memory_settings", runtime.memory_settings)
+        runtime.memory = ConversationMemory.from_dict(checkpoint["memory"], **runtime.memory_settings)
+        narrative = checkpoint.get("narrative") or {}
+        if narrative.get("text"):
+            runtime.memory.set_narrative(narrative["text"], narrative["through"])
+        runtime.logger.info(f"Restored game {runtime.game_id} at round {runtime.round}, turn {runtime.turns_done + 1}")
+        return runtime
+
+    async def _checkpoint(self):
+        """Persist progress off the event loop; a failed write is logged and never stops the game"""
+        if not self.checkpoints:
+            return
+        try:
+            await asyncio.to_thread(self.checkpoints.save, self.game_id, self.snapshot())
+        except Exception as e:
+            self.logger.warning(f"Failed to checkpoint game {self.game_id}: {str(e)}")
+
     def get_player_statuses(self) -> Dict[str, int]:
         """Get player statuses (simplified)"""
-        return {name: player.coins for name, player in self.players.items()}
+        return self.ledger.balances()
     
     async def run_game(self) -> None:
-        """Run the game loop"""
+        """Run the game loop, attributing its LLM usage to this game"""
+        with call_labels(game_id=self.game_id):
+            await self._run_game()
+
+    async def _run_game(self) -> None:
         try:
+            resuming = self.round > 1 or self.turns_done > 0
             self.state = "running"
-            self.logger.info(f"{Fore.GREEN}Starting game with {self.max_rounds} rounds{Style.RESET_ALL}")
+            self.logger.info(f"{Fore.GREEN}{'Resuming' if resuming else 'Starting'} game with {self.max_rounds} rounds{Style.RESET_ALL}")
             
             # Emit game start event
             if self.event_manager:
-                await self.event_manager.emit_system("game_started", {
+                await self.event_manager.emit_system("game_resumed" if resuming else "game_started", {
                     "players": self.player_order,
                     "initial_state": self.get_player_statuses(),
                     "max_rounds": self.max_rounds,
-                    "debug_mode": self.debug_mode
+                    "debug_mode": self.debug_mode,
+                    "turn_mode": self.turn_mode,
+                    "round_mode": self.round_mode,
+                    "round": self.round,
+                    "turns_done": self.turns_done
                 })
+            await self._checkpoint()
 
-            # Main game loop
-            for round_num in range(1, self.max_rounds + 1):
+            # Main game loop; a resumed game skips the turns its checkpoint already covers
+            for round_num in range(self.round, self.max_rounds + 1):
                 try:
                     self.round = round_num
                     self.logger.info(f"\n{Fore.CYAN}=== Round {round_num} ==={Style.RESET_ALL}")
                     
                     # Emit round start event
-                    if self.event_manager:
+                    if self.event_manager and self.turns_done == 0:
                         await self.event_manager.emit_system("round_started", {
                             "round": round_num,
                             "standings": self.get_player_statuses()
                         })
                     
-                    # Process Player 1's turn
-                    events = self.process_player1_turn()
-                    for event in events:
-                        if self.event_manager:
-                            await self.event_manager.emit(
-                                event["type"],
-                                event["name"],
-                                event["data"]
-                            )
-                        await asyncio.sleep(self.turn_delay)
-                    
-                    # Process Player 2's turn
-                    events = self.process_player2_turn()
-                    for event in events:
-                        if self.event_manager:
-                            await self.event_manager.emit(
-                                event["type"],
-                                event["name"],
-                                event["data"]
-                            )
-                        await asyncio.sleep(self.turn_delay)
+                    if self.round_mode == SIMULTANEOUS:
+                        # Both players decide from the same state; transfers apply together
+                        if self.turns_done == 0:
+                            await self._emit_turn_events(await self.aprocess_simultaneous_round())
+                            await self._complete_turns(TURNS_PER_ROUND)
+                    else:
+                        # Process Player 1's turn
+                        if self.turns_done < 1:
+                            await self._emit_turn_events(await self.aprocess_player1_turn())
+                            await self._complete_turns(1)
+                        
+                        # Process Player 2's turn
+                        if self.turns_done < 2:
+                            await self._emit_turn_events(await self.aprocess_player2_turn())
+                            await self._complete_turns(2)
+                    self.ledger.close_round(round_num)
                     
                     # Round summary
                     if self.event_manager:
                         await self.event_manager.emit_system("round_summary", 
                             self.get_round_summary()
                         )
-                    await asyncio.sleep(self.round_delay)
+                    self._pace(self.round_delay)
+                    self.turns_done = 0
+                    self._schedule_history_summary()
                     
                 except Exception as e:
                     self.logger.error(f"{Fore.RED}Error in round {round_num}: {str(e)}{Style.RESET_ALL}")
@@ -207,29 +303,109 @@ class NegotiationRuntime:
                         await self.event_manager.emit_error(f"Round {round_num} error: {str(e)}")
                     raise
             
-            # Game end
+            # Game end; a narrative still being written has no turn left to serve
+            self._cancel_history_summary()
             self.state = "complete"
             if self.event_manager:
                 await self.event_manager.emit_system("game_ended", {
                     "winner": self.get_winner(),
-                    "final_standings": self.get_player_statuses()
+                    "final_standings": self.get_player_statuses(),
+                    "usage": get_metrics().end_game(self.game_id),
+                    "latency_saved_seconds": round(self.latency_saved, 3)
                 })
+            if self.checkpoints:
+                await asyncio.to_thread(self.checkpoints.delete, self.game_id)
+            await self._record()
                 
         except Exception as e:
+            self._cancel_history_summary()
             self.state = "error"
             self.logger.error(f"{Fore.RED}Game error: {str(e)}{Style.RESET_ALL}")
             if self.event_manager:
                 await self.event_manager.emit_error(str(e))
             raise
 
+    def _schedule_history_summary(self):
+        """Have the coordinator narrate newly folded rounds while the next round plays
+
+        Turns keep using the deterministic summary until the narrative
+        lands; at most one summary call is in flight per game.
+        """
+        if not self.llm_summary or (self._summary_task and not self._summary_task.done()):
+            return
+        pending = self.memory.pending_narrative()
+        if pending:
+            self._summary_task = asyncio.create_task(self._summarize_history(*pending))
+
+    async def _summarize_history(self, through: int, history: str):
+        try:
+            self.memory.set_narrative(await self.coordinator.asummarize_history(history), through)
+        except Exception as e:
+            self.logger.warning(f"History summary through round {through} failed: {str(e)}")
+
+    def _cancel_history_summary(self):
+        if self._summary_task and not self._summary_task.done():
+            self._summary_task.cancel()
+        self._summary_task = None
+
+    async def _record(self):
+        """Keep the finished game's event stream for replays, written off the event loop; a failed write is only logged"""
+        if not self.recordings:
+            return
+        events = self._persisted_events()
+        if not events:
+            return
+        try:
+            await asyncio.to_thread(self.recordings.save, self.game_id, {
+                "game_id": self.game_id,
+                "space": "merchants_1o1",
+                "round_mode": self.round_mode,
+                "recorded_at": datetime.now().isoformat(),
+                "events": events
+            })
+        except Exception as e:
+            self.logger.warning(f"Failed to record game {self.game_id}: {str(e)}")
+
+    async def _complete_turns(self, turns_done: int):
+        self.turns_done = turns_done
+        await self._checkpoint()
+
+    def _pace(self, seconds: float):
+        """Leave a playback pause for spectators without holding up the game"""
+        if self.event_manager:
+            self.event_manager.pace(seconds)
+
+    async def _emit_turn_event(self, event: Dict[str, Any]):
+        """Emit one turn event followed by a playback pause"""
+        if self.event_manager:
+            await self.event_manager.emit(
+                event["type"],
+                event["name"],
+                event["data"]
+            )
+        event["emitted"] = True
+        self._pace(self.turn_delay)
+
+    async def _emit_turn_events(self, events: List[Dict[str, Any]]):
+        """Emit a turn's events that concurrent calls have not already sent"""
+        for event in events:
+            if not event.get("emitted"):
+                await self._emit_turn_event(event)
+
+    def _remember_message(self, player_name: str, action: Dict[str, Any]):
+        """Keep a player's public message in the conversation memory"""
+        message = action.get("message")
+        if message:
+            self.memory.add_message(player_name, message, round_num=self.round)
+
     def _process_transfers(self, player, transfers):
         for transfer in transfers:
             recipient = transfer['recipient']
             amount = transfer['amount']
             if recipient in self.players:
-                if player.transfer_coins(amount, self.players[recipient]):
+                if self.ledger.transfer(player.name, recipient, amount, round_num=self.round):
                     self.logger.info(f"💰 {player.name} transferred {amount} coins to {recipient}")
-                    self.memory.add_transfer(player.name, recipient, amount) 
+                    self.memory.add_transfer(player.name, recipient, amount, round_num=self.round)
 
     def get_logs(self) -> List[str]:
         """Get all game logs"""
@@ -259,26 +435,9 @@ class NegotiationRuntime:
         """Get summary for a specific round"""
         return {
             "round": round_num,
-            "standings": self.get_player_statuses(),
-            "messages": [
-                {
-                    'round': m['round'],
-                    'speaker': m['speaker'],
-                    'message': m['message'],
-                    'timestamp': m['timestamp'].isoformat()  # Convert datetime to string
-                }
-                for m in self.memory.messages if m['round'] == round_num
-            ],
-            "transfers": [
-                {
-                    'round': t['round'],
-                    'sender': t['sender'],
-                    'recipient': t['recipient'],
-                    'amount': t['amount'],
-                    'timestamp': t['timestamp'].isoformat()  # Convert datetime to string
-                }
-                for t in self.memory.transfers if t['round'] == round_num
-            ]
+            "standings": self.ledger.snapshot(round_num),
+            "messages": [m.to_dict() for m in self.memory.round_messages(round_num)],
+            "transfers": [t.to_dict() for t in self.memory.round_transfers(round_num)]
         }
 
     def _save_local_logs(self):
@@ -315,48 +474,224 @@ class NegotiationRuntime:
         self.player1.set_strategy(strategy)
         self.logger.info(f"Strategy set: {strategy[:100]}...")
 
+    def set_opponent_strategy(self, strategy: str):
+        """Give Trader Joe a strategy advisory too (used to pit strategies against each other)"""
+        self.player2.set_strategy(strategy)
+
+    def _turn_events(
+        self,
+        player_name: str,
+        thinking: str,
+        action: Dict[str, Any],
+        timing: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """The thinking and action events for a player's turn (those already emitted as they completed, if any)"""
+        streamed = self._streamed_events.pop(player_name, None)
+        if streamed:
+            return streamed
+        return [self._thinking_event(player_name, thinking), self._action_event(player_name, action, timing)]
+
+    @staticmethod
+    def _thinking_event(player_name: str, thinking: str) -> Dict[str, Any]:
+        return {
+            "type": "player",
+            "name": "player_thinking",
+            "data": {
+                "player": player_name,
+                "thinking": thinking,
+                "timestamp": datetime.now().isoformat()
+            }
+        }
+
+    @staticmethod
+    def _action_event(player_name: str, action: Dict[str, Any], timing: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        event = {
+            "type": "player",
+            "name": "player_action",
+            "data": {
+                "player": player_name,
+                "action": action,
+                "timestamp": datetime.now().isoformat()
+            }
+        }
+        if timing:
+            event["data"]["timing"] = timing
+        return event
+
+    def _record_timing(self, player_name: str, thinking_seconds: float, action_seconds: float, turn_seconds: float) -> Dict[str, float]:
+        """Per-turn latency, including what running both calls in parallel saved"""
+        saved = max(0.0, thinking_seconds + action_seconds - turn_seconds)
+        self.latency_saved += saved
+        self.logger.info(f"{player_name} turn took {turn_seconds:.2f}s ({saved:.2f}s saved by concurrent calls)")
+        return {
+            "thinking_seconds": round(thinking_seconds, 3),
+            "action_seconds": round(action_seconds, 3),
+            "turn_seconds": round(turn_seconds, 3),
+            "saved_seconds": round(saved, 3)
+        }
+
+    @staticmethod
+    def _in_parallel(*calls: Callable[[], Any]) -> List[Tuple[Any, float]]:
+        """Run blocking calls on worker threads, returning (result, seconds) for each"""
+        def timed(call):
+            started = time.perf_counter()
+            return call(), time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="turn") as pool:
+            # Each worker gets a copy of the caller's context so metric labels carry over
+            futures = [pool.submit(contextvars.copy_context().run, timed, call) for call in calls]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    async def _atimed(awaitable: Awaitable[Any]) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        return await awaitable, time.perf_counter() - started
+
+    @classmethod
+    async def _ain_parallel(cls, *awaitables: Awaitable[Any]) -> List[Tuple[Any, float]]:
+        """Await coroutines concurrently, returning (result, seconds) for each"""
+        tasks = [asyncio.create_task(cls._atimed(awaitable)) for awaitable in awaitables]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def _run_turn(
+        self,
+        player_name: str,
+        thinking_call: Callable[[], str],
+        action_call: Callable[[], Dict[str, Any]]
+    ) -> Tuple[str, Dict[str, Any], Optional[Dict[str, float]]]:
+        """Generate thinking and action, in parallel worker threads when concurrent turns are on"""
+        if not self.concurrent_turns:
+            return thinking_call(), action_call(), None
+
+        started = time.perf_counter()
+        (thinking, thinking_seconds), (action, action_seconds) = self._in_parallel(thinking_call, action_call)
+        timing = self._record_timing(player_name, thinking_seconds, action_seconds, time.perf_counter() - started)
+        return thinking, action, timing
+
+    async def _arun_turn(
+        self,
+        player_name: str,
+        thinking_chunks: AsyncIterator[str],
+        action_call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[str, Dict[str, Any], Optional[Dict[str, float]]]:
+        """Stream thinking and generate the action, concurrently when concurrent turns are on
+
+        Concurrent turns emit ``player_thinking`` as soon as the thinking
+        is done and ``player_action`` once the action is (never before the
+        thinking), instead of waiting for the slower of the two calls.
+        """
+        if not self.concurrent_turns:
+            thinking = await self._collect_thinking(player_name, thinking_chunks)
+            return thinking, await action_call(), None
+
+        started = time.perf_counter()
+        thinking_task = asyncio.create_task(self._atimed(self._collect_thinking(player_name, thinking_chunks)))
+        action_task = asyncio.create_task(self._atimed(action_call()))
+        try:
+            thinking, thinking_seconds = await thinking_task
+            thinking_event = self._thinking_event(player_name, thinking)
+            await self._emit_turn_event(thinking_event)
+            action, action_seconds = await action_task
+        except BaseException:
+            thinking_task.cancel()
+            action_task.cancel()
+            raise
+        timing = self._record_timing(player_name, thinking_seconds, action_seconds, time.perf_counter() - started)
+        action_event = self._action_event(player_name, action, timing)
+        await self._emit_turn_event(action_event)
+        self._streamed_events[player_name] = [thinking_event, action_event]
+        return thinking, action, timing
+
+    async def _collect_thinking(self, player_name: str, chunks: AsyncIterator[str]) -> str:
+        """Collect streamed thinking, forwarding each chunk as it arrives"""
+        # Imported here so headless runs do not pull in the API package (and its router cycle)
+        from src.api.events.types import GameEventType
+        parts = []
+        async for chunk in chunks:
+            if self.event_manager:
+                await self.event_manager.emit("player", GameEventType.PLAYER_THINKING_DELTA.value, {
+                    "player": player_name,
+                    "delta": chunk,
+                    "index": len(parts),
+                    "timestamp": datetime.now().isoformat()
+                })
+            parts.append(chunk)
+        return "".join(parts)
+
+    def _player1_context(self) -> Dict[str, Any]:
+        """Create context with current game state for Player 1"""
+        return {
+            "round": self.round,
+            "max_rounds": self.max_rounds,
+            "player_statuses": self.get_player_statuses(),
+            "conversation_history": self.memory.get_recent_context(),
+            "strategy": self.strategy_advisory
+        }
+
+    def _decide_player1(self) -> Tuple[str, Dict[str, Any], Optional[Dict[str, float]]]:
+        """Player 1's thinking and action for the current state (no transfers applied)"""
+        context = self._player1_context()
+        if self.combined_turns:
+            return (*self.player1.generate_turn(context), None)
+        return self._run_turn(
+            "Marco Polo",
+            lambda: self.player1.generate_thinking(context),
+            lambda: self.player1.generate_action(context)
+        )
+
+    async def _adecide_player1(self) -> Tuple[str, Dict[str, Any], Optional[Dict[str, float]]]:
+        """Player 1's thinking and action without blocking the event loop"""
+        context = self._player1_context()
+        if self.combined_turns:
+            return (*await self.player1.agenerate_turn(context), None)
+        return await self._arun_turn(
+            "Marco Polo",
+            self.player1.astream_thinking(context),
+            lambda: self.player1.agenerate_action(context)
+        )
+
+    def _decide_player2(self) -> Tuple[str, Dict[str, Any], Optional[Dict[str, float]]]:
+        """Player 2's thinking and action for the current state (no transfers applied)"""
+        if self.combined_turns:
+            return (*self.player2.generate_turn(), None)
+        return self._run_turn("Trader Joe", self.player2.generate_thinking, self.player2.generate_action)
+
+    async def _adecide_player2(self) -> Tuple[str, Dict[str, Any], Optional[Dict[str, float]]]:
+        """Player 2's thinking and action without blocking the event loop"""
+        if self.combined_turns:
+            return (*await self.player2.agenerate_turn(), None)
+        return await self._arun_turn("Trader Joe", self.player2.astream_thinking(), self.player2.agenerate_action)
+
     def process_player1_turn(self) -> List[Dict[str, Any]]:
         """Process Player 1's turn"""
         self.logger.info(f"{Fore.CYAN}Starting Player 1 (Marco Polo) turn{Style.RESET_ALL}")
-        events = []
         try:
-            # Create context with current game state
-            context = {
-                "round": self.round,
-                "max_rounds": self.max_rounds,
-                "player_statuses": self.get_player_statuses(),
-                "conversation_history": self.memory.get_recent_context(),
-                "strategy": self.strategy_advisory
-            }
+            # Thinking and action phases with the same context
+            thinking, action, timing = self._decide_player1()
             
-            # Thinking phase
-            thinking = self.player1.generate_thinking(context)
-            events.append({
-                "type": "player",
-                "name": "player_thinking",
-                "data": {
-                    "player": "Marco Polo",
-                    "thinking": thinking,
-                    "timestamp": datetime.now().isoformat()
-                }
-            })
+            # Remember the message, then process transfers
+            self._remember_message(self.player1.name, action)
+            self._process_transfers(self.player1, action.get("transfers", []))
             
-            # Action phase with same context
-            action = self.player1.generate_action(context)
-            events.append({
-                "type": "player",
-                "name": "player_action",
-                "data": {
-                    "player": "Marco Polo",
-                    "action": action,
-                    "timestamp": datetime.now().isoformat()
-                }
-            })
+            return self._turn_events("Marco Polo", thinking, action, timing)
             
-            # Process transfers
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Error in Player 1's turn: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    async def aprocess_player1_turn(self) -> List[Dict[str, Any]]:
+        """Process Player 1's turn without blocking the event loop"""
+        self.logger.info(f"{Fore.CYAN}Starting Player 1 (Marco Polo) turn{Style.RESET_ALL}")
+        try:
+            thinking, action, timing = await self._adecide_player1()
+            self._remember_message(self.player1.name, action)
             self._process_transfers(self.player1, action.get("transfers", []))
-            
-            return events
+            return self._turn_events("Marco Polo", thinking, action, timing)
             
         except Exception as e:
             self.logger.error(f"{Fore.RED}Error in Player 1's turn: {str(e)}{Style.RESET_ALL}")
@@ -365,41 +700,72 @@ class NegotiationRuntime:
     def process_player2_turn(self) -> List[Dict[str, Any]]:
         """Process Player 2's turn"""
         self.logger.info(f"{Fore.CYAN}Starting Player 2 (Trader Joe) turn{Style.RESET_ALL}")
-        events = []
         try:
-            # Thinking phase
-            thinking = self.player2.generate_thinking()
-            events.append({
-                "type": "player",
-                "name": "player_thinking",
-                "data": {
-                    "player": "Trader Joe",
-                    "thinking": thinking,
-                    "timestamp": datetime.now().isoformat()
-                }
-            })
-            
-            # Action phase
-            action = self.player2.generate_action()
-            events.append({
-                "type": "player",
-                "name": "player_action",
-                "data": {
-                    "player": "Trader Joe",
-                    "action": action,
-                    "timestamp": datetime.now().isoformat()
-                }
-            })
+            # Thinking and action phases
+            thinking, action, timing = self._decide_player2()
             
-            # Process transfers
+            # Remember the message, then process transfers
+            self._remember_message(self.player2.name, action)
             self._process_transfers(self.player2, action["transfers"])
             
-            return events
+            return self._turn_events("Trader Joe", thinking, action, timing)
+            
+        except Exception as e:
+            self.logger.error(f"{Fore.RED}Error in Player 2's turn: {str(e)}{Style.RESET_ALL}")
+            raise
+
+    async def aprocess_player2_turn(self) -> List[Dict[str, Any]]:
+        """Process Player 2's turn without blocking the event loop"""
+        self.logger.info(f"{Fore.CYAN}Starting Player 2 (Trader Joe) turn{Style.RESET_ALL}")
+        try:
+            thinking, action, timing = await self._adecide_player2()
+            self._remember_message(self.player2.name, action)
+            self._process_transfers(self.player2, action["transfers"])
+            return self._turn_events("Trader Joe", thinking, action, timing)
             
         except Exception as e:
             self.logger.error(f"{Fore.RED}Error in Player 2's turn: {str(e)}{Style.RESET_ALL}")
             raise
 
+    def _apply_simultaneous_transfers(self, actions: Dict[str, Dict[str, Any]]):
+        """Apply both players' transfers at once, each checked against round-start coins
+
+        Coins received this round cannot be passed on in the same round, so
+        the outcome does not depend on which player is processed first.
+        """
+        for sender, action in actions.items():
+            self._remember_message(sender, action)
+        orders = {sender: action.get("transfers", []) for sender, action in actions.items()}
+        for entry in self.ledger.settle(orders, round_num=self.round):
+            self.logger.info(f"💰 {entry.sender} transferred {entry.amount} coins to {entry.recipient}")
+            self.memory.add_transfer(entry.sender, entry.recipient, entry.amount, round_num=self.round)
+
+    def _simultaneous_events(self, decisions: List[Tuple[Any, float]], wall_seconds: float) -> List[Dict[str, Any]]:
+        """Apply the round's decisions and build its events in player order"""
+        ((thinking1, action1, timing1), seconds1), ((thinking2, action2, timing2), seconds2) = decisions
+        self._apply_simultaneous_transfers({"Marco Polo": action1, "Trader Joe": action2})
+        saved = max(0.0, seconds1 + seconds2 - wall_seconds)
+        self.latency_saved += saved
+        self.logger.info(f"Simultaneous round took {wall_seconds:.2f}s ({saved:.2f}s saved over sequential turns)")
+        return (
+            self._turn_events("Marco Polo", thinking1, action1, timing1)
+            + self._turn_events("Trader Joe", thinking2, action2, timing2)
+        )
+
+    def process_simultaneous_round(self) -> List[Dict[str, Any]]:
+        """Both players decide from the round-start state in parallel; transfers apply together"""
+        self.logger.info(f"{Fore.CYAN}Starting simultaneous round {self.round}{Style.RESET_ALL}")
+        started = time.perf_counter()
+        decisions = self._in_parallel(self._decide_player1, self._decide_player2)
+        return self._simultaneous_events(decisions, time.perf_counter() - started)
+
+    async def aprocess_simultaneous_round(self) -> List[Dict[str, Any]]:
+        """Simultaneous round without blocking the event loop"""
+        self.logger.info(f"{Fore.CYAN}Starting simultaneous round {self.round}{Style.RESET_ALL}")
+        started = time.perf_counter()
+        decisions = await self._ain_parallel(self._adecide_player1(), self._adecide_player2())
+        return self._simultaneous_events(decisions, time.perf_counter() - started)
+
     def get_winner(self) -> str:
         """Get the winner of the game"""
         statuses = self.get_player_statuses()
@@ -414,11 +780,10 @@ class NegotiationRuntime:
             "standings": self.get_player_statuses(),
             "transfers": [
                 {
-                    "from": t["sender"],
-                    "to": t["recipient"],
-                    "amount": t["amount"]
+                    "from": t.sender,
+                    "to": t.recipient,
+                    "amount": t.amount
                 }
-                for t in self.memory.transfers 
-                if t["round"] == self.round
+                for t in self.ledger.round_transfers(self.round)
             ]
         } 
\ No newline at end of file
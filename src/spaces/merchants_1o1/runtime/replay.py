@@ -0,0 +1,174 @@
+from typing import Dict, List, Any, Optional, Union
+import json
+import logging
+import os
+import uuid
+from src.core.ledger import CoinLedger
+from .negotiation import SEQUENTIAL, SIMULTANEOUS
+
+logger = logging.getLogger(__name__)
+
+class ReplayError(ValueError):
+    """A recording that cannot be replayed, or whose standings do not follow from its transfers"""
+
+def load_recording(source: Union[str, List[Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Events of a recorded game
+
+    ``source`` is an event list, a dict with ``events`` (recordings and
+    checkpoints), or the path of either as JSON, or of events as JSONL.
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            source = json.loads(text)
+        except json.JSONDecodeError:
+            source = [json.loads(line) for line in text.splitlines() if line.strip()]
+    events = source.get("events") if isinstance(source, dict) else source
+    if not isinstance(events, list) or not events:
+        raise ReplayError("Recording has no events")
+    return events
+
+class ReplayVerifier:
+    """Re-applies a recording's transfers through the game rules and checks every recorded standing
+
+    Transfers go through a fresh ``CoinLedger`` exactly as the runtime
+    applies them: one at a time in sequential rounds, settled together in
+    simultaneous ones. The standings in ``game_resumed``, ``round_started``,
+    ``round_summary`` and ``game_ended`` events, the summaries' transfer
+    lists and the winner must all match. No LLM is involved.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]]):
+        self.events = events
+        self.ledger: Optional[CoinLedger] = None
+        self.round_mode = SEQUENTIAL
+        self.round = 1
+        self.checked = 0
+        self.mismatches: List[str] = []
+        self._orders: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _start(self, balances: Dict[str, int]):
+        if self.ledger is None:
+            self.ledger = CoinLedger(balances)
+
+    def _check(self, index: int, name: str, what: str, recorded: Any, replayed: Any):
+        self.checked += 1
+        if recorded != replayed:
+            self.mismatches.append(f"event {index} ({name}): recorded {what} {recorded} but transfers give {replayed}")
+
+    def _settle(self):
+        """Apply the simultaneous orders collected this round"""
+        if self._orders:
+            self.ledger.settle(self._orders, round_num=self.round)
+            self._orders = {}
+
+    def _winner(self) -> str:
+        balances = self.ledger.balances()
+        leaders = [name for name, coins in balances.items() if coins == max(balances.values())]
+        return leaders[0] if len(leaders) == 1 else "Tie"
+
+    def verify(self) -> Dict[str, Any]:
+        for index, event in enumerate(self.events):
+            name, data = event.get("name"), event.get("data") or {}
+            if name == "game_created" and data.get("players"):
+                self._start({player: info.get("coins", 0) for player, info in data["players"].items()})
+            elif name in ("game_started", "game_resumed"):
+                self.round_mode = data.get("round_mode") or self.round_mode
+                self.round = data.get("round") or self.round
+                if self.ledger is None:
+                    self._start(data["initial_state"])
+                elif name == "game_resumed":
+                    self._check(index, name, "standings", data.get("initial_state"), self.ledger.balances())
+            elif self.ledger is None:
+                continue
+            elif name == "round_started":
+                self._settle()
+                self.round = data.get("round", self.round)
+                self._check(index, name, "standings", data.get("standings"), self.ledger.balances())
+            elif name == "player_action":
+                player = data.get("player")
+                transfers = (data.get("action") or {}).get("transfers") or []
+                if self.round_mode == SIMULTANEOUS:
+                    self._orders[player] = transfers
+                    continue
+                for transfer in transfers:
+                    if transfer.get("recipient") in self.ledger.players:
+                        self.ledger.transfer(player, transfer["recipient"], transfer.get("amount"), round_num=self.round)
+            elif name == "round_summary":
+                self._settle()
+                self.ledger.close_round(data.get("round", self.round))
+                self._check(index, name, "standings", data.get("standings"), self.ledger.balances())
+                self._check(index, name, "transfers", data.get("transfers"), [
+                    {"from": t.sender, "to": t.recipient, "amount": t.amount}
+                    for t in self.ledger.round_transfers(data.get("round", self.round))
+                ])
+            elif name == "game_ended":
+                self._settle()
+                self._check(index, name, "standings", data.get("final_standings"), self.ledger.balances())
+                self._check(index, name, "winner", data.get("winner"), self._winner())
+        if self.ledger is None:
+            raise ReplayError("Recording has no initial standings (game_created or game_started event)")
+        return {
+            "ok": not self.mismatches,
+            "checked": self.checked,
+            "mismatches": self.mismatches,
+            "round_mode": self.round_mode,
+            "rounds": self.ledger.closed_through,
+            "final_standings": self.ledger.balances()
+        }
+
+def verify_recording(source: Union[str, List[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """Verify a recording; raises ``ReplayError`` when its standings do not follow from its transfers"""
+    report = ReplayVerifier(load_recording(source)).verify()
+    if not report["ok"]:
+        raise ReplayError("; ".join(report["mismatches"]))
+    return report
+
+class GameReplay:
+    """Re-emits a recorded game through a ``GameEventManager`` without any LLM calls
+
+    Events are published at once with their playback offsets divided by
+    ``speed``; SSE subscribers pace them on that timeline as they would a
+    live game. A ``speed`` of 0 zeroes the offsets: as fast as possible.
+    """
+
+    def __init__(self, events: List[Dict[str, Any]], speed: float = 1.0, game_id: Optional[str] = None):
+        if speed < 0:
+            raise ReplayError("Replay speed cannot be negative")
+        self.events = events
+        self.speed = speed
+        self.game_id = game_id or str(uuid.uuid4())
+        self.source_game_id = next((e["data"].get("game_id") for e in events if e.get("name") == "game_created"), None)
+        self.state = "created"
+        self._report: Optional[Dict[str, Any]] = None
+
+    def verify(self) -> Dict[str, Any]:
+        if self._report is None:
+            self._report = ReplayVerifier(self.events).verify()
+        return self._report
+
+    def _offset(self, event: Dict[str, Any]) -> float:
+        if not self.speed:
+            return 0.0
+        return round(event.get("playback_offset", 0.0) / self.speed, 3)
+
+    async def play(self, event_manager) -> int:
+        """Publish every event to ``event_manager``; returns how many were sent"""
+        self.state = "running"
+        for event in self.events:
+            await event_manager.publish({**event, "playback_offset": self._offset(event)})
+        self.state = "complete"
+        logger.info(f"Replayed {len(self.events)} events of game {self.source_game_id} as {self.game_id}")
+        return len(self.events)
+
+    def get_player_statuses(self) -> Dict[str, int]:
+        """Final standings the recording's transfers lead to"""
+        return self.verify()["final_standings"]
+
+    def get_logs(self) -> List[str]:
+        return []
+
+def list_recordings(directory: str) -> List[str]:
+    """Recording files in ``directory``, oldest name first"""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith((".json", ".jsonl")))
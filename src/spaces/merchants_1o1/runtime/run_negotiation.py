@@ -9,11 +9,11 @@ def run_negotiation(rounds: int = 5):
     result = game.run()
     
     print("\nFull Conversation History:")
-    for message in result['conversation_memory'].messages:
+    for message in result['conversation_memory']['messages']:
         print(f"Round {message['round']} - {message['speaker']}: {message['message']}")
     
     print("\nTransfer History:")
-    for transfer in result['conversation_memory'].transfers:
+    for transfer in result['conversation_memory']['transfers']:
         print(f"Round {transfer['round']} - {transfer['sender']} → {transfer['recipient']}: {transfer['amount']} coins")
     
     print("\nFinal Results:")
@@ -36,7 +36,7 @@ def run_negotiation(rounds: int = 5):
         for player, coins in result['final_statuses'].items():
             f.write(f"- {player}: {coins} coins\n")
         f.write("\n## Conversation History\n")
-        for message in result['conversation_memory'].messages:
+        for message in result['conversation_memory']['messages']:
             f.write(f"- {message['message']}\n")
     
     print(f"Game results saved to {filename}")
@@ -1,21 +1,40 @@
 from typing import Optional
+import logging
 from ....core.base_agent import BaseAgent
-from ....utils.llm_providers.openrouter import OpenRouterProvider
+from ....utils.llm_providers.registry import get_routed_provider
 from ....utils.config import Config
+from ....utils.llm_providers.cache import with_cache
+
+logger = logging.getLogger(__name__)
 
 class NegotiationAgent(BaseAgent):
     def __init__(self, name: str, model: str = None, backup_model: str = None, llm_provider = None, coins: int = 10):
         # If no specific model provided, use defaults from config
         if not model or not llm_provider:
             config = Config()
-            llm_provider = llm_provider or OpenRouterProvider()
             model = model or config.llm_config['models']['player1']['default']
+            llm_provider = llm_provider or get_routed_provider('openrouter', model)
             backup_model = backup_model or config.llm_config['models']['player1']['backup']
         
+        llm_provider = with_cache(llm_provider, Config().llm_config.get('cache'))
         super().__init__(name, model, backup_model, llm_provider)
-        self.coins = coins
+        self.ledger = None  # set by CoinLedger.for_agents; balances then live in the ledger
+        self._coins = coins
+
+    @property
+    def coins(self) -> int:
+        return self.ledger.balance(self.name) if self.ledger else self._coins
+
+    @coins.setter
+    def coins(self, value: int):
+        if self.ledger:
+            self.ledger.adjust(self.name, value)
+        else:
+            self._coins = value
     
     def transfer_coins(self, amount: int, recipient: 'NegotiationAgent') -> bool:
+        if self.ledger:
+            return self.ledger.transfer(self.name, recipient.name, amount) is not None
         if amount <= self.coins and amount > 0:
             self.coins -= amount
             recipient.coins += amount
@@ -25,7 +44,7 @@ class NegotiationAgent(BaseAgent):
     def get_status(self) -> str:
         return f"{self.name} has {self.coins} coins"
     
-    def generate_response(self, context_prompt: str, **kwargs) -> str:
+    def generate_response(self, context_prompt, **kwargs) -> str:
         """Override to include agent name in logging"""
-        full_prompt = f"{self._role_prompt}\n\n{context_prompt}"
-        return self.llm.generate(full_prompt, self.model, self.backup_model, agent_name=self.name, **kwargs) 
\ No newline at end of file
+        logger.info(f"{self.name} generating response with {self.model}")
+        return super().generate_response(context_prompt, **kwargs)
@@ -2,18 +2,24 @@ from typing import Dict, Optional, List
 from .base import NegotiationAgent
 import json
 import re
+from ....core.ledger import check_transfer
 from ....utils.config import Config
-from ....utils.llm_providers.openrouter import OpenRouterProvider
+from ....utils.llm_providers.base import BaseLLMProvider
+from ....utils.llm_providers.registry import get_routed_provider
+from ....utils.llm_providers.prompt import PromptBuilder
+from ....utils.llm_providers.schemas import ACTION_SCHEMA, SUMMARY_SCHEMA
+from ....utils.llm_providers.metrics import call_labels
+from ..data.prompts import NegotiationPrompts
 
 class CoordinatorAgent(NegotiationAgent):
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         config = Config()
         model_config = config.llm_config['models']['coordinator']
         super().__init__(
             name=name,
             model=model_config['default'],
             backup_model=model_config['backup'],
-            llm_provider=OpenRouterProvider()
+            llm_provider=llm_provider or get_routed_provider('openrouter', model_config['default'])
         )
     
     def _get_role_prompt(self) -> str:
@@ -66,32 +72,21 @@ class CoordinatorAgent(NegotiationAgent):
         except:
             pass
         
-        prompt = f"""
-        As a bilingual host, format this player's response and add entertaining commentary in both languages.
-
-        Player: {player_name}
-        Available Coins: {available_coins}
-        Raw Response: ```{raw_response}```
-        
-        Format as JSON:
-        {{
-            "thinking": "🎙️ [English Commentary] Strategic analysis here\\n🎭 [中文点评] 你的精彩评论",
-            "message": "player's message in English",
-            "transfers": [
-                {{"recipient": "player_name", "amount": number}}
-            ]
-        }}
-
-        Requirements:
-        - Keep player's message in English for accuracy
-        - Provide commentary in both English and Chinese
-        - Validate transfers (max: {available_coins} coins)
-        - Use emojis and entertaining tone
-        - Create dramatic moments
-        """
+        prompt = (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.COORDINATOR_FORMAT)
+            .dynamic(
+                f"Player: {player_name}\n"
+                f"Available Coins: {available_coins} (max transfer: {available_coins} coins)\n"
+                f"Raw Response: ```{raw_response}```"
+            )
+            .build()
+        )
         
         try:
-            formatted = self.llm.generate(prompt)
+            with call_labels(phase="format"):
+                formatted = self.generate_response(prompt, response_schema=ACTION_SCHEMA)
             result = json.loads(formatted)
             return self._validate_transfers(result, available_coins)
         except json.JSONDecodeError:
@@ -110,11 +105,10 @@ class CoordinatorAgent(NegotiationAgent):
             }
     
     def _is_valid_format(self, data: Dict) -> bool:
-        """Check if the response follows the required format"""
+        """Check if the response follows the required format (thinking is optional)"""
         return (
             isinstance(data, dict) and
-            "thinking" in data and
-            isinstance(data["thinking"], str) and
+            isinstance(data.get("thinking", ""), str) and
             "message" in data and
             isinstance(data["message"], str) and
             "transfers" in data and
@@ -147,19 +141,7 @@ class CoordinatorAgent(NegotiationAgent):
     def validate_transfer(self, sender: str, recipient: str, amount: int, 
                          player_balances: Dict[str, int]) -> tuple[bool, str]:
         """Validate a proposed coin transfer"""
-        if amount <= 0:
-            return False, "Transfer amount must be positive"
-        
-        if sender not in player_balances:
-            return False, f"Invalid sender: {sender}"
-            
-        if recipient not in player_balances:
-            return False, f"Invalid recipient: {recipient}"
-            
-        if amount > player_balances[sender]:
-            return False, f"{sender} doesn't have enough coins for this transfer"
-            
-        return True, "Transfer valid"
+        return check_transfer(sender, recipient, amount, player_balances)
     
     def summarize_round(self, round_num: int, actions: List[Dict], player_balances: Dict[str, int]) -> str:
         """Create an entertaining bilingual round summary"""
@@ -174,47 +156,21 @@ class CoordinatorAgent(NegotiationAgent):
                 }
                 formatted_actions.append(formatted_action)
 
-        prompt = f"""
-        Create an exciting bilingual summary for round {round_num}!
-
-        Round Actions:
-        {json.dumps(formatted_actions, indent=2, ensure_ascii=False)}
-
-        Current Balances:
-        {json.dumps(player_balances, indent=2, ensure_ascii=False)}
-
-        Respond in this JSON format:
-        {{
-            "round_summary": {{
-                "highlights": {{
-                    "en": "Most exciting moves and strategies",
-                    "zh": "本回合最激动人心的操作和策略"
-                }},
-                "alliances": {{
-                    "en": "Analysis of alliances and betrayals",
-                    "zh": "联盟与背叛的情况分析"
-                }},
-                "impact": {{
-                    "en": "How coin distribution affects the game",
-                    "zh": "金币分布的变化对游戏的影响"
-                }},
-                "next_round": {{
-                    "en": "Expectations for next round",
-                    "zh": "对下一回合的期待和预测"
-                }}
-            }}
-        }}
-
-        Style Guide:
-        - Keep game analysis accurate in English
-        - Add dramatic flair in Chinese
-        - Use emojis for both languages
-        - Create suspense and excitement
-        - Make entertaining observations
-        """
+        prompt = (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .static(NegotiationPrompts.COORDINATOR_SUMMARY)
+            .dynamic(
+                f"Round: {round_num}\n\n"
+                f"Round Actions:\n{json.dumps(formatted_actions, indent=2, ensure_ascii=False)}\n\n"
+                f"Current Balances:\n{json.dumps(player_balances, indent=2, ensure_ascii=False)}"
+            )
+            .build()
+        )
         
         try:
-            summary = self.llm.generate(prompt)
+            with call_labels(phase="summary"):
+                summary = self.generate_response(prompt, response_schema=SUMMARY_SCHEMA)
             parsed_summary = json.loads(summary)
             return json.dumps(parsed_summary, ensure_ascii=False, indent=2)
         except Exception as e:
@@ -3,17 +3,21 @@ from .base import NegotiationAgent
 from ..data.prompts import NegotiationPrompts
 import json
 from ....utils.config import Config
-from ....utils.llm_providers.openrouter import OpenRouterProvider
+from ....utils.llm_providers.base import BaseLLMProvider
+from ....utils.llm_providers.registry import get_routed_provider
+from ....utils.llm_providers.prompt import PromptBuilder
+from ....utils.llm_providers.schemas import ACTION_SCHEMA
+from ....utils.llm_providers.metrics import call_labels
 
 class Player1(NegotiationAgent):
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         config = Config()
         model_config = config.llm_config['models']['player1']
         super().__init__(
             name=name,
             model=model_config['default'],
             backup_model=model_config['backup'],
-            llm_provider=OpenRouterProvider()
+            llm_provider=llm_provider or get_routed_provider('openrouter', model_config['default'])
         )
     
     def _get_role_prompt(self) -> str:
@@ -50,18 +54,19 @@ class Player1(NegotiationAgent):
             "    ]\n"
             "}\n"
         )
-        response = self.llm.generate(prompt)
+        with call_labels(phase="action"):
+            response = self.generate_response(prompt, response_schema=ACTION_SCHEMA)
         return json.loads(response)
 
 class Player2(NegotiationAgent):
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         config = Config()
         model_config = config.llm_config['models']['player2']
         super().__init__(
             name=name,
             model=model_config['default'],
             backup_model=model_config['backup'],
-            llm_provider=OpenRouterProvider()
+            llm_provider=llm_provider or get_routed_provider('openrouter', model_config['default'])
         )
     
     def _get_role_prompt(self) -> str:
@@ -103,18 +108,19 @@ class Player2(NegotiationAgent):
             "}\n\n"
             "Make your response strategic but natural, focusing on negotiation and potential alliances."
         )
-        response = self.llm.generate(prompt)
+        with call_labels(phase="action"):
+            response = self.generate_response(prompt, response_schema=ACTION_SCHEMA)
         return json.loads(response)
 
 class Player3(NegotiationAgent):
-    def __init__(self, name: str):
+    def __init__(self, name: str, llm_provider: Optional[BaseLLMProvider] = None):
         config = Config()
         model_config = config.llm_config['models']['player3']
         super().__init__(
             name=name,
             model=model_config['default'],
             backup_model=model_config['backup'],
-            llm_provider=OpenRouterProvider()
+            llm_provider=llm_provider or get_routed_provider('openrouter', model_config['default'])
         )
     
     def _get_role_prompt(self) -> str:
@@ -177,5 +183,58 @@ class Player3(NegotiationAgent):
             "}\n\n"
             "Be strategic, manipulative, and persuasive while maintaining a facade of cooperation."
         )
-        response = self.llm.generate(prompt)
-        return json.loads(response) 
\ No newline at end of file
+        with call_labels(phase="action"):
+            response = self.generate_response(prompt, response_schema=ACTION_SCHEMA)
+        return json.loads(response) 
+
+class ArenaPlayer(NegotiationAgent):
+    """A seat in an N-player arena, prompted with its neighbourhood only"""
+
+    def __init__(self, name: str, seat: int, llm_provider: Optional[BaseLLMProvider] = None):
+        config = Config()
+        # Spread the arena over the three configured player models
+        model_config = config.llm_config['models'][f'player{seat % 3 + 1}']
+        super().__init__(
+            name=name,
+            model=model_config['default'],
+            backup_model=model_config['backup'],
+            llm_provider=llm_provider or get_routed_provider('openrouter', model_config['default'])
+        )
+        self.seat = seat
+
+    def _get_role_prompt(self) -> str:
+        return NegotiationPrompts.ARENA_BASE
+
+    def process(self, *args, **kwargs):
+        """Implement the abstract method from BaseAgent"""
+        action = kwargs.get('action')
+        if action == 'negotiate':
+            return self.decide_action(
+                kwargs.get('round'),
+                kwargs.get('conversation_history', ''),
+                kwargs.get('player_statuses', {}),
+                kwargs.get('max_rounds', 5)
+            )
+        raise ValueError(f"Unknown action: {action}")
+
+    def decide_action(self,
+                     round: int,
+                     conversation_history: str,
+                     player_statuses: Dict[str, int],
+                     max_rounds: int = 5) -> Dict[str, any]:
+        neighbours = {name: coins for name, coins in player_statuses.items() if name != self.name}
+        prompt = (
+            PromptBuilder()
+            .static(self._get_role_prompt())
+            .dynamic(
+                f"You are {self.name}, seat {self.seat + 1}.\n"
+                f"Current round: {round} of {max_rounds}\n"
+                f"Your coins: {self.coins}\n"
+                f"Your neighbours' coins: {neighbours}"
+            )
+            .dynamic(conversation_history)
+            .build()
+        )
+        with call_labels(phase="action"):
+            response = self.generate_response(prompt, response_schema=ACTION_SCHEMA)
+        return json.loads(response)
@@ -69,4 +69,74 @@ class NegotiationPrompts:
     - You can see both Alex's and Blake's moves | 可以看到Alex和Blake的行动
     - Maximum information advantage | 拥有最大的信息优势
     - Use your position wisely | 明智地利用你的位置优势
-    """ 
\ No newline at end of file
+    """
+
+    # Shared by every seat of an N-player arena; per-game details go in the dynamic part
+    ARENA_BASE = """You are a merchant in a large multi-player negotiation market.
+    
+    Game Rules:
+    1. Each player starts with 10 coins
+    2. Players can transfer coins to influence each other
+    3. The player with most coins at the end wins
+    4. Players speak in a fixed seat order each round
+    
+    Your Market:
+    - You only deal with your neighbours: you hear their messages and may transfer coins to them
+    - Beyond your neighbourhood you only see a market summary
+    - Alliances, trust and betrayal are all allowed
+    
+    Respond in this JSON format:
+    {
+        "message": "your strategic message to your neighbours",
+        "transfers": [
+            {"recipient": "neighbour_name", "amount": number}
+        ]
+    }
+    """
+
+    # Static coordinator instructions, sent as a cacheable prefix
+    COORDINATOR_FORMAT = """
+        As a bilingual host, format this player's response and add entertaining commentary in both languages.
+
+        Format as JSON:
+        {
+            "thinking": "🎙️ [English Commentary] Strategic analysis here\\n🎭 [中文点评] 你的精彩评论",
+            "message": "player's message in English",
+            "transfers": [
+                {"recipient": "player_name", "amount": number}
+            ]
+        }
+
+        Requirements:
+        - Keep player's message in English for accuracy
+        - Provide commentary in both English and Chinese
+        - Validate transfers against the player's available coins
+        - Use emojis and entertaining tone
+        - Create dramatic moments
+        """
+
+    COORDINATOR_SUMMARY = """
+        Create an exciting bilingual summary of the round described below!
+
+        Respond in this JSON format:
+        {
+            "round_summary": {
+                "highlights": {
+                    "en": "Most exciting moves and strategies",
+                    "zh": "本回合最激动人心的操作和策略"
+                },
+                "alliances": {
+                    "en": "Analysis of alliances and betrayals",
+                    "zh": "联盟与背叛的情况分析"
+                },
+                "impact": {
+                    "en": "How coin distribution affects the game",
+                    "zh": "金币分布的变化对游戏的影响"
+                },
+                "next_round": {
+                    "en": "Expectations for next round",
+                    "zh": "对下一回合的期待和预测"
+                }
+            }
+        }
+        """
@@ -1,65 +1,60 @@
-from typing import Dict, List
-from ..agents.players import Player1, Player2, Player3
+from typing import Dict, List, Optional
+from collections import deque
+from ..agents.players import Player1, Player2, Player3, ArenaPlayer
 import json
 import logging
 from datetime import datetime
 import os
 from ..agents.coordinator import CoordinatorAgent
 import re
+import uuid
+from ....core.ledger import CoinLedger
+from ....core.memory import ConversationMemory
 from ....utils.config import Config
-
-class ConversationMemory:
-    def __init__(self):
-        self.messages = []
-        self.transfers = []
-    
-    def add_message(self, speaker: str, message: str):
-        self.messages.append({
-            'round': len(self.messages) // 3 + 1,  # 3 players per round
-            'speaker': speaker,
-            'message': message,
-            'timestamp': datetime.now()
-        })
-    
-    def add_transfer(self, sender: str, recipient: str, amount: int):
-        self.transfers.append({
-            'round': len(self.messages) // 3 + 1,
-            'sender': sender,
-            'recipient': recipient,
-            'amount': amount,
-            'timestamp': datetime.now()
-        })
-    
-    def get_recent_context(self, n_messages: int = 5) -> str:
-        """Get recent conversation context"""
-        recent = self.messages[-n_messages:] if self.messages else []
-        context = "\nRecent conversation:\n"
-        for msg in recent:
-            context += f"Round {msg['round']} - {msg['speaker']}: {msg['message']}\n"
-        
-        if self.transfers:
-            context += "\nRecent transfers:\n"
-            for transfer in self.transfers[-n_messages:]:
-                context += f"Round {transfer['round']} - {transfer['sender']} → {transfer['recipient']}: {transfer['amount']} coins\n"
-        
-        return context
+from ....utils.llm_providers.base import BaseLLMProvider
+from ....utils.llm_providers.metrics import call_labels, get_metrics
 
 class NegotiationScene:
-    def __init__(self, max_rounds: int = 5):
+    def __init__(
+        self,
+        max_rounds: int = 5,
+        logger: Optional[logging.Logger] = None,
+        players: Optional[List[str]] = None,
+        llm_provider: Optional[BaseLLMProvider] = None
+    ):
         config = Config()
         self.max_rounds = max_rounds
         # Get space-specific config
         space_config = config.get_space_config('merchants_multi')
         # Define players in order from config
-        self.player_order = space_config['players']
-        self.players = {
-            self.player_order[0]: Player1(self.player_order[0]),
-            self.player_order[1]: Player2(self.player_order[1]),
-            self.player_order[2]: Player3(self.player_order[2])
-        }
-        self.coordinator = CoordinatorAgent('Coordinator')
-        self.memory = ConversationMemory()
-        self.logger = self._setup_logger()
+        self.player_order = list(players or space_config['players'])
+        if len(self.player_order) < 2:
+            raise ValueError("merchants_multi needs at least two players")
+        # The classic three-seat cast keeps its personalities and full view;
+        # any other size is an arena where each seat only sees its neighbourhood
+        self.arena = len(self.player_order) != 3
+        self.summary_size = space_config.get('summary_size', 8)
+        if self.arena:
+            self.players = {name: ArenaPlayer(name, seat, llm_provider) for seat, name in enumerate(self.player_order)}
+        else:
+            self.players = {
+                self.player_order[0]: Player1(self.player_order[0], llm_provider),
+                self.player_order[1]: Player2(self.player_order[1], llm_provider),
+                self.player_order[2]: Player3(self.player_order[2], llm_provider)
+            }
+        self.ledger = CoinLedger.for_agents(self.players)
+        self.neighbours = self._neighbourhoods(space_config.get('neighbours', 2))
+        # What each seat has heard lately, bounded so prompts do not grow with the market
+        self._heard = {name: deque(maxlen=space_config.get('context_window', 5)) for name in self.player_order}
+        self.coordinator = CoordinatorAgent('Coordinator', llm_provider)
+        memory_config = space_config.get('memory', {}) or {}
+        self.memory = ConversationMemory(
+            players_per_round=len(self.player_order),
+            keep_rounds=memory_config.get('keep_rounds'),
+            max_context_tokens=memory_config.get('max_context_tokens')
+        )
+        self.game_id = str(uuid.uuid4())
+        self.logger = logger or self._setup_logger()
         self.system_prompt = self._get_system_prompt()
         
     def _setup_logger(self):
@@ -151,7 +146,64 @@ class NegotiationScene:
             self.logger.info(f"   �� {point}")
 
     def get_player_statuses(self) -> Dict[str, int]:
-        return {name: player.coins for name, player in self.players.items()}
+        return self.ledger.balances()
+
+    def _neighbourhoods(self, reach: int) -> Dict[str, List[str]]:
+        """Seats within ``reach`` places either side on the ring (everyone else in the classic game)"""
+        count = len(self.player_order)
+        neighbours = {}
+        for seat, name in enumerate(self.player_order):
+            if not self.arena:
+                neighbours[name] = [other for other in self.player_order if other != name]
+                continue
+            around = []
+            for offset in range(1, reach + 1):
+                for other in (self.player_order[(seat - offset) % count], self.player_order[(seat + offset) % count]):
+                    if other != name and other not in around:
+                        around.append(other)
+            neighbours[name] = around
+        return neighbours
+
+    def _deliver(self, line: str, *names: str):
+        """Let ``names`` and their neighbours hear ``line``"""
+        audience = set(names)
+        for name in names:
+            audience.update(self.neighbours[name])
+        for name in audience:
+            self._heard[name].append(line)
+
+    def _market_summary(self, player_name: str) -> str:
+        """What a seat knows about the market beyond its neighbourhood"""
+        statuses = self.get_player_statuses()
+        leaders = sorted(statuses.items(), key=lambda item: item[1], reverse=True)[:3]
+        rank = 1 + sum(1 for coins in statuses.values() if coins > statuses[player_name])
+        return (
+            f"Market: {len(statuses)} players, {sum(statuses.values())} coins in total\n"
+            f"Leaders: {', '.join(f'{name} ({coins})' for name, coins in leaders)}\n"
+            f"Your rank: {rank} of {len(statuses)}"
+        )
+
+    def _turn_view(self, player_name: str):
+        """Context and visible statuses for one turn; bounded by neighbourhood in the arena"""
+        if not self.arena:
+            return self.memory.get_recent_context(), self.get_player_statuses()
+        visible = [player_name] + self.neighbours[player_name]
+        statuses = {name: self.ledger.balance(name) for name in visible}
+        heard = "".join(self._heard[player_name]) or "Nothing yet.\n"
+        context = f"{self._market_summary(player_name)}\n\nRecently in your neighbourhood:\n{heard}"
+        return context, statuses
+
+    def _round_summary_input(self, actions: List[Dict], start: Dict[str, int]):
+        """Actions and balances for the coordinator, limited to the biggest movers in the arena"""
+        balances = self.get_player_statuses()
+        if not self.arena or len(balances) <= self.summary_size:
+            return actions, balances
+        movers = set(sorted(balances, key=lambda name: abs(balances[name] - start[name]), reverse=True)[:self.summary_size])
+        movers.update(sorted(balances, key=balances.get, reverse=True)[:3])
+        return (
+            [a for a in actions if a.get('player_name') in movers],
+            {name: coins for name, coins in balances.items() if name in movers}
+        )
     
     def process_player_turn(self, player_name: str, round: int, context: str, statuses: Dict[str, int]):
         """Process a single player's turn"""
@@ -165,6 +217,7 @@ class NegotiationScene:
             raw_response = player.process(
                 action='negotiate',
                 round=round,
+                max_rounds=self.max_rounds,
                 conversation_history=context,
                 player_statuses=statuses,
                 system_prompt=self.system_prompt
@@ -187,10 +240,14 @@ class NegotiationScene:
             self.logger.info(f"🗣️ {player_name} speaks: {action['message']}")
             
             # Record and process
-            self.memory.add_message(player_name, action['message'])
+            action['player_name'] = player_name
+            record = self.memory.add_message(player_name, action['message'], round_num=round)
+            if self.arena:
+                self._deliver(record.render(), player_name)
             if 'transfers' in action:
                 for transfer in action['transfers']:
-                    valid, reason = self.coordinator.validate_transfer(
+                    # Recipients are limited to what the player could see (its neighbourhood in the arena)
+                    valid, reason = self.ledger.validate(
                         player_name,
                         transfer['recipient'],
                         transfer['amount'],
@@ -213,14 +270,21 @@ class NegotiationScene:
 
     def process_transfers(self, transfers: List[Dict[str, any]], acting_player: str):
         for transfer in transfers:
-            sender = self.players[acting_player]
-            recipient = self.players[transfer['recipient']]
             amount = transfer['amount']
-            if sender.transfer_coins(amount, recipient):
-                self.memory.add_transfer(acting_player, transfer['recipient'], amount)
+            if self.ledger.transfer(acting_player, transfer['recipient'], amount):
+                record = self.memory.add_transfer(acting_player, transfer['recipient'], amount)
+                if self.arena:
+                    self._deliver(record.render(), acting_player, transfer['recipient'])
                 self.logger.info(f"💰 {acting_player} transferred {amount} coins to {transfer['recipient']}")
     
     def run_scene(self) -> Dict[str, any]:
+        """Run all rounds, attributing LLM usage to this scene"""
+        with call_labels(game_id=self.game_id):
+            result = self._run_scene()
+        result['usage'] = get_metrics().end_game(self.game_id)
+        return result
+
+    def _run_scene(self) -> Dict[str, any]:
         self.logger.info("\n🎮 Starting Negotiation Game (5 Rounds)")
         self.logger.info("\nPlayers and their models:")
         for name, player in self.players.items():
@@ -240,9 +304,8 @@ class NegotiationScene:
             for player_name in self.player_order:
                 self.logger.info(f"\n👤 {player_name}'s turn:")
                 
-                # Get current game state
-                context = self.memory.get_recent_context()
-                statuses = self.get_player_statuses()
+                # Get current game state (the seat's neighbourhood in the arena)
+                context, statuses = self._turn_view(player_name)
                 
                 # Process player's turn and wait for completion
                 action = self.process_player_turn(player_name, round, context, statuses)
@@ -252,11 +315,13 @@ class NegotiationScene:
                 self.logger.info("------------------------")
             
             # Round summary
+            self.ledger.close_round(round)
+            summary_actions, summary_balances = self._round_summary_input(round_actions, self.ledger.snapshot(round - 1))
             summary = self.coordinator.process(
                 action='summarize',
                 round_num=round,
-                actions=round_actions,
-                player_balances=self.get_player_statuses()
+                actions=summary_actions,
+                player_balances=summary_balances
             )
             self.logger.info(f"\n📊 Round {round} Summary:\n{summary}\n")
             self.logger.info("================================")
@@ -274,5 +339,6 @@ class NegotiationScene:
         return {
             'winner': winner[0],
             'final_statuses': final_statuses,
-            'conversation_memory': self.memory
+            'conversation_memory': self.memory,
+            'ledger': self.ledger
         } 
\ No newline at end of file
@@ -2,11 +2,21 @@ from .base import BaseLLMProvider
 from .openrouter import OpenRouterProvider
 from .gemini import GeminiProvider
 from .fallback import FallbackProvider
+from .cache import CachedProvider, ResponseCache
+from .prompt import Prompt, PromptBuilder
+from .stub import StubProvider
+from .routing import RoutingProvider
 
 __all__ = [
     'BaseLLMProvider',
     'OpenRouterProvider', 
     'GeminiProvider', 
-    'FallbackProvider'
+    'FallbackProvider',
+    'CachedProvider',
+    'ResponseCache',
+    'Prompt',
+    'PromptBuilder',
+    'StubProvider',
+    'RoutingProvider'
 ]
 
@@ -1,9 +1,10 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator
 from abc import ABC, abstractmethod
+import asyncio
 
 class BaseLLMProvider(ABC):
     """Base class for LLM providers"""
-    
+
     @abstractmethod
     def generate(
         self,
@@ -16,8 +17,28 @@ class BaseLLMProvider(ABC):
         """Generate text using the LLM"""
         pass
 
+    async def agenerate(self, *args, **kwargs) -> str:
+        """Generate text without blocking the event loop.
+
+        Providers with a native async client override this. The default
+        runs the blocking ``generate`` in a worker thread so that callers
+        on the event loop never stall on a network round trip.
+        """
+        return await asyncio.to_thread(self.generate, *args, **kwargs)
+
+    def stream(self, *args, **kwargs) -> Iterator[str]:
+        """Yield the response in chunks as they are produced.
+
+        Providers without token streaming yield the full response once.
+        """
+        yield self.generate(*args, **kwargs)
+
+    async def astream(self, *args, **kwargs) -> AsyncIterator[str]:
+        """Yield the response in chunks without blocking the event loop"""
+        yield await self.agenerate(*args, **kwargs)
+
     @staticmethod
     @abstractmethod
     def get_config() -> Dict[str, Any]:
         """Get provider configuration"""
-        pass 
\ No newline at end of file
+        pass
@@ -0,0 +1,213 @@
+from typing import Optional, Dict, Any, Callable
+from collections import deque
+from contextlib import contextmanager
+import logging
+import threading
+import time
+from .limiter import error_status, THROTTLE_STATUS
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a model whose breaker is open"""
+
+def is_health_failure(error: BaseException) -> bool:
+    """Whether an exception says something about the model's health
+
+    Client mistakes (4xx other than 429) do not; timeouts, connection
+    errors, throttling and 5xx do.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = error_status(error)
+    return not (status is not None and 400 <= status < 500 and status != THROTTLE_STATUS)
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling window of calls
+
+    The breaker opens when, over the last ``window`` calls (and at least
+    ``min_calls``), the failure rate reaches ``failure_threshold`` or the
+    share of calls slower than ``slow_call_seconds`` reaches
+    ``slow_call_threshold``. After ``open_seconds`` it goes half-open: if
+    a ``probe`` is set it is run on a background thread while live
+    traffic stays on the fallback, otherwise one live call is let through.
+    A successful probe closes the breaker, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_threshold: float = 0.5,
+        slow_call_seconds: float = 15.0,
+        slow_call_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        probe: Optional[Callable[[], Any]] = None
+    ):
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.open_seconds = open_seconds
+        self.probe = probe
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._calls: deque = deque(maxlen=window)  # (failed, slow) per call
+        self._probing = False
+        self._lock = threading.Lock()
+        self.metrics = {"opened": 0, "rejected": 0, "probes": 0}
+
+    def _cooled_down(self, now: float) -> bool:
+        return now - self.opened_at >= self.open_seconds
+
+    def available(self) -> bool:
+        """Whether a live call would be admitted
+
+        Also starts the background probe once an open breaker cools down.
+        """
+        start_probe = False
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._cooled_down(time.monotonic()):
+                if self.probe is None:
+                    return True
+                self.state = HALF_OPEN
+                start_probe = True
+        if start_probe:
+            self._start_probe()
+        return False
+
+    def _admit(self) -> bool:
+        """Admit a call, moving an expired open breaker to half-open"""
+        start_probe = False
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._cooled_down(time.monotonic()):
+                self.state = HALF_OPEN
+                if self.probe is None:
+                    logger.info(f"Circuit {self.name} half-open, probing with a live call")
+                    self._probing = True
+                    self.metrics["probes"] += 1
+                    return True
+                start_probe = True
+            self.metrics["rejected"] += 1
+        if start_probe:
+            self._start_probe()
+        return False
+
+    def _start_probe(self):
+        logger.info(f"Circuit {self.name} half-open, probing in the background")
+        threading.Thread(target=self._run_probe, daemon=True, name=f"probe-{self.name}").start()
+
+    def _run_probe(self):
+        """Probe the model off the request path"""
+        with self._lock:
+            if self._probing:
+                return
+            self._probing = True
+            self.metrics["probes"] += 1
+        started = time.monotonic()
+        try:
+            self.probe()
+        except Exception as e:
+            logger.warning(f"Circuit {self.name} probe failed: {str(e)}")
+            self.record(time.monotonic() - started, failed=True)
+        else:
+            self.record(time.monotonic() - started, failed=False)
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened_at = now
+        self.metrics["opened"] += 1
+        logger.warning(f"Circuit {self.name} opened")
+
+    def record(self, latency: float, failed: bool):
+        """Record the outcome of an admitted call"""
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._open(now)
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"Circuit {self.name} closed")
+                return
+            if self.state == OPEN:
+                return
+            self._calls.append((failed, slow))
+            calls = len(self._calls)
+            if calls < self.min_calls:
+                return
+            failure_rate = sum(1 for f, _ in self._calls if f) / calls
+            slow_rate = sum(1 for _, s in self._calls if s) / calls
+            if failure_rate >= self.failure_threshold or slow_rate >= self.slow_call_threshold:
+                self._open(now)
+
+    @contextmanager
+    def guard(self):
+        """Run a call through the breaker, raising CircuitOpenError if open"""
+        if not self._admit():
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(time.monotonic() - started, failed=is_health_failure(e))
+            raise
+        except BaseException:
+            # Cancelled: no verdict on the model, but free a half-open probe slot
+            with self._lock:
+                if self.state == HALF_OPEN and self.probe is None:
+                    self.state = OPEN
+                    self._probing = False
+            raise
+        else:
+            self.record(time.monotonic() - started, failed=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state and rolling window health"""
+        with self._lock:
+            calls = len(self._calls)
+            return {
+                "name": self.name,
+                "state": self.state,
+                "window_calls": calls,
+                "failure_rate": sum(1 for f, _ in self._calls if f) / calls if calls else 0.0,
+                "slow_rate": sum(1 for _, s in self._calls if s) / calls if calls else 0.0,
+                "open_for": max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)) if self.state == OPEN else 0.0,
+                **self.metrics
+            }
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str, probe: Optional[Callable[[], Any]] = None) -> CircuitBreaker:
+    """Get the process-wide breaker for a provider/model, configured from ``llm.circuit_breaker``"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            settings = Config().llm_config.get('circuit_breaker', {}) or {}
+            breaker = CircuitBreaker(name, probe=probe, **settings)
+            _breakers[name] = breaker
+        elif probe is not None and breaker.probe is None:
+            breaker.probe = probe
+        return breaker
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every breaker created so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,282 @@
+from typing import Optional, Dict, Any, Tuple, Iterator, AsyncIterator
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from .base import BaseLLMProvider
+
+logger = logging.getLogger(__name__)
+
+# Cache modes
+READ_WRITE = "read_write"  # Serve hits, call the provider and store on misses
+RECORD = "record"          # Always call the provider and (re)store the response
+REPLAY = "replay"          # Never call the provider; a miss is an error
+CACHE_MODES = (READ_WRITE, RECORD, REPLAY)
+
+class CacheMissError(KeyError):
+    """Raised in replay mode when a request has no recorded response"""
+
+class ResponseCache:
+    """Content-addressed LLM response store with an LRU memory tier and a SQLite disk tier"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db(path) if path else None
+        self.metrics = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expired": 0
+        }
+
+    @staticmethod
+    def _open_db(path: str) -> sqlite3.Connection:
+        """Open (and create if needed) the on-disk store"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created_at)")
+        db.commit()
+        return db
+
+    @staticmethod
+    def make_key(namespace: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+        """Hash a request into a stable content address"""
+        payload = json.dumps(
+            {"namespace": namespace, "args": list(args), "kwargs": kwargs},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at <= time.time()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a response, promoting disk hits into memory"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if not self._expired(expires_at):
+                    self._memory.move_to_end(key)
+                    self.metrics["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self.metrics["expired"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if not self._expired(expires_at):
+                        self._remember(key, value, expires_at)
+                        self.metrics["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.metrics["expired"] += 1
+
+            self.metrics["misses"] += 1
+            return None
+
+    def put(self, key: str, value: str):
+        """Store a response in both tiers"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now, expires_at)
+                )
+                self._trim_disk()
+                self._db.commit()
+            self.metrics["writes"] += 1
+
+    def _remember(self, key: str, value: str, expires_at: Optional[float]):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def _trim_disk(self):
+        """Drop the oldest disk entries beyond the configured bound"""
+        if not self.max_disk_entries:
+            return
+        self._db.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss metrics"""
+        with self._lock:
+            lookups = self.metrics["memory_hits"] + self.metrics["disk_hits"] + self.metrics["misses"]
+            hits = self.metrics["memory_hits"] + self.metrics["disk_hits"]
+            return {
+                **self.metrics,
+                "memory_entries": len(self._memory),
+                "hit_rate": hits / lookups if lookups else 0.0
+            }
+
+def is_error_response(text: str) -> bool:
+    """Providers such as OpenRouter return error payloads instead of raising"""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return not text
+    return isinstance(data, dict) and str(data.get("message", "")).startswith("Error")
+
+def provider_namespace(provider: BaseLLMProvider) -> str:
+    """Cache namespace of a provider: its own ``cache_namespace``, else its class and default model"""
+    namespace = getattr(provider, "cache_namespace", None)
+    if namespace:
+        return namespace
+    model = getattr(provider, "default_model_name", None) or getattr(provider, "default_model", None)
+    if not isinstance(model, str):
+        return type(provider).__name__
+    return f"{type(provider).__name__}:{model}"
+
+class CachedProvider(BaseLLMProvider):
+    """Wraps any provider with a content-addressed response cache"""
+
+    def __init__(self, provider: BaseLLMProvider, cache: ResponseCache, mode: str = READ_WRITE):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.provider = provider
+        self.cache = cache
+        self.mode = mode
+
+    @property
+    def namespace(self) -> str:
+        """Includes the models behind the provider, so switching models never serves another model's replies"""
+        return provider_namespace(self.provider)
+
+    def _lookup(self, key: str) -> Optional[str]:
+        if self.mode == RECORD:
+            return None
+        cached = self.cache.get(key)
+        if cached is None and self.mode == REPLAY:
+            raise CacheMissError(f"No recorded response for request {key[:12]}")
+        return cached
+
+    def _store(self, key: str, response: str):
+        if not is_error_response(response):
+            self.cache.put(key, response)
+
+    def generate(self, *args, **kwargs) -> str:
+        """Serve from cache or call the wrapped provider"""
+        key = ResponseCache.make_key(self.namespace, args, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = self.provider.generate(*args, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def agenerate(self, *args, **kwargs) -> str:
+        """Serve from cache or call the wrapped provider asynchronously"""
+        key = ResponseCache.make_key(self.namespace, args, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.provider.agenerate(*args, **kwargs)
+        self._store(key, response)
+        return response
+
+    def stream(self, *args, **kwargs) -> Iterator[str]:
+        """Replay a cached response as one chunk or stream and record a miss"""
+        key = ResponseCache.make_key(self.namespace, args, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        for chunk in self.provider.stream(*args, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self._store(key, "".join(chunks))
+
+    async def astream(self, *args, **kwargs) -> AsyncIterator[str]:
+        """Async counterpart of ``stream``"""
+        key = ResponseCache.make_key(self.namespace, args, kwargs)
+        cached = self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+        chunks = []
+        async for chunk in self.provider.astream(*args, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self._store(key, "".join(chunks))
+
+    def get_config(self) -> Dict[str, Any]:
+        """Get provider configuration"""
+        return self.provider.get_config()
+
+_shared_caches: Dict[str, ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+def get_response_cache(cache_config: Dict[str, Any]) -> ResponseCache:
+    """Get the process-wide cache for a configuration, creating it once"""
+    path = cache_config.get("path")
+    with _shared_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = ResponseCache(
+                path=path,
+                max_entries=cache_config.get("max_entries", 1024),
+                max_disk_entries=cache_config.get("max_disk_entries"),
+                ttl_seconds=cache_config.get("ttl_seconds")
+            )
+        return _shared_caches[path]
+
+def with_cache(provider: BaseLLMProvider, cache_config: Optional[Dict[str, Any]] = None) -> BaseLLMProvider:
+    """Wrap a provider in the shared cache if caching is enabled
+
+    ``LLM_CACHE_MODE`` overrides the configured mode, which makes it easy
+    to run the test suite or a demo replay entirely from recorded responses.
+    """
+    cache_config = dict(cache_config or {})
+    mode = os.getenv("LLM_CACHE_MODE", cache_config.get("mode", READ_WRITE))
+    enabled = cache_config.get("enabled", False) or "LLM_CACHE_MODE" in os.environ
+    if not enabled or mode == "off" or isinstance(provider, CachedProvider):
+        return provider
+    return CachedProvider(provider, get_response_cache(cache_config), mode=mode)
@@ -0,0 +1,161 @@
+from typing import Optional, Dict, Any, Callable, Tuple
+import hashlib
+import logging
+import threading
+import time
+from .limiter import estimate_tokens
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class ContextHandle:
+    """A static prefix registered with a provider as cached context"""
+
+    __slots__ = ("name", "resource", "model", "tokens", "created_at", "expires_at", "uses")
+
+    def __init__(self, name: str, resource: Any, model: str, tokens: int, ttl_seconds: float):
+        self.name = name
+        self.resource = resource
+        self.model = model
+        self.tokens = tokens
+        self.created_at = time.time()
+        self.expires_at = self.created_at + ttl_seconds
+        self.uses = 0
+
+class ContextCacheManager:
+    """Registers static prompt prefixes as provider-side cached context
+
+    Handles are keyed by (provider, model, prefix hash) and shared across
+    turns and games. A handle is recreated shortly before its TTL runs
+    out; the expiring one is left to lapse on the provider side. Prefixes
+    below a provider's minimum cacheable size are sent inline instead.
+    """
+
+    def __init__(self, ttl_seconds: float = 3600, refresh_margin: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = refresh_margin
+        self._handles: Dict[Tuple[str, str, str], ContextHandle] = {}
+        self._seen: Dict[Tuple[str, str, str], float] = {}
+        self._lock = threading.Lock()
+        self.metrics = {
+            "hits": 0,
+            "created": 0,
+            "refreshed": 0,
+            "skipped": 0,
+            "failures": 0,
+            "tokens_saved": 0,
+            "reported_cached_tokens": 0
+        }
+
+    @staticmethod
+    def _key(namespace: str, model: str, prefix: str) -> Tuple[str, str, str]:
+        return namespace, model, hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+    def lookup(
+        self,
+        namespace: str,
+        model: str,
+        prefix: str,
+        create: Callable[[str, float], Tuple[str, Any]],
+        min_tokens: int = 0
+    ) -> Optional[ContextHandle]:
+        """Get a live handle for the prefix, registering it if needed
+
+        ``create(prefix, ttl_seconds)`` registers the prefix with the
+        provider and returns ``(name, resource)``. Returns None when the
+        prefix is too small to cache or registration fails.
+        """
+        key = self._key(namespace, model, prefix)
+        now = time.time()
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle and now < handle.expires_at - self.refresh_margin:
+                handle.uses += 1
+                self.metrics["hits"] += 1
+                self.metrics["tokens_saved"] += handle.tokens
+                return handle
+
+        tokens = estimate_tokens(prefix)
+        if tokens < min_tokens:
+            with self._lock:
+                self.metrics["skipped"] += 1
+            return None
+        try:
+            name, resource = create(prefix, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to register cached context for {model}: {str(e)}")
+            with self._lock:
+                self.metrics["failures"] += 1
+            return None
+
+        new_handle = ContextHandle(name, resource, model, tokens, self.ttl_seconds)
+        with self._lock:
+            self.metrics["refreshed" if handle else "created"] += 1
+            self._handles[key] = new_handle
+        logger.info(f"Registered cached context {name} for {model} ({tokens} tokens)")
+        return new_handle
+
+    def observe(self, namespace: str, model: str, prefix: str) -> bool:
+        """Track a prefix the provider caches implicitly (e.g. prompt caching)
+
+        Returns True if the prefix was sent within the TTL, i.e. the
+        provider should serve it from its cache, and credits the saving.
+        """
+        key = self._key(namespace, model, prefix)
+        now = time.time()
+        with self._lock:
+            last_seen = self._seen.get(key)
+            self._seen[key] = now
+            if last_seen is not None and now - last_seen < self.ttl_seconds:
+                self.metrics["hits"] += 1
+                self.metrics["tokens_saved"] += estimate_tokens(prefix)
+                return True
+            self.metrics["created"] += 1
+            return False
+
+    def record_cached_tokens(self, tokens: int):
+        """Record cached-token counts reported back in provider usage data"""
+        if tokens:
+            with self._lock:
+                self.metrics["reported_cached_tokens"] += tokens
+
+    def evict_expired(self):
+        """Forget handles and prefixes whose TTL has passed"""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, h in self._handles.items() if h.expires_at <= now]:
+                del self._handles[key]
+            for key in [k for k, seen in self._seen.items() if now - seen >= self.ttl_seconds]:
+                del self._seen[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Handle counts and token savings"""
+        self.evict_expired()
+        with self._lock:
+            return {
+                "handles": len(self._handles),
+                "prefixes": len(self._seen),
+                **self.metrics
+            }
+
+_manager: Optional[ContextCacheManager] = None
+_manager_lock = threading.Lock()
+
+def get_context_cache() -> ContextCacheManager:
+    """Get the process-wide context cache, configured from ``llm.context_cache``"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            settings = Config().llm_config.get('context_cache', {}) or {}
+            _manager = ContextCacheManager(
+                ttl_seconds=settings.get('ttl_seconds', 3600),
+                refresh_margin=settings.get('refresh_margin', 60)
+            )
+        return _manager
+
+def context_cache_settings(provider: str) -> Dict[str, Any]:
+    """Per-provider context cache settings (``enabled``, ``min_prefix_tokens``)"""
+    settings = Config().llm_config.get('context_cache', {}) or {}
+    provider_settings = dict((settings.get('providers', {}) or {}).get(provider, {}) or {})
+    provider_settings.setdefault('enabled', settings.get('enabled', True))
+    return provider_settings
@@ -1,74 +1,159 @@
-from typing import Optional, Iterator
-import requests
+from typing import Optional, Iterator, Dict, Any
 from .base import BaseLLMProvider
-import os
+from .pool import get_http_pool
+from .sse import parse_sse_delta, StreamDone
+from .limiter import get_limiter, estimate_tokens
+from .prompt import join_prefix
+from .schemas import parse_structured
+from .metrics import track_call, CallRecord
 import json
+import os
 
 class DeepseekProvider(BaseLLMProvider):
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY")
-        self.api_base = "https://api.deepseek.com/v1"
+        self.api_base = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1")
         self.default_model = "deepseek/deepseek-r1"  # Updated default model
-    
-    def generate(self, 
-                prompt: str, 
+        self.pool = get_http_pool()
+
+    @staticmethod
+    def get_config() -> Dict[str, Any]:
+        """Get provider configuration"""
+        return {
+            "name": "deepseek",
+            "models": {
+                "deepseek-r1": {
+                    "id": "deepseek/deepseek-r1",
+                    "context_length": 65536,
+                    "supports_functions": False
+                }
+            }
+        }
+
+    def _build_payload(
+        self,
+        prompt: str,
+        model: str,
+        response_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the chat completion request body
+
+        DeepSeek only offers JSON mode, so a ``response_schema`` is
+        enforced by validating the reply rather than by the API.
+        """
+        if response_schema:
+            kwargs["response_format"] = {"type": "json_object"}
+        return {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": "You are a helpful AI assistant participating in a business negotiation game."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,  # Added for more strategic responses
+            "max_tokens": 1000,   # Increased for detailed responses
+            **kwargs
+        }
+
+    @staticmethod
+    def _content(data: Dict[str, Any], response_schema: Optional[Dict[str, Any]], call: CallRecord) -> str:
+        """Extract the reply, validating it against the schema if one was requested"""
+        content = data["choices"][0]["message"]["content"]
+        usage = data.get("usage") or {}
+        call.usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        call.complete(content)
+        if response_schema:
+            return json.dumps(parse_structured(content, response_schema), ensure_ascii=False)
+        return content
+
+    def generate(self,
+                prompt: str,
                 model: str = None,
                 backup_model: Optional[str] = None,
+                static_prefix: Optional[str] = None,
+                response_schema: Optional[Dict[str, Any]] = None,
                 **kwargs) -> str:
         model = model or self.default_model
+        prompt = join_prefix(static_prefix, prompt)
         try:
-            response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": "You are a helpful AI assistant participating in a business negotiation game."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.7,  # Added for more strategic responses
-                    "max_tokens": 1000,   # Increased for detailed responses
-                    **kwargs
-                }
-            )
-            response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            with get_limiter(model).limit_call(estimate_tokens(prompt, 1000)), self.pool.track(), \
+                    track_call("deepseek", model, prompt) as call:
+                response = self.pool.session.post(
+                    f"{self.api_base}/chat/completions",
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                    json=self._build_payload(prompt, model, response_schema, **kwargs)
+                )
+                response.raise_for_status()
+                return self._content(response.json(), response_schema, call)
         except Exception as e:
             if backup_model:
-                return self.generate(prompt, backup_model, None, **kwargs)
+                return self.generate(prompt, backup_model, None, response_schema=response_schema, **kwargs)
             raise e
 
-    def stream(self, 
-              prompt: str, 
+    async def agenerate(self,
+                        prompt: str,
+                        model: str = None,
+                        backup_model: Optional[str] = None,
+                        static_prefix: Optional[str] = None,
+                        response_schema: Optional[Dict[str, Any]] = None,
+                        **kwargs) -> str:
+        """Generate text without blocking the event loop"""
+        model = model or self.default_model
+        prompt = join_prefix(static_prefix, prompt)
+        try:
+            async with get_limiter(model).alimit_call(estimate_tokens(prompt, 1000)):
+                with self.pool.track(), track_call("deepseek", model, prompt) as call:
+                    async with self.pool.async_session().post(
+                        f"{self.api_base}/chat/completions",
+                        headers={"Authorization": f"Bearer {self.api_key}"},
+                        json=self._build_payload(prompt, model, response_schema, **kwargs)
+                    ) as response:
+                        response.raise_for_status()
+                        data = await response.json()
+                    return self._content(data, response_schema, call)
+        except Exception as e:
+            if backup_model:
+                return await self.agenerate(prompt, backup_model, None, response_schema=response_schema, **kwargs)
+            raise e
+
+    def stream(self,
+              prompt: str,
               model: str = None,
               backup_model: Optional[str] = None,
+              static_prefix: Optional[str] = None,
               **kwargs) -> Iterator[str]:
         model = model or self.default_model
+        prompt = join_prefix(static_prefix, prompt)
         try:
-            response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": "You are a helpful AI assistant participating in a business negotiation game."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "stream": True,
-                    "temperature": 0.7,
-                    "max_tokens": 1000,
-                    **kwargs
-                },
-                stream=True
-            )
-            response.raise_for_status()
-            
-            for line in response.iter_lines():
-                if line:
-                    chunk = json.loads(line.decode())
-                    if chunk.get("choices") and chunk["choices"][0].get("delta", {}).get("content"):
-                        yield chunk["choices"][0]["delta"]["content"]
+            with get_limiter(model).limit_call(estimate_tokens(prompt, 1000)), track_call("deepseek", model, prompt) as call:
+                response = self.pool.session.post(
+                    f"{self.api_base}/chat/completions",
+                    headers={"Authorization": f"Bearer {self.api_key}"},
+                    json={
+                        "model": model,
+                        "messages": [
+                            {"role": "system", "content": "You are a helpful AI assistant participating in a business negotiation game."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "stream": True,
+                        "temperature": 0.7,
+                        "max_tokens": 1000,
+                        **kwargs
+                    },
+                    stream=True
+                )
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    try:
+                        content = parse_sse_delta(line)
+                    except StreamDone:
+                        break
+                    if content:
+                        call.output(content)
+                        yield content
         except Exception as e:
             if backup_model:
                 yield from self.stream(prompt, backup_model, None, **kwargs)
-            raise e 
\ No newline at end of file
+                return
+            raise e
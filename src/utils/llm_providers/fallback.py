@@ -1,36 +1,223 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import asyncio
+import contextvars
 import logging
 import os
+import threading
+import time
 from .gemini import GeminiProvider
 from .openrouter import OpenRouterProvider
 from .base import BaseLLMProvider
+from .cache import is_error_response, provider_namespace
+from .latency import LatencyTracker
+from ..config import Config
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 class FallbackProvider(BaseLLMProvider):
-    """Provider that falls back to OpenRouter if Gemini fails"""
+    """Provider that falls back to OpenRouter if Gemini fails
+
+    With ``llm.hedging.enabled`` the primary model gets a deadline learned
+    from its observed latency quantile; if it has not answered by then the
+    same request is fired at the backup model and the first valid response
+    wins. Streams are never hedged since chunks are already on the wire.
+    """
     
-    def __init__(self):
+    def __init__(self, hedging: Optional[Dict[str, Any]] = None, provider: Optional[GeminiProvider] = None):
         """Initialize provider"""
         try:
-            self.provider = GeminiProvider()  # Will use env variable
+            self.provider = provider or GeminiProvider()  # Will use env variable
             logger.info("Initialized Gemini Studio provider")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini provider: {str(e)}")
             raise
 
+        if hedging is None:
+            hedging = Config().llm_config.get('hedging', {}) or {}
+        self.hedging = hedging.get('enabled', False)
+        self.hedge_quantile = hedging.get('quantile', 0.9)
+        self.hedge_min_samples = hedging.get('min_samples', 20)
+        self.hedge_default_deadline = hedging.get('default_deadline', 2.0)
+        self.hedge_min_deadline = hedging.get('min_deadline', 0.25)
+        self.hedge_max_deadline = hedging.get('max_deadline', 10.0)
+        self.latency = LatencyTracker(hedging.get('window', 200))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.metrics = {
+            "requests": 0,
+            "hedged": 0,
+            "backup_wins": 0,
+            "primary_wins": 0,
+            "failures": 0
+        }
+
+    @property
+    def cache_namespace(self) -> str:
+        """Primary and backup models, either of which may answer a request"""
+        backup = getattr(self.provider, "backup_model_name", None)
+        return f"{type(self).__name__}({provider_namespace(self.provider)}|{backup})"
+
+    def hedge_deadline(self) -> float:
+        """Seconds to wait for the primary before hedging"""
+        model = self.provider.default_model_name
+        if self.latency.count(model) < self.hedge_min_samples:
+            return self.hedge_default_deadline
+        deadline = self.latency.quantile(model, self.hedge_quantile)
+        return min(self.hedge_max_deadline, max(self.hedge_min_deadline, deadline))
+
+    def _count(self, metric: str):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _timed(self, call: Callable, use_backup: bool, args, kwargs) -> str:
+        """Run one blocking attempt and record its latency if it succeeds"""
+        model = self.provider.backup_model_name if use_backup else self.provider.default_model_name
+        started = time.monotonic()
+        result = call(*args, use_backup=use_backup, fallback=False, **kwargs)
+        self.latency.observe(model, time.monotonic() - started)
+        return result
+
+    async def _atimed(self, use_backup: bool, args, kwargs) -> str:
+        """Run one async attempt and record its latency if it succeeds"""
+        model = self.provider.backup_model_name if use_backup else self.provider.default_model_name
+        started = time.monotonic()
+        result = await self.provider.agenerate(*args, use_backup=use_backup, fallback=False, **kwargs)
+        self.latency.observe(model, time.monotonic() - started)
+        return result
+
+    @staticmethod
+    def _valid(result: Any) -> bool:
+        return isinstance(result, str) and not is_error_response(result)
+
+    def _record_win(self, use_backup: bool, hedged: bool):
+        if hedged:
+            self._count("backup_wins" if use_backup else "primary_wins")
+
+    def _hedged_generate(self, args, kwargs) -> str:
+        """Race the backup model against a slow primary on worker threads"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="llm-hedge")
+            executor = self._executor
+        self._count("requests")
+        # Worker threads run in a copy of the caller's context so metric labels carry over
+        primary = executor.submit(contextvars.copy_context().run, self._timed, self.provider.generate, False, args, kwargs)
+        attempts = {primary: False}
+        done, _ = wait([primary], timeout=self.hedge_deadline())
+        hedged = not done
+        if hedged:
+            self._count("hedged")
+            logger.info("Primary model is slow, hedging with backup model")
+        elif self._succeeded(primary):
+            return primary.result()
+        backup = executor.submit(contextvars.copy_context().run, self._timed, self.provider.generate, True, args, kwargs)
+        attempts[backup] = True
+
+        pending = set(attempts)
+        last_error: Optional[BaseException] = None
+        last_result: Optional[str] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if self._succeeded(future):
+                    for loser in pending:
+                        # Threads cannot be interrupted; a running loser just finishes unobserved
+                        loser.cancel()
+                    self._record_win(attempts[future], hedged)
+                    return future.result()
+                if future.exception() is not None:
+                    last_error = future.exception()
+                else:
+                    last_result = future.result()
+        self._count("failures")
+        if last_result is not None:
+            return last_result
+        raise last_error
+
+    @classmethod
+    def _succeeded(cls, future) -> bool:
+        """Whether a finished future/task holds a valid response"""
+        return future.exception() is None and cls._valid(future.result())
+
+    async def _hedged_agenerate(self, args, kwargs) -> str:
+        """Race the backup model against a slow primary, cancelling the loser"""
+        self._count("requests")
+        primary = asyncio.ensure_future(self._atimed(False, args, kwargs))
+        attempts = {primary: False}
+        done, _ = await asyncio.wait([primary], timeout=self.hedge_deadline())
+        hedged = not done
+        if hedged:
+            self._count("hedged")
+            logger.info("Primary model is slow, hedging with backup model")
+        elif self._succeeded(primary):
+            return primary.result()
+        attempts[asyncio.ensure_future(self._atimed(True, args, kwargs))] = True
+
+        pending = set(attempts)
+        last_error: Optional[BaseException] = None
+        last_result: Optional[str] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if self._succeeded(task):
+                        self._record_win(attempts[task], hedged)
+                        return task.result()
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                    else:
+                        last_result = task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        self._count("failures")
+        if last_result is not None:
+            return last_result
+        raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge rate, wins and the latencies the deadline is learned from"""
+        with self._lock:
+            metrics = dict(self.metrics)
+        metrics["hedging_enabled"] = self.hedging
+        metrics["hedge_rate"] = metrics["hedged"] / metrics["requests"] if metrics["requests"] else 0.0
+        metrics["deadline"] = self.hedge_deadline()
+        metrics["latency"] = self.latency.stats()
+        return metrics
+
     def generate(self, *args, **kwargs) -> str:
         """Generate text using Gemini"""
         try:
             logger.info("Attempting generation with Gemini provider")
+            if self.hedging and 'use_backup' not in kwargs:
+                return self._hedged_generate(args, kwargs)
             return self.provider.generate(*args, **kwargs)
         except Exception as e:
             logger.error(f"Error in FallbackProvider generate: {str(e)}")
-            logger.error(f"Args: {args}")
-            logger.error(f"Kwargs: {kwargs}")
             raise
 
+    async def agenerate(self, *args, **kwargs) -> str:
+        """Generate text using Gemini without blocking the event loop"""
+        try:
+            logger.info("Attempting async generation with Gemini provider")
+            if self.hedging and 'use_backup' not in kwargs:
+                return await self._hedged_agenerate(args, kwargs)
+            return await self.provider.agenerate(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Error in FallbackProvider agenerate: {str(e)}")
+            raise
+
+    def stream(self, *args, **kwargs) -> Iterator[str]:
+        """Stream text chunks from Gemini"""
+        yield from self.provider.stream(*args, **kwargs)
+
+    async def astream(self, *args, **kwargs) -> AsyncIterator[str]:
+        """Stream text chunks from Gemini without blocking the event loop"""
+        async for chunk in self.provider.astream(*args, **kwargs):
+            yield chunk
+
     @staticmethod
     def get_config() -> Dict[str, Any]:
         """Get provider configuration"""
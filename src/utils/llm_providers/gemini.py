@@ -1,11 +1,19 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator
+import asyncio
 import logging
 import google.generativeai as genai
 import json
 import os
+from datetime import timedelta
 from pathlib import Path
 from tenacity import retry, stop_after_attempt, wait_exponential
 from .base import BaseLLMProvider
+from .limiter import get_limiter, estimate_tokens
+from .breaker import get_breaker, CircuitBreaker
+from .context_cache import get_context_cache, context_cache_settings
+from .prompt import join_prefix
+from .schemas import gemini_schema, parse_structured
+from .metrics import track_call
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +28,144 @@ class GeminiProvider(BaseLLMProvider):
             if not api_key:
                 raise ValueError("No Gemini API key found in environment")
             
-            # Configure the Gemini API
-            genai.configure(api_key=api_key)
+            # Configure the Gemini API (GEMINI_API_ENDPOINT points it at e.g. the stub server)
+            endpoint = os.getenv('GEMINI_API_ENDPOINT')
+            if endpoint:
+                genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+            else:
+                genai.configure(api_key=api_key)
             
             # Initialize both models
-            self.default_model = genai.GenerativeModel('gemini-2.0-flash')
-            self.backup_model = genai.GenerativeModel('gemini-2.0-flash-lite-preview-02-05')
+            self.default_model_name = 'gemini-2.0-flash'
+            self.backup_model_name = 'gemini-2.0-flash-lite-preview-02-05'
+            self.default_model = genai.GenerativeModel(self.default_model_name)
+            self.backup_model = genai.GenerativeModel(self.backup_model_name)
             logger.info("Initialized Gemini Flash providers")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini provider: {str(e)}")
             raise
 
+    def _select_model(self, use_backup: bool):
+        """Pick the primary or backup model"""
+        model = self.backup_model if use_backup else self.default_model
+        model_name = "Flash Lite" if use_backup else "Flash"
+        logger.info(f"Using {model_name} model")
+        return model
+
+    def _breaker(self, use_backup: bool) -> CircuitBreaker:
+        """Circuit breaker for the selected model; the primary is probed in the background"""
+        if use_backup:
+            return get_breaker(f"gemini:{self.backup_model_name}")
+        return get_breaker(f"gemini:{self.default_model_name}", probe=self._probe_primary)
+
+    def _probe_primary(self):
+        """Minimal call used to test whether the primary model has recovered"""
+        self.default_model.generate_content("ping", generation_config={"max_output_tokens": 1})
+
+    def _route(self, use_backup: bool, fallback: bool) -> bool:
+        """Send traffic straight to the backup while the primary's breaker is open"""
+        if not use_backup and fallback and not self._breaker(False).available():
+            logger.info("Primary model circuit is open, using backup model")
+            return True
+        return use_backup
+
+    def _model_name(self, use_backup: bool) -> str:
+        return self.backup_model_name if use_backup else self.default_model_name
+
+    def _limit_call(self, use_backup: bool, prompt: str, max_tokens: Optional[int]):
+        """Hold a slot on the selected model's rate limiter"""
+        return get_limiter(self._model_name(use_backup)).limit_call(estimate_tokens(prompt, max_tokens or 1024))
+
+    def _alimit_call(self, use_backup: bool, prompt: str, max_tokens: Optional[int]):
+        """Hold a slot on the selected model's rate limiter from async code"""
+        return get_limiter(self._model_name(use_backup)).alimit_call(estimate_tokens(prompt, max_tokens or 1024))
+
+    def _track(self, use_backup: bool, prompt: str):
+        """Record tokens and latency of a call in the metrics registry"""
+        return track_call("gemini", self._model_name(use_backup), prompt)
+
+    @staticmethod
+    def _usage(response) -> tuple:
+        """(prompt, completion) token counts from Gemini's usage metadata"""
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return None, None
+        return getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None)
+
+    def _prepare(
+        self,
+        use_backup: bool,
+        prompt: str,
+        system_prompt: Optional[str],
+        static_prefix: Optional[str]
+    ):
+        """Pick the model and prompt, using cached content for the static prefix when possible"""
+        if static_prefix:
+            cached_model = self._context_model(use_backup, static_prefix)
+            if cached_model is not None:
+                return cached_model, self._format_prompt(prompt, system_prompt)
+        return self._select_model(use_backup), self._format_prompt(join_prefix(static_prefix, prompt), system_prompt)
+
+    async def _aprepare(
+        self,
+        use_backup: bool,
+        prompt: str,
+        system_prompt: Optional[str],
+        static_prefix: Optional[str]
+    ):
+        """``_prepare`` for async callers; registering cached content is a blocking call, so it runs on a thread"""
+        if static_prefix and context_cache_settings('gemini').get('enabled'):
+            return await asyncio.to_thread(self._prepare, use_backup, prompt, system_prompt, static_prefix)
+        return self._prepare(use_backup, prompt, system_prompt, static_prefix)
+
+    def _context_model(self, use_backup: bool, static_prefix: str):
+        """Model bound to cached content holding the prefix, or None to send it inline"""
+        settings = context_cache_settings('gemini')
+        if not settings.get('enabled'):
+            return None
+        model_name = self.backup_model_name if use_backup else self.default_model_name
+
+        def create(prefix: str, ttl_seconds: float):
+            cached = genai.caching.CachedContent.create(
+                model=f"models/{model_name}",
+                system_instruction=prefix,
+                ttl=timedelta(seconds=ttl_seconds)
+            )
+            return cached.name, genai.GenerativeModel.from_cached_content(cached_content=cached)
+
+        handle = get_context_cache().lookup(
+            'gemini', model_name, static_prefix, create,
+            min_tokens=settings.get('min_prefix_tokens', 4096)
+        )
+        return handle.resource if handle else None
+
+    def _format_prompt(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Format the prompt with system prompt if provided"""
+        formatted_prompt = prompt
+        if system_prompt:
+            formatted_prompt = f"System: {system_prompt}\n\nUser: {prompt}"
+        logger.debug("Formatted prompt (%d chars)", len(formatted_prompt))
+        return formatted_prompt
+
+    def _generation_config(
+        self,
+        temperature: float,
+        max_tokens: Optional[int],
+        stop: Optional[list],
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build the Gemini generation config"""
+        config = {
+            "temperature": float(temperature),
+            "max_output_tokens": max_tokens if max_tokens else 1024,
+            "stop_sequences": stop if stop else [],
+            "candidate_count": 1
+        }
+        if response_schema:
+            config["response_mime_type"] = "application/json"
+            config["response_schema"] = gemini_schema(response_schema)
+        return config
+
     def generate(
         self,
         prompt: str,
@@ -39,45 +174,46 @@ class GeminiProvider(BaseLLMProvider):
         max_tokens: Optional[int] = None,
         stop: Optional[list] = None,
         use_backup: bool = False,
+        fallback: bool = True,
+        static_prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> str:
-        """Generate text using Gemini"""
+        """Generate text using Gemini
+
+        The primary model falls back to the backup on error unless
+        ``fallback`` is False (hedged callers race the backup themselves).
+        ``static_prefix`` is served from cached content when it is large
+        enough to register, otherwise it is prepended to the prompt.
+        With ``response_schema`` the model is constrained to that JSON
+        schema and a non-conforming reply counts as a failure.
+        """
         try:
             logger.info(f"Starting Gemini generation with temperature: {temperature}")
-            
-            # Select model
-            model = self.backup_model if use_backup else self.default_model
-            model_name = "Flash Lite" if use_backup else "Flash"
-            logger.info(f"Using {model_name} model")
-            
-            # Format the prompt with system prompt if provided
-            formatted_prompt = prompt
-            if system_prompt:
-                formatted_prompt = f"System: {system_prompt}\n\nUser: {prompt}"
-            logger.info(f"Formatted prompt: {formatted_prompt}")
+            use_backup = self._route(use_backup, fallback)
+            model, formatted_prompt = self._prepare(use_backup, prompt, system_prompt, static_prefix)
             
             # Generate response
             try:
                 logger.info("Sending message to Gemini...")
-                response = model.generate_content(
-                    formatted_prompt,
-                    generation_config={
-                        "temperature": float(temperature),
-                        "max_output_tokens": max_tokens if max_tokens else 1024,
-                        "stop_sequences": stop if stop else [],
-                        "candidate_count": 1
-                    }
-                )
+                with self._limit_call(use_backup, formatted_prompt, max_tokens), self._breaker(use_backup).guard(), \
+                        self._track(use_backup, formatted_prompt) as call:
+                    response = model.generate_content(
+                        formatted_prompt,
+                        generation_config=self._generation_config(temperature, max_tokens, stop, response_schema)
+                    )
+                    call.usage(*self._usage(response))
+                    call.complete(response.text)
                 logger.info("Message sent successfully")
                 
                 text = response.text
-                logger.info(f"Raw response: {text}")
+                logger.debug("Raw response (%d chars)", len(text))
                 
                 # Clean up and validate response
-                return self._process_response(text, prompt)
+                return self._process_response(text, join_prefix(static_prefix, prompt), response_schema)
 
             except Exception as e:
-                if not use_backup:
+                if not use_backup and fallback:
                     logger.warning(f"Primary model failed, trying backup model: {str(e)}")
                     return self.generate(
                         prompt=prompt,
@@ -85,7 +221,9 @@ class GeminiProvider(BaseLLMProvider):
                         temperature=temperature,
                         max_tokens=max_tokens,
                         stop=stop,
-                        use_backup=True
+                        use_backup=True,
+                        static_prefix=static_prefix,
+                        response_schema=response_schema
                     )
                 raise
 
@@ -93,32 +231,173 @@ class GeminiProvider(BaseLLMProvider):
             logger.error(f"Error in generate method: {str(e)}")
             raise
 
-    def _process_response(self, text: str, prompt: str) -> str:
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        use_backup: bool = False,
+        fallback: bool = True,
+        static_prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> str:
+        """Generate text using Gemini's native async client"""
+        try:
+            logger.info(f"Starting async Gemini generation with temperature: {temperature}")
+            use_backup = self._route(use_backup, fallback)
+            model, formatted_prompt = await self._aprepare(use_backup, prompt, system_prompt, static_prefix)
+            
+            try:
+                async with self._alimit_call(use_backup, formatted_prompt, max_tokens):
+                    with self._breaker(use_backup).guard(), self._track(use_backup, formatted_prompt) as call:
+                        response = await model.generate_content_async(
+                            formatted_prompt,
+                            generation_config=self._generation_config(temperature, max_tokens, stop, response_schema)
+                        )
+                        call.usage(*self._usage(response))
+                        call.complete(response.text)
+                text = response.text
+                logger.debug("Raw response (%d chars)", len(text))
+                return self._process_response(text, join_prefix(static_prefix, prompt), response_schema)
+
+            except Exception as e:
+                if not use_backup and fallback:
+                    logger.warning(f"Primary model failed, trying backup model: {str(e)}")
+                    return await self.agenerate(
+                        prompt=prompt,
+                        system_prompt=system_prompt,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        stop=stop,
+                        use_backup=True,
+                        static_prefix=static_prefix,
+                        response_schema=response_schema
+                    )
+                raise
+
+        except Exception as e:
+            logger.error(f"Error in agenerate method: {str(e)}")
+            raise
+
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        use_backup: bool = False,
+        static_prefix: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """Stream text chunks from Gemini as they are generated"""
+        use_backup = self._route(use_backup, True)
+        model, formatted_prompt = self._prepare(use_backup, prompt, system_prompt, static_prefix)
+        started = False
+        try:
+            with self._limit_call(use_backup, formatted_prompt, max_tokens), self._breaker(use_backup).guard(), \
+                    self._track(use_backup, formatted_prompt) as call:
+                response = model.generate_content(
+                    formatted_prompt,
+                    generation_config=self._generation_config(temperature, max_tokens, stop),
+                    stream=True
+                )
+                for chunk in response:
+                    if chunk.text:
+                        started = True
+                        call.output(chunk.text)
+                        yield chunk.text
+                call.usage(*self._usage(response))
+        except Exception as e:
+            # Only fall back if nothing has been sent to the caller yet
+            if use_backup or started:
+                logger.error(f"Error in stream method: {str(e)}")
+                raise
+            logger.warning(f"Primary model failed to stream, trying backup model: {str(e)}")
+            yield from self.stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=stop,
+                use_backup=True,
+                static_prefix=static_prefix
+            )
+
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        use_backup: bool = False,
+        static_prefix: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream text chunks from Gemini's native async client"""
+        use_backup = self._route(use_backup, True)
+        model, formatted_prompt = await self._aprepare(use_backup, prompt, system_prompt, static_prefix)
+        started = False
+        try:
+            async with self._alimit_call(use_backup, formatted_prompt, max_tokens):
+                with self._breaker(use_backup).guard(), self._track(use_backup, formatted_prompt) as call:
+                    response = await model.generate_content_async(
+                        formatted_prompt,
+                        generation_config=self._generation_config(temperature, max_tokens, stop),
+                        stream=True
+                    )
+                    async for chunk in response:
+                        if chunk.text:
+                            started = True
+                            call.output(chunk.text)
+                            yield chunk.text
+                    call.usage(*self._usage(response))
+        except Exception as e:
+            if use_backup or started:
+                logger.error(f"Error in astream method: {str(e)}")
+                raise
+            logger.warning(f"Primary model failed to stream, trying backup model: {str(e)}")
+            async for chunk in self.astream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=stop,
+                use_backup=True,
+                static_prefix=static_prefix
+            ):
+                yield chunk
+
+    def _process_response(self, text: str, prompt: str, response_schema: Optional[Dict[str, Any]] = None) -> str:
         """Process and validate the response"""
+        if response_schema:
+            # Structured output: trust the typed result, raise if it does not conform
+            return json.dumps(parse_structured(text, response_schema), ensure_ascii=False)
+
         # Clean up markdown code blocks if present
         if "```json" in text:
-            logger.info("Cleaning up markdown code blocks")
+            logger.debug("Cleaning up markdown code blocks")
             text = text.split("```json")[-1]
             text = text.split("```")[0]
             text = text.strip()
-            logger.info(f"Cleaned response: {text}")
         
         # Validate JSON if that's what we're expecting
         if '"message"' in prompt and '"transfers"' in prompt:
-            logger.info("Validating JSON response")
             try:
                 json_obj = json.loads(text)
                 normalized = json.dumps(json_obj)
-                logger.info(f"Valid JSON response: {normalized}")
                 return normalized
             except json.JSONDecodeError as e:
                 logger.error(f"JSON validation failed: {str(e)}")
-                logger.error(f"Invalid JSON text: {text}")
                 fallback = json.dumps({
                     "message": "Error: Could not generate valid JSON response",
                     "transfers": []
                 })
-                logger.info(f"Using fallback JSON: {fallback}")
+                logger.warning("Using fallback JSON (%d chars of invalid reply)", len(text))
                 return fallback
         
         return text
@@ -0,0 +1,46 @@
+from typing import Optional, Dict, Any
+from collections import deque
+import threading
+
+class LatencyTracker:
+    """Rolling window of observed call latencies per model"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model: str, seconds: float):
+        """Record one successful call"""
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def quantile(self, model: str, q: float) -> Optional[float]:
+        """Latency at quantile ``q`` (0-1), or None with no samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Sample count and p50/p90/p95 per model"""
+        with self._lock:
+            models = list(self._samples)
+        return {
+            model: {
+                "samples": self.count(model),
+                "p50": self.quantile(model, 0.5),
+                "p90": self.quantile(model, 0.9),
+                "p95": self.quantile(model, 0.95)
+            }
+            for model in models
+        }
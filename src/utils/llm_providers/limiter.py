@@ -0,0 +1,275 @@
+from typing import Optional, Dict, Any
+from contextlib import contextmanager, asynccontextmanager
+import asyncio
+import logging
+import threading
+import time
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Call outcomes fed back into the adaptive concurrency cap
+SUCCESS = "success"      # grow the cap
+OVERLOADED = "overloaded"  # 429 / 5xx / timeout: shrink the cap
+NEUTRAL = "neutral"      # client-side failure: leave the cap alone
+
+THROTTLE_STATUS = 429
+
+def estimate_tokens(prompt: Optional[str], max_tokens: Optional[int] = None) -> int:
+    """Rough token estimate (4 characters per token) for budget accounting"""
+    return len(prompt or "") // 4 + (max_tokens or 0)
+
+def error_status(error: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of a provider exception"""
+    for attr in ("status", "status_code", "code"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+def classify_error(error: BaseException) -> str:
+    """Map a provider exception to a limiter outcome"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return OVERLOADED
+    name = type(error).__name__
+    if name in ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "DeadlineExceeded"):
+        return OVERLOADED
+    status = error_status(error)
+    if status is not None and (status == THROTTLE_STATUS or status >= 500):
+        return OVERLOADED
+    return NEUTRAL
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate_per_minute``"""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1.0, rate_per_minute / 10.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+class Permit:
+    """An admitted call; records its outcome when released"""
+
+    def __init__(self, limiter: "ModelLimiter", queued: float):
+        self.limiter = limiter
+        self.queued = queued
+        self.outcome = SUCCESS
+        self.retry_after: Optional[float] = None
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """Mark the call as rate limited; new calls pause for ``retry_after``"""
+        self.outcome = OVERLOADED
+        self.retry_after = retry_after or self.limiter.throttle_backoff
+
+    def overloaded(self):
+        """Mark the call as failed because the provider is overloaded"""
+        self.outcome = OVERLOADED
+
+class ModelLimiter:
+    """Request/token rate limits plus an AIMD concurrency cap for one model
+
+    The concurrency cap grows additively (``increase / cap`` per success,
+    roughly +1 per cap's worth of calls) and shrinks multiplicatively on
+    429s, 5xx and timeouts, at most once per ``decrease_cooldown`` so a
+    burst of failures from the same overload only halves it once. A 429
+    also pauses admission for its Retry-After (or ``throttle_backoff``).
+    """
+
+    def __init__(
+        self,
+        model: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        throttle_backoff: float = 1.0
+    ):
+        self.model = model
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.throttle_backoff = throttle_backoff
+        self.in_flight = 0
+        self.waiting = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self.metrics = {
+            "admitted": 0,
+            "overloaded": 0,
+            "queue_time_total": 0.0,
+            "queue_time_max": 0.0
+        }
+
+    def _try_admit(self, tokens: int) -> float:
+        """Admit the call if possible; otherwise return how long to wait (caller holds the lock)"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= int(self.limit):
+            return -1.0  # wait for a release
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.wait_time(1, now))
+        if self.token_bucket and tokens:
+            wait = max(wait, self.token_bucket.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+        if self.request_bucket:
+            self.request_bucket.consume(1)
+        if self.token_bucket and tokens:
+            self.token_bucket.consume(tokens)
+        self.in_flight += 1
+        return 0.0
+
+    def _admitted(self, started: float) -> Permit:
+        queued = time.monotonic() - started
+        self.metrics["admitted"] += 1
+        self.metrics["queue_time_total"] += queued
+        self.metrics["queue_time_max"] = max(self.metrics["queue_time_max"], queued)
+        return Permit(self, queued)
+
+    def acquire(self, tokens: int = 0) -> Permit:
+        """Block until the call may proceed"""
+        started = time.monotonic()
+        with self._cond:
+            self.waiting += 1
+            try:
+                while True:
+                    wait = self._try_admit(tokens)
+                    if wait == 0:
+                        return self._admitted(started)
+                    self._cond.wait(timeout=wait if wait > 0 else None)
+            finally:
+                self.waiting -= 1
+
+    async def aacquire(self, tokens: int = 0) -> Permit:
+        """Wait on the event loop until the call may proceed"""
+        started = time.monotonic()
+        with self._cond:
+            self.waiting += 1
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit(tokens)
+                    if wait == 0:
+                        return self._admitted(started)
+                # Releases may come from other threads, so poll briefly
+                await asyncio.sleep(min(wait, 0.05) if wait > 0 else 0.01)
+        finally:
+            with self._cond:
+                self.waiting -= 1
+
+    def release(self, permit: Permit):
+        """Return the slot and adapt the concurrency cap to the outcome"""
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if permit.outcome == SUCCESS:
+                self.limit = min(self.max_concurrency, self.limit + self.increase / max(self.limit, 1.0))
+            elif permit.outcome == OVERLOADED:
+                self.metrics["overloaded"] += 1
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    logger.warning(f"Rate limited on {self.model}, concurrency cap now {int(self.limit)}")
+                if permit.retry_after:
+                    self.paused_until = max(self.paused_until, now + permit.retry_after)
+            self._cond.notify_all()
+
+    @contextmanager
+    def limit_call(self, tokens: int = 0):
+        """Hold a slot for the duration of a blocking call"""
+        permit = self.acquire(tokens)
+        try:
+            yield permit
+        except BaseException as e:
+            if permit.outcome == SUCCESS:
+                permit.outcome = classify_error(e)
+            raise
+        finally:
+            self.release(permit)
+
+    @asynccontextmanager
+    async def alimit_call(self, tokens: int = 0):
+        """Hold a slot for the duration of an async call"""
+        permit = await self.aacquire(tokens)
+        try:
+            yield permit
+        except BaseException as e:
+            if permit.outcome == SUCCESS:
+                permit.outcome = classify_error(e) if not isinstance(e, asyncio.CancelledError) else NEUTRAL
+            raise
+        finally:
+            self.release(permit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limiter state and queueing metrics"""
+        with self._cond:
+            admitted = self.metrics["admitted"]
+            return {
+                "model": self.model,
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "admitted": admitted,
+                "overloaded": self.metrics["overloaded"],
+                "queue_time_avg": self.metrics["queue_time_total"] / admitted if admitted else 0.0,
+                "queue_time_max": self.metrics["queue_time_max"],
+                "paused_for": max(0.0, self.paused_until - time.monotonic())
+            }
+
+_limiters: Dict[str, ModelLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(model: str) -> ModelLimiter:
+    """Get the process-wide limiter for a model, configured from ``llm.rate_limits``"""
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            rate_config = Config().llm_config.get('rate_limits', {}) or {}
+            settings = dict(rate_config.get('default', {}) or {})
+            settings.update((rate_config.get('models', {}) or {}).get(model, {}) or {})
+            limiter = ModelLimiter(model, **settings)
+            _limiters[model] = limiter
+        return limiter
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every limiter created so far"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.model: limiter.stats() for limiter in limiters}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds"""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
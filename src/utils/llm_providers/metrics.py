@@ -0,0 +1,284 @@
+from typing import Optional, Dict, Any, Tuple, List
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+import time
+from .limiter import estimate_tokens
+from .tracing import TraceRecorder, get_trace_recorder
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Labels for the calls made in the current task/thread (copied into to_thread workers)
+_game_id: ContextVar[Optional[str]] = ContextVar("llm_game_id", default=None)
+_phase: ContextVar[Optional[str]] = ContextVar("llm_phase", default=None)
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+@contextmanager
+def call_labels(game_id: Optional[str] = None, phase: Optional[str] = None):
+    """Attribute LLM calls made inside the block to a game and/or phase"""
+    tokens = []
+    if game_id is not None:
+        tokens.append((_game_id, _game_id.set(game_id)))
+    if phase is not None:
+        tokens.append((_phase, _phase.set(phase)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+def current_labels() -> Tuple[Optional[str], Optional[str]]:
+    """The (game_id, phase) the current call is attributed to"""
+    return _game_id.get(), _phase.get()
+
+class CallRecord:
+    """Token counts and timings of one provider call"""
+
+    __slots__ = (
+        "provider", "model", "game_id", "phase", "started", "first_token_at",
+        "prompt_tokens", "completion_tokens", "_reported", "prompt", "_parts"
+    )
+
+    def __init__(self, provider: str, model: str, prompt: str = ""):
+        self.provider = provider
+        self.model = model
+        self.game_id, self.phase = current_labels()
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.prompt_tokens = estimate_tokens(prompt)
+        self.completion_tokens = 0
+        self._reported = False
+        # Payload references for the trace recorder (no copies on the hot path)
+        self.prompt = prompt
+        self._parts: List[str] = []
+
+    def usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """Token counts reported by the provider (replace the estimates)"""
+        if prompt_tokens is not None:
+            self.prompt_tokens = prompt_tokens
+        if completion_tokens is not None:
+            self.completion_tokens = completion_tokens
+            self._reported = True
+
+    def complete(self, text: str):
+        """Account for a whole (non-streamed) reply if usage was not reported"""
+        self._parts = [text]
+        if not self._reported:
+            self.completion_tokens = estimate_tokens(text)
+
+    def output(self, text: str):
+        """Account for generated text; the first call marks time-to-first-token"""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self._parts.append(text)
+        if not self._reported:
+            self.completion_tokens += estimate_tokens(text)
+
+    @property
+    def response(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def ttft(self) -> Optional[float]:
+        return None if self.first_token_at is None else self.first_token_at - self.started
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+def _new_usage() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "errors": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "latency_seconds": 0.0,
+        "cost_usd": 0.0
+    }
+
+def _add_usage(usage: Dict[str, Any], call: CallRecord, latency: float, cost: float, failed: bool):
+    usage["calls"] += 1
+    usage["errors"] += int(failed)
+    usage["prompt_tokens"] += call.prompt_tokens
+    usage["completion_tokens"] += call.completion_tokens
+    usage["latency_seconds"] += latency
+    usage["cost_usd"] += cost
+
+class MetricsRegistry:
+    """In-process LLM call metrics, rendered in Prometheus text format
+
+    Counters and latency histograms are labelled by provider, model and
+    phase (thinking/action/format/summary). Game ids would explode label
+    cardinality, so usage is aggregated per game separately and handed to
+    the ``game_ended`` event via ``end_game``.
+    """
+
+    def __init__(
+        self,
+        pricing: Optional[Dict[str, Dict[str, float]]] = None,
+        max_games: int = 1000,
+        tracer: Optional[TraceRecorder] = None
+    ):
+        self.pricing = pricing or {}
+        self.max_games = max_games
+        self.tracer = tracer
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str, str, str], int] = {}
+        self._tokens: Dict[Tuple[str, str, str], List[float]] = {}
+        self._latency: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._ttft: Dict[Tuple[str, str, str], _Histogram] = {}
+        self._games: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """Dollar cost from ``llm.pricing`` (USD per million tokens)"""
+        price = self.pricing.get(model) or self.pricing.get("default") or {}
+        return (
+            prompt_tokens * price.get("input_per_million", 0.0)
+            + completion_tokens * price.get("output_per_million", 0.0)
+        ) / 1_000_000
+
+    @contextmanager
+    def track(self, provider: str, model: str, prompt: str = ""):
+        """Time a provider call; the yielded CallRecord collects its usage"""
+        call = CallRecord(provider, model, prompt)
+        try:
+            yield call
+        except GeneratorExit:
+            # A stream the caller stopped reading early is not a failure
+            self.record(call, failed=False)
+            raise
+        except BaseException as e:
+            self.record(call, failed=True, error=f"{type(e).__name__}: {e}")
+            raise
+        self.record(call, failed=False)
+
+    def record(self, call: CallRecord, failed: bool = False, error: Optional[str] = None):
+        latency = time.perf_counter() - call.started
+        if self.tracer is not None:
+            self.tracer.record(
+                call.provider, call.model, call.prompt, call.response,
+                game_id=call.game_id, phase=call.phase, latency=latency, error=error
+            )
+        cost = self.cost(call.model, call.prompt_tokens, call.completion_tokens)
+        phase = call.phase or "other"
+        key = (call.provider, call.model, phase)
+        with self._lock:
+            status_key = key + ("error" if failed else "ok",)
+            self._calls[status_key] = self._calls.get(status_key, 0) + 1
+            tokens = self._tokens.setdefault(key, [0, 0, 0.0])
+            tokens[0] += call.prompt_tokens
+            tokens[1] += call.completion_tokens
+            tokens[2] += cost
+            self._latency.setdefault(key, _Histogram()).observe(latency)
+            if call.ttft is not None:
+                self._ttft.setdefault(key, _Histogram()).observe(call.ttft)
+            if call.game_id:
+                self._record_game(call, phase, latency, cost, failed)
+
+    def _record_game(self, call: CallRecord, phase: str, latency: float, cost: float, failed: bool):
+        game = self._games.get(call.game_id)
+        if game is None:
+            game = {"total": _new_usage(), "by_phase": {}, "by_model": {}}
+            self._games[call.game_id] = game
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+        _add_usage(game["total"], call, latency, cost, failed)
+        _add_usage(game["by_phase"].setdefault(phase, _new_usage()), call, latency, cost, failed)
+        _add_usage(game["by_model"].setdefault(call.model, _new_usage()), call, latency, cost, failed)
+
+    def game_summary(self, game_id: str) -> Dict[str, Any]:
+        """Usage so far for one game"""
+        with self._lock:
+            game = self._games.get(game_id)
+            if game is None:
+                return {"total": _new_usage(), "by_phase": {}, "by_model": {}}
+            return {
+                "total": dict(game["total"]),
+                "by_phase": {k: dict(v) for k, v in game["by_phase"].items()},
+                "by_model": {k: dict(v) for k, v in game["by_model"].items()}
+            }
+
+    def end_game(self, game_id: str) -> Dict[str, Any]:
+        """Final usage for a game, dropping its aggregate"""
+        summary = self.game_summary(game_id)
+        with self._lock:
+            self._games.pop(game_id, None)
+        return summary
+
+    def render_prometheus(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+
+        def labels(key, le: Optional[str] = None) -> str:
+            provider, model, phase = key[:3]
+            parts = [f'provider="{provider}"', f'model="{model}"', f'phase="{phase}"']
+            if len(key) > 3:
+                parts.append(f'status="{key[3]}"')
+            if le is not None:
+                parts.append(f'le="{le}"')
+            return "{" + ",".join(parts) + "}"
+
+        def histogram(name: str, help_text: str, series: Dict[Tuple[str, str, str], _Histogram]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                for bound, count in zip(LATENCY_BUCKETS, hist.counts):
+                    lines.append(f"{name}_bucket{labels(key, str(bound))} {count}")
+                lines.append(f"{name}_bucket{labels(key, '+Inf')} {hist.count}")
+                lines.append(f"{name}_sum{labels(key)} {hist.total:.6f}")
+                lines.append(f"{name}_count{labels(key)} {hist.count}")
+
+        with self._lock:
+            lines.append("# HELP llm_calls_total LLM provider calls")
+            lines.append("# TYPE llm_calls_total counter")
+            for key, count in sorted(self._calls.items()):
+                lines.append(f"llm_calls_total{labels(key)} {count}")
+            for index, (name, help_text) in enumerate((
+                ("llm_prompt_tokens_total", "Prompt tokens sent"),
+                ("llm_completion_tokens_total", "Completion tokens received"),
+                ("llm_cost_usd_total", "Estimated spend in USD")
+            )):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for key, values in sorted(self._tokens.items()):
+                    value = values[index]
+                    lines.append(f"{name}{labels(key)} {value:.6f}" if index == 2 else f"{name}{labels(key)} {value}")
+            histogram("llm_call_latency_seconds", "Wall-clock latency of LLM calls", self._latency)
+            histogram("llm_time_to_first_token_seconds", "Time to first streamed token", self._ttft)
+            lines.append("# HELP llm_active_games Games with usage being aggregated")
+            lines.append("# TYPE llm_active_games gauge")
+            lines.append(f"llm_active_games {len(self._games)}")
+        return "\n".join(lines) + "\n"
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry, priced from ``llm.pricing``"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry(
+                pricing=Config().llm_config.get('pricing', {}) or {},
+                tracer=get_trace_recorder()
+            )
+        return _registry
+
+def track_call(provider: str, model: str, prompt: str = ""):
+    """Shorthand for ``get_metrics().track(...)``"""
+    return get_metrics().track(provider, model, prompt)
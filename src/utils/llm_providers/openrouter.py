@@ -1,8 +1,14 @@
-from typing import Optional, Iterator, List, Dict, Any
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from typing import Optional, Iterator, AsyncIterator, List, Dict, Any
+import asyncio
+import aiohttp
 from .base import BaseLLMProvider
+from .pool import get_http_pool, RETRY_STATUS_CODES
+from .limiter import get_limiter, estimate_tokens, parse_retry_after, THROTTLE_STATUS
+from .breaker import get_breaker, CircuitBreaker
+from .context_cache import get_context_cache, context_cache_settings
+from .schemas import parse_structured, strict_json_schema, response_schema_name
+from .metrics import track_call, CallRecord
+from .sse import parse_sse_delta, StreamDone
 import os
 import json
 import logging
@@ -11,21 +17,24 @@ import re
 import time
 from ..config import Config
 
+logger = logging.getLogger(__name__)
+
 class OpenRouterProvider(BaseLLMProvider):
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         config = Config()
         self.api_key = api_key or config.get_api_key('openrouter')
-        self.api_base = "https://openrouter.ai/api/v1"
+        self.api_base = os.getenv("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1")
         
         # Get default model config from player1 (since it's using Gemini)
         model_config = config.llm_config['models']['player1']
-        self.default_model = model_config['default']
+        self.default_model = model or model_config['default']
         self.backup_model = model_config.get('backup')
         self.default_max_tokens = model_config.get('max_tokens', 1024)
         self.default_temperature = model_config.get('temperature', 0.7)
         
-        # Setup session with retry logic
-        self.session = self._setup_session()
+        # Share the process-wide keep-alive pool (retry logic lives there)
+        self.pool = get_http_pool()
+        self.session = self.pool.session
     
     @staticmethod
     def get_config() -> Dict[str, Any]:
@@ -51,25 +60,71 @@ class OpenRouterProvider(BaseLLMProvider):
             }
         }
     
-    def _setup_session(self):
-        """Setup requests session with retry logic"""
-        session = requests.Session()
-        
-        # Define retry strategy
-        retries = Retry(
-            total=3,  # number of retries
-            backoff_factor=1,  # wait 1, 2, 4 seconds between retries
-            status_forcelist=[408, 429, 500, 502, 503, 504],  # retry on these status codes
-            allowed_methods=["POST"]
-        )
-        
-        # Add retry adapter to session
-        adapter = HTTPAdapter(max_retries=retries)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
+    def _headers(self) -> Dict[str, str]:
+        """Request headers for the OpenRouter API"""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "http://localhost:8000",
+            "X-Title": "AI Agents Negotiation Game"
+        }
+
+    def _build_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        static_prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Build the chat completion request body"""
+        # For Gemini, combine system prompt with user prompt
+        if system_prompt:
+            full_prompt = f"{system_prompt}\n\nUser Request: {prompt}"
+        else:
+            full_prompt = prompt
         
-        return session
-    
+        messages = [{"role": "user", "content": full_prompt}]
+        if static_prefix:
+            # Mark the static prefix as a prompt-caching breakpoint
+            prefix_part = {"type": "text", "text": static_prefix}
+            if context_cache_settings('openrouter').get('enabled'):
+                prefix_part["cache_control"] = {"type": "ephemeral"}
+            messages.insert(0, {"role": "system", "content": [prefix_part]})
+        response_format = {"type": "json_object"}
+        if response_schema:
+            response_format = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": response_schema_name(response_schema),
+                    "strict": True,
+                    "schema": strict_json_schema(response_schema)
+                }
+            }
+        return {
+            "model": self.default_model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens or self.default_max_tokens,
+            "stop": stop,
+            "response_format": response_format
+        }
+
+    def _parse_content(self, content: str, response_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Normalize the JSON content returned by the model"""
+        if response_schema:
+            # Structured output: trust the typed result, raise if it does not conform
+            return json.dumps(parse_structured(content, response_schema), ensure_ascii=False)
+        try:
+            return json.dumps(json.loads(content))  # Normalize JSON format
+        except json.JSONDecodeError:
+            return json.dumps({
+                "thinking": "Error: Could not parse response",
+                "message": "I apologize, but I'm having trouble formulating my response.",
+                "transfers": []
+            })
+
     def generate(
         self,
         prompt: str,
@@ -77,54 +132,145 @@ class OpenRouterProvider(BaseLLMProvider):
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
         stop: Optional[list] = None,
+        static_prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
     ) -> str:
         """Generate text using OpenRouter"""
         try:
-            # For Gemini, combine system prompt with user prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\nUser Request: {prompt}"
-            else:
-                full_prompt = prompt
-            
-            messages = [{"role": "user", "content": full_prompt}]
-            
-            response = self.session.post(
-                f"{self.api_base}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": "http://localhost:8000",
-                    "X-Title": "AI Agents Negotiation Game"
-                },
-                json={
-                    "model": self.default_model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens or self.default_max_tokens,
-                    "stop": stop,
-                    "response_format": {"type": "json_object"}
-                },
-                timeout=30
+            payload = self._build_payload(
+                prompt, system_prompt, temperature, max_tokens, stop, static_prefix, response_schema
             )
-            response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"]
+            payload["model"] = self._healthy_model()
+            self._observe_prefix(payload["model"], static_prefix)
+            with self._track(payload) as call:
+                response = self._post("/chat/completions", payload)
+                data = response.json()
+                content = data["choices"][0]["message"]["content"]
+                self._record_usage(data, call, content)
             
             # Additional JSON validation
-            try:
-                return json.dumps(json.loads(content))  # Normalize JSON format
-            except json.JSONDecodeError:
-                return json.dumps({
-                    "thinking": "Error: Could not parse response",
-                    "message": "I apologize, but I'm having trouble formulating my response.",
-                    "transfers": []
-                })
+            return self._parse_content(content, response_schema)
                 
         except Exception as e:
             logger.error(f"OpenRouter generation error: {str(e)}")
+            if response_schema:
+                raise
+            return json.dumps({
+                "message": f"Error: {str(e)}",
+                "transfers": []
+            })
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        static_prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> str:
+        """Generate text using OpenRouter without blocking the event loop"""
+        try:
+            payload = self._build_payload(
+                prompt, system_prompt, temperature, max_tokens, stop, static_prefix, response_schema
+            )
+            payload["model"] = self._healthy_model()
+            self._observe_prefix(payload["model"], static_prefix)
+            with self._track(payload) as call:
+                data = await self._apost("/chat/completions", payload)
+                content = data["choices"][0]["message"]["content"]
+                self._record_usage(data, call, content)
+            return self._parse_content(content, response_schema)
+                
+        except Exception as e:
+            logger.error(f"OpenRouter async generation error: {str(e)}")
+            if response_schema:
+                raise
             return json.dumps({
                 "message": f"Error: {str(e)}",
                 "transfers": []
             })
 
+    @staticmethod
+    def _observe_prefix(model: str, static_prefix: Optional[str]):
+        """Track a cacheable prefix so the expected token savings are reported"""
+        if static_prefix and context_cache_settings('openrouter').get('enabled'):
+            get_context_cache().observe('openrouter', model, static_prefix)
+
+    @staticmethod
+    def _track(payload: Dict[str, Any]):
+        """Record tokens and latency of a call in the metrics registry"""
+        return track_call("openrouter", payload["model"], json.dumps(payload["messages"]))
+
+    @staticmethod
+    def _record_usage(data: Dict[str, Any], call: CallRecord, content: str):
+        """Record the token usage (including cached prompt tokens) OpenRouter reports back"""
+        usage = data.get("usage") or {}
+        call.usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        call.complete(content)
+        details = usage.get("prompt_tokens_details") or {}
+        get_context_cache().record_cached_tokens(details.get("cached_tokens") or 0)
+
+    def _healthy_model(self, model: Optional[str] = None) -> str:
+        """Use the backup model while the requested model's breaker is open"""
+        model = model or self.default_model
+        if self.backup_model and model != self.backup_model and not self._breaker(model).available():
+            logger.info(f"Circuit open for {model}, routing to {self.backup_model}")
+            return self.backup_model
+        return model
+
+    @staticmethod
+    def _breaker(model: str) -> CircuitBreaker:
+        return get_breaker(f"openrouter:{model}")
+
+    def _post(self, path: str, payload: Dict[str, Any]):
+        """POST through the model's rate limiter and breaker, re-queueing on 429"""
+        limiter = get_limiter(payload["model"])
+        breaker = self._breaker(payload["model"])
+        tokens = estimate_tokens(json.dumps(payload["messages"]), payload.get("max_tokens"))
+        for attempt in range(self.pool.max_retries + 1):
+            with limiter.limit_call(tokens) as permit, breaker.guard(), self.pool.track():
+                response = self.session.post(
+                    f"{self.api_base}{path}",
+                    headers=self._headers(),
+                    json=payload,
+                    timeout=30
+                )
+                if response.status_code == THROTTLE_STATUS and attempt < self.pool.max_retries:
+                    permit.throttled(parse_retry_after(response.headers.get("Retry-After")))
+                    continue
+                response.raise_for_status()
+                return response
+
+    async def _apost(self, path: str, payload: Dict[str, Any], retries: int = 3) -> Dict[str, Any]:
+        """POST with the sync retry policy; 429s re-queue behind the rate limiter"""
+        session = self.pool.async_session()
+        limiter = get_limiter(payload["model"])
+        breaker = self._breaker(payload["model"])
+        tokens = estimate_tokens(json.dumps(payload["messages"]), payload.get("max_tokens"))
+        for attempt in range(retries + 1):
+            try:
+                async with limiter.alimit_call(tokens) as permit:
+                    with breaker.guard(), self.pool.track():
+                        async with session.post(
+                            f"{self.api_base}{path}",
+                            headers=self._headers(),
+                            json=payload
+                        ) as response:
+                            if response.status == THROTTLE_STATUS and attempt < retries:
+                                permit.throttled(parse_retry_after(response.headers.get("Retry-After")))
+                                continue
+                            response.raise_for_status()
+                            return await response.json()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUS_CODES or attempt >= retries:
+                    raise
+            # wait 1, 2, 4 seconds between retries
+            await asyncio.sleep(2 ** attempt)
+
     def _extract_thinking_points(self, prompt: str) -> List[str]:
         """Extract key thinking points from the prompt"""
         points = []
@@ -157,41 +303,109 @@ class OpenRouterProvider(BaseLLMProvider):
         
         return points
 
-    def stream(self, 
-              prompt: str, 
-              model: str = None,
-              backup_model: Optional[str] = None,
-              **kwargs) -> Iterator[str]:
-        model = model or self.default_model
+    def _stream_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        stop: Optional[list],
+        model: Optional[str],
+        static_prefix: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a streaming request body (free text, no JSON mode)"""
+        payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, stop, static_prefix)
+        payload.pop("response_format", None)
+        payload["model"] = model or self.default_model
+        payload["stream"] = True
+        return payload
+
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        model: Optional[str] = None,
+        backup_model: Optional[str] = None,
+        static_prefix: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Stream text chunks from OpenRouter's server-sent events"""
+        started = False
+        payload = self._stream_payload(prompt, system_prompt, temperature, max_tokens, stop, model, static_prefix)
+        self._observe_prefix(payload["model"], static_prefix)
+        limiter = get_limiter(payload["model"])
         try:
-            response = requests.post(
-                f"{self.api_base}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "HTTP-Referer": "http://localhost:8000",
-                    "X-Title": "AI Agents Negotiation Game"
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": "You are a helpful AI assistant participating in a business negotiation game."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "stream": True,
-                    "temperature": 0.7,
-                    "max_tokens": 1000,
-                    **kwargs
-                },
-                stream=True
+            with limiter.limit_call(estimate_tokens(json.dumps(payload["messages"]), payload.get("max_tokens"))), \
+                    self._breaker(payload["model"]).guard(), self.pool.track(), self._track(payload) as call:
+                response = self.session.post(
+                    f"{self.api_base}/chat/completions",
+                    headers=self._headers(),
+                    json=payload,
+                    stream=True,
+                    timeout=30
+                )
+                response.raise_for_status()
+                
+                for line in response.iter_lines():
+                    try:
+                        content = parse_sse_delta(line)
+                    except StreamDone:
+                        break
+                    if content:
+                        started = True
+                        call.output(content)
+                        yield content
+        except Exception as e:
+            if not backup_model or started:
+                raise
+            logger.warning(f"OpenRouter stream failed, trying backup model: {str(e)}")
+            yield from self.stream(
+                prompt, system_prompt, temperature, max_tokens, stop,
+                model=backup_model, static_prefix=static_prefix
             )
-            response.raise_for_status()
-            
-            for line in response.iter_lines():
-                if line:
-                    chunk = json.loads(line.decode())
-                    if chunk.get("choices") and chunk["choices"][0].get("delta", {}).get("content"):
-                        yield chunk["choices"][0]["delta"]["content"]
+
+    async def astream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        model: Optional[str] = None,
+        backup_model: Optional[str] = None,
+        static_prefix: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Stream text chunks from OpenRouter without blocking the event loop"""
+        started = False
+        payload = self._stream_payload(prompt, system_prompt, temperature, max_tokens, stop, model, static_prefix)
+        self._observe_prefix(payload["model"], static_prefix)
+        limiter = get_limiter(payload["model"])
+        try:
+            async with limiter.alimit_call(estimate_tokens(json.dumps(payload["messages"]), payload.get("max_tokens"))):
+                with self._breaker(payload["model"]).guard(), self.pool.track(), self._track(payload) as call:
+                    async with self.pool.async_session().post(
+                        f"{self.api_base}/chat/completions",
+                        headers=self._headers(),
+                        json=payload
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.content:
+                            try:
+                                content = parse_sse_delta(line)
+                            except StreamDone:
+                                break
+                            if content:
+                                started = True
+                                call.output(content)
+                                yield content
         except Exception as e:
-            if backup_model:
-                yield from self.stream(prompt, backup_model, None, **kwargs)
-            raise e 
\ No newline at end of file
+            if not backup_model or started:
+                raise
+            logger.warning(f"OpenRouter stream failed, trying backup model: {str(e)}")
+            async for content in self.astream(
+                prompt, system_prompt, temperature, max_tokens, stop,
+                model=backup_model, static_prefix=static_prefix
+            ):
+                yield content
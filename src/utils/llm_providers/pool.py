@@ -0,0 +1,182 @@
+from typing import Optional, Dict, Any, List, Tuple
+from contextlib import contextmanager
+import asyncio
+import logging
+import threading
+import weakref
+import requests
+import aiohttp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying, shared by the sync and async paths. 429 is
+# deliberately absent: retrying a rate limit blindly only adds load, so
+# providers hand it to the per-model limiter instead (see ``limiter.py``)
+RETRY_STATUS_CODES = [408, 500, 502, 503, 504]
+
+class HTTPPool:
+    """Process-wide keep-alive HTTP client shared by every LLM provider
+
+    The sync side is a single ``requests.Session`` whose urllib3 pools are
+    sized from config; the async side is one ``aiohttp.ClientSession`` per
+    running event loop. Neither library speaks HTTP/2, so reuse comes from
+    keeping HTTP/1.1 connections alive across calls, agents and games.
+    """
+
+    def __init__(
+        self,
+        connections: int = 10,
+        maxsize: int = 32,
+        async_limit: int = 100,
+        async_limit_per_host: int = 32,
+        keepalive_timeout: float = 60,
+        timeout: float = 30,
+        max_retries: int = 3
+    ):
+        self.connections = connections
+        self.maxsize = maxsize
+        self.async_limit = async_limit
+        self.async_limit_per_host = async_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = self._setup_session()
+        # Keyed by id(loop), with a weak reference to tell a live loop from a dead one reusing its id
+        self._async_sessions: Dict[int, Tuple[weakref.ref, aiohttp.ClientSession]] = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._requests_total = 0
+
+    def _setup_session(self) -> requests.Session:
+        """Setup requests session with pooling and retry logic"""
+        session = requests.Session()
+
+        # Define retry strategy
+        retries = Retry(
+            total=self.max_retries,  # number of retries
+            backoff_factor=1,  # wait 1, 2, 4 seconds between retries
+            status_forcelist=RETRY_STATUS_CODES,  # retry on these status codes
+            allowed_methods=["POST"],
+            raise_on_status=False  # hand the final response back to the caller
+        )
+
+        adapter = HTTPAdapter(
+            pool_connections=self.connections,
+            pool_maxsize=self.maxsize,
+            max_retries=retries
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def _evict_stale_sessions(self):
+        """Drop sessions whose event loop is closed or gone; call with ``_lock`` held"""
+        for key, (loop_ref, session) in list(self._async_sessions.items()):
+            loop = loop_ref()
+            if loop is None or loop.is_closed() or session.closed:
+                del self._async_sessions[key]
+                if not session.closed:
+                    # Its loop cannot run ``close()`` any more; release the session without awaiting
+                    session.detach()
+
+    def async_session(self) -> aiohttp.ClientSession:
+        """Get the keep-alive aiohttp session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._evict_stale_sessions()
+            entry = self._async_sessions.get(id(loop))
+            session = entry[1] if entry else None
+            if session is None:
+                connector = aiohttp.TCPConnector(
+                    limit=self.async_limit,
+                    limit_per_host=self.async_limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                )
+                self._async_sessions[id(loop)] = (weakref.ref(loop), session)
+            return session
+
+    @contextmanager
+    def track(self):
+        """Count a request against the pool utilisation figures"""
+        with self._lock:
+            self._in_flight += 1
+            self._requests_total += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def prewarm(self, urls: List[str]):
+        """Open keep-alive connections to the given API hosts ahead of traffic"""
+        for url in urls:
+            try:
+                self.session.head(url, timeout=self.timeout)
+                logger.info(f"Pre-warmed connection to {url}")
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm {url}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Report pool configuration and utilisation"""
+        with self._lock:
+            async_acquired = sum(
+                len(getattr(s.connector, "_acquired", ()))
+                for _, s in self._async_sessions.values()
+                if not s.closed and s.connector is not None
+            )
+            return {
+                "sync_pool_connections": self.connections,
+                "sync_pool_maxsize": self.maxsize,
+                "async_limit": self.async_limit,
+                "async_limit_per_host": self.async_limit_per_host,
+                "async_sessions": len(self._async_sessions),
+                "async_connections_in_use": async_acquired,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "requests_total": self._requests_total,
+                "utilisation": self._in_flight / self.maxsize if self.maxsize else 0.0
+            }
+
+    async def aclose(self):
+        """Close every async session"""
+        with self._lock:
+            sessions = [session for _, session in self._async_sessions.values()]
+            self._async_sessions.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+    def close(self):
+        """Close the sync session"""
+        self.session.close()
+
+_pool: Optional[HTTPPool] = None
+_pool_lock = threading.Lock()
+
+def get_http_pool() -> HTTPPool:
+    """Get the process-wide HTTP pool, configured from ``network.pool``"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            network_config = Config().network_config
+            pool_config = network_config.get('pool', {}) or {}
+            _pool = HTTPPool(
+                connections=pool_config.get('connections', 10),
+                maxsize=pool_config.get('maxsize', 32),
+                async_limit=pool_config.get('async_limit', 100),
+                async_limit_per_host=pool_config.get('async_limit_per_host', 32),
+                keepalive_timeout=pool_config.get('keepalive_timeout', 60),
+                timeout=network_config.get('timeout', 30),
+                max_retries=network_config.get('max_retries', 3)
+            )
+        return _pool
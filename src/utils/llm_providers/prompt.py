@@ -0,0 +1,56 @@
+from typing import Optional, List
+import hashlib
+
+def join_prefix(static_prefix: Optional[str], prompt: str) -> str:
+    """Prepend a static prefix for providers without context caching"""
+    if not static_prefix:
+        return prompt
+    return f"{static_prefix}\n\n{prompt}"
+
+class Prompt:
+    """A prompt split into a static, cacheable prefix and a per-turn suffix"""
+
+    __slots__ = ("static", "dynamic")
+
+    def __init__(self, static: str, dynamic: str):
+        self.static = static
+        self.dynamic = dynamic
+
+    @property
+    def text(self) -> str:
+        """The full prompt as a single string"""
+        return join_prefix(self.static, self.dynamic)
+
+    @property
+    def prefix_key(self) -> str:
+        """Stable identifier of the static prefix"""
+        return hashlib.sha256(self.static.encode("utf-8")).hexdigest()
+
+    def __str__(self) -> str:
+        return self.text
+
+class PromptBuilder:
+    """Assemble a Prompt from static and dynamic sections
+
+    Static sections must not depend on the turn (round, coins, history),
+    otherwise the prefix changes every call and nothing can be cached.
+    """
+
+    def __init__(self):
+        self._static: List[str] = []
+        self._dynamic: List[str] = []
+
+    def static(self, text: str) -> "PromptBuilder":
+        """Append text that is identical across turns and games"""
+        if text:
+            self._static.append(text.strip("\n"))
+        return self
+
+    def dynamic(self, text: str) -> "PromptBuilder":
+        """Append text that changes from turn to turn"""
+        if text:
+            self._dynamic.append(text.strip("\n"))
+        return self
+
+    def build(self) -> Prompt:
+        return Prompt("\n\n".join(self._static), "\n\n".join(self._dynamic))
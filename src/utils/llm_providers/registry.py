@@ -0,0 +1,160 @@
+from typing import Optional, Dict, Any, Callable, Tuple
+import logging
+import threading
+from .base import BaseLLMProvider
+from .cache import with_cache
+from .pool import get_http_pool
+from .limiter import limiter_stats
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+ProviderBuilder = Callable[[Optional[str]], BaseLLMProvider]
+
+def _build_gemini(model: Optional[str]) -> BaseLLMProvider:
+    from .gemini import GeminiProvider
+    return GeminiProvider()
+
+def _build_fallback(model: Optional[str]) -> BaseLLMProvider:
+    from .fallback import FallbackProvider
+    return FallbackProvider()
+
+def _build_openrouter(model: Optional[str]) -> BaseLLMProvider:
+    from .openrouter import OpenRouterProvider
+    return OpenRouterProvider(model=model)
+
+def _build_deepseek(model: Optional[str]) -> BaseLLMProvider:
+    from .deepseek import DeepseekProvider
+    provider = DeepseekProvider()
+    if model:
+        provider.default_model = model
+    return provider
+
+def _build_stub(model: Optional[str]) -> BaseLLMProvider:
+    from .stub import StubProvider
+    return StubProvider(model=model or "stub")
+
+def _build_router(route: Optional[str]) -> BaseLLMProvider:
+    """Route ``llm.routing.routes[route]`` over its shared backend providers"""
+    from .routing import RoutingProvider
+    routing = Config().llm_config.get('routing', {}) or {}
+    backends = (routing.get('routes') or {}).get(route)
+    if not backends:
+        raise ValueError(f"Unknown LLM route: {route}")
+    return RoutingProvider(
+        route,
+        {
+            backend.get('name') or f"{backend['provider']}:{backend.get('model') or 'default'}":
+                _registry.get(backend['provider'], backend.get('model'))
+            for backend in backends
+        },
+        alpha=routing.get('ewma_alpha', 0.2),
+        exploration=routing.get('exploration', 0.1),
+        max_error_rate=routing.get('max_error_rate', 0.5),
+        error_penalty=routing.get('error_penalty', 4.0),
+        max_attempts=routing.get('max_attempts', 2)
+    )
+
+class ProviderRegistry:
+    """Hands out shared provider instances keyed by provider name and model
+
+    Providers are stateless apart from their HTTP client, which is the
+    process-wide pool, so one instance per (provider, model) can safely
+    serve every agent and game from any thread or event loop.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, ProviderBuilder] = {
+            'gemini': _build_gemini,
+            'fallback': _build_fallback,
+            'openrouter': _build_openrouter,
+            'deepseek': _build_deepseek,
+            'stub': _build_stub,
+            'router': _build_router,
+        }
+        # Wrappers whose backends are already cached
+        self._uncached = {'router'}
+        self._providers: Dict[Tuple[str, Optional[str]], BaseLLMProvider] = {}
+        self._lock = threading.RLock()  # a router builds its backends through get()
+
+    def register(self, name: str, builder: ProviderBuilder):
+        """Register (or replace) a provider builder"""
+        with self._lock:
+            self._builders[name] = builder
+            for key in [k for k in self._providers if k[0] == name]:
+                del self._providers[key]
+
+    def get(self, name: str, model: Optional[str] = None) -> BaseLLMProvider:
+        """Get the shared provider for ``name``/``model``, building it once"""
+        key = (name, model)
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is None:
+                if name not in self._builders:
+                    raise ValueError(f"Unknown LLM provider: {name}")
+                provider = self._builders[name](model)
+                if name not in self._uncached:
+                    provider = with_cache(provider, Config().llm_config.get('cache'))
+                self._providers[key] = provider
+                logger.info(f"Registered shared {name} provider (model: {model or 'default'})")
+            return provider
+
+    def resolve(self, name: str, model: Optional[str] = None) -> BaseLLMProvider:
+        """The router for ``model`` if ``llm.routing`` defines one, else ``get(name, model)``
+
+        Callers without a model use ``llm.routing.default_route``.
+        """
+        routing = Config().llm_config.get('routing', {}) or {}
+        route = model or routing.get('default_route')
+        if routing.get('enabled', False) and route in (routing.get('routes') or {}):
+            return self.get('router', route)
+        return self.get(name, model)
+
+    def prewarm(self):
+        """Build the configured providers and open their connections up front"""
+        llm_config = Config().llm_config
+        default_provider = llm_config.get('default_provider', 'openrouter')
+        for role, model_config in llm_config.get('models', {}).items():
+            try:
+                self.get(default_provider, model_config.get('default'))
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm {default_provider} provider for {role}: {str(e)}")
+
+        api_bases = set()
+        with self._lock:
+            for provider in self._providers.values():
+                inner = getattr(provider, 'provider', provider)
+                if getattr(inner, 'api_base', None):
+                    api_bases.add(inner.api_base)
+        get_http_pool().prewarm(sorted(api_bases))
+
+    def stats(self) -> Dict[str, Any]:
+        """Report registered providers, pool utilisation and rate limiters"""
+        with self._lock:
+            registered = list(self._providers.items())
+        providers = []
+        for (name, model), provider in registered:
+            entry = {"provider": name, "model": model, "class": type(provider).__name__}
+            inner = getattr(provider, 'provider', provider)
+            if hasattr(inner, 'stats'):
+                entry["stats"] = inner.stats()  # e.g. hedging metrics
+            providers.append(entry)
+        return {
+            "providers": providers,
+            "pool": get_http_pool().stats(),
+            "limiters": limiter_stats()
+        }
+
+_registry = ProviderRegistry()
+
+def get_registry() -> ProviderRegistry:
+    """Get the process-wide provider registry"""
+    return _registry
+
+def get_provider(name: str, model: Optional[str] = None) -> BaseLLMProvider:
+    """Shortcut for ``get_registry().get(name, model)``"""
+    return _registry.get(name, model)
+
+def get_routed_provider(name: str, model: Optional[str] = None) -> BaseLLMProvider:
+    """Shortcut for ``get_registry().resolve(name, model)``"""
+    return _registry.resolve(name, model)
@@ -0,0 +1,240 @@
+from typing import Optional, Dict, Any, List, Iterator, AsyncIterator
+import logging
+import random
+import threading
+import time
+from .base import BaseLLMProvider
+from .cache import is_error_response, provider_namespace
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Each backend is built with its own model, so per-call model overrides are dropped
+_ROUTED_OUT_KWARGS = ("model", "backup_model", "use_backup")
+
+class RouteBackend:
+    """EWMA latency and error rate of one backend behind a route"""
+
+    __slots__ = ("name", "provider", "latency", "error_rate", "samples", "failures", "inflight")
+
+    def __init__(self, name: str, provider: BaseLLMProvider):
+        self.name = name
+        self.provider = provider
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.samples = 0
+        self.failures = 0
+        self.inflight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "latency_ewma": round(self.latency, 4),
+            "error_rate_ewma": round(self.error_rate, 4),
+            "samples": self.samples,
+            "failures": self.failures,
+            "inflight": self.inflight
+        }
+
+class RoutingProvider(BaseLLMProvider):
+    """Sends each request to the currently fastest healthy backend of a route
+
+    A backend's score is its EWMA latency inflated by its EWMA error rate.
+    Backends that have never been measured are tried first; after that the
+    best score wins, except for an ``exploration`` share of requests which
+    are spread over all backends weighted by inverse score so a recovered
+    or newly fast path is noticed. Backends whose error rate exceeds
+    ``max_error_rate`` are skipped while a healthy one exists. A failed
+    call fails over to the next backend, up to ``max_attempts`` in total;
+    streams only fail over before their first chunk.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        backends: Dict[str, BaseLLMProvider],
+        alpha: float = 0.2,
+        exploration: float = 0.1,
+        max_error_rate: float = 0.5,
+        error_penalty: float = 4.0,
+        max_attempts: int = 2,
+        seed: Optional[int] = None
+    ):
+        if not backends:
+            raise ValueError(f"Route {name} has no backends")
+        self.name = name
+        self.backends = [RouteBackend(backend_name, provider) for backend_name, provider in backends.items()]
+        self.alpha = alpha
+        self.exploration = exploration
+        self.max_error_rate = max_error_rate
+        self.error_penalty = error_penalty
+        self.max_attempts = max(1, max_attempts)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.metrics = {"requests": 0, "explored": 0, "failovers": 0}
+
+    @property
+    def cache_namespace(self) -> str:
+        """Route name and the models of every backend that may answer"""
+        models = ",".join(provider_namespace(backend.provider) for backend in self.backends)
+        return f"{type(self).__name__}:{self.name}({models})"
+
+    @staticmethod
+    def get_config() -> Dict[str, Any]:
+        """Get provider configuration"""
+        return {"name": "router", "routes": list((Config().llm_config.get('routing', {}) or {}).get('routes', {}))}
+
+    def _score(self, backend: RouteBackend) -> float:
+        if backend.samples and backend.samples == backend.failures:
+            return float("inf")  # never answered, so no latency to go by
+        return backend.latency * (1 + self.error_penalty * backend.error_rate)
+
+    def _weights(self) -> List[float]:
+        """Exploration weights: inverse score, failing backends at the lowest weight"""
+        scores = [self._score(b) for b in self.backends]
+        weights = [1.0 / max(score, 1e-3) for score in scores]
+        floor = min((w for w, score in zip(weights, scores) if score != float("inf")), default=1.0)
+        return [floor if score == float("inf") else w for w, score in zip(weights, scores)]
+
+    def _order(self) -> List[RouteBackend]:
+        """Backends to try for one request, best first"""
+        with self._lock:
+            self.metrics["requests"] += 1
+            untried = [b for b in self.backends if b.samples == 0 and b.inflight == 0]
+            ranked = sorted(self.backends, key=lambda b: (b.error_rate > self.max_error_rate, self._score(b)))
+            if untried:
+                first = untried[0]
+            elif self._random.random() < self.exploration:
+                first = self._random.choices(self.backends, weights=self._weights())[0]
+                self.metrics["explored"] += 1
+            else:
+                first = ranked[0]
+            first.inflight += 1
+        return [first] + [b for b in ranked if b is not first]
+
+    def _observe(self, backend: RouteBackend, latency: Optional[float], failed: bool):
+        """Fold one call into the backend's EWMAs (failures do not count as fast)"""
+        with self._lock:
+            backend.inflight = max(0, backend.inflight - 1)
+            first = backend.samples == 0
+            backend.samples += 1
+            backend.error_rate = (1 - self.alpha) * backend.error_rate + self.alpha * float(failed)
+            if failed:
+                backend.failures += 1
+            elif first or backend.latency == 0.0:
+                backend.latency = latency
+            else:
+                backend.latency = (1 - self.alpha) * backend.latency + self.alpha * latency
+
+    def _start(self, backend: RouteBackend, attempt: int):
+        if attempt:
+            with self._lock:
+                backend.inflight += 1
+                self.metrics["failovers"] += 1
+            logger.info(f"Route {self.name} failing over to {backend.name}")
+
+    @staticmethod
+    def _routed(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in kwargs.items() if k not in _ROUTED_OUT_KWARGS}
+
+    def generate(self, *args, **kwargs) -> str:
+        """Generate on the best backend, failing over on errors"""
+        kwargs = self._routed(kwargs)
+        error: Optional[Exception] = None
+        for attempt, backend in enumerate(self._order()[:self.max_attempts]):
+            self._start(backend, attempt)
+            started = time.monotonic()
+            try:
+                result = backend.provider.generate(*args, **kwargs)
+            except Exception as e:
+                self._observe(backend, None, failed=True)
+                logger.warning(f"Route {self.name} backend {backend.name} failed: {str(e)}")
+                error = e
+                continue
+            failed = is_error_response(result)
+            self._observe(backend, time.monotonic() - started, failed)
+            if not failed or attempt + 1 >= min(self.max_attempts, len(self.backends)):
+                return result
+        raise error
+
+    async def agenerate(self, *args, **kwargs) -> str:
+        """Generate on the best backend without blocking the event loop"""
+        kwargs = self._routed(kwargs)
+        error: Optional[Exception] = None
+        for attempt, backend in enumerate(self._order()[:self.max_attempts]):
+            self._start(backend, attempt)
+            started = time.monotonic()
+            try:
+                result = await backend.provider.agenerate(*args, **kwargs)
+            except Exception as e:
+                self._observe(backend, None, failed=True)
+                logger.warning(f"Route {self.name} backend {backend.name} failed: {str(e)}")
+                error = e
+                continue
+            failed = is_error_response(result)
+            self._observe(backend, time.monotonic() - started, failed)
+            if not failed or attempt + 1 >= min(self.max_attempts, len(self.backends)):
+                return result
+        raise error
+
+    def stream(self, *args, **kwargs) -> Iterator[str]:
+        """Stream from the best backend; latency is measured to the first chunk"""
+        kwargs = self._routed(kwargs)
+        order = self._order()[:self.max_attempts]
+        for attempt, backend in enumerate(order):
+            self._start(backend, attempt)
+            started = time.monotonic()
+            first = True
+            try:
+                for chunk in backend.provider.stream(*args, **kwargs):
+                    if first:
+                        self._observe(backend, time.monotonic() - started, failed=False)
+                        first = False
+                    yield chunk
+            except Exception as e:
+                if not first:
+                    raise
+                self._observe(backend, None, failed=True)
+                if attempt + 1 >= len(order):
+                    raise
+                logger.warning(f"Route {self.name} backend {backend.name} stream failed: {str(e)}")
+                continue
+            if first:
+                self._observe(backend, time.monotonic() - started, failed=False)
+            return
+
+    async def astream(self, *args, **kwargs) -> AsyncIterator[str]:
+        """Stream from the best backend without blocking the event loop"""
+        kwargs = self._routed(kwargs)
+        order = self._order()[:self.max_attempts]
+        for attempt, backend in enumerate(order):
+            self._start(backend, attempt)
+            started = time.monotonic()
+            first = True
+            try:
+                async for chunk in backend.provider.astream(*args, **kwargs):
+                    if first:
+                        self._observe(backend, time.monotonic() - started, failed=False)
+                        first = False
+                    yield chunk
+            except Exception as e:
+                if not first:
+                    raise
+                self._observe(backend, None, failed=True)
+                if attempt + 1 >= len(order):
+                    raise
+                logger.warning(f"Route {self.name} backend {backend.name} stream failed: {str(e)}")
+                continue
+            if first:
+                self._observe(backend, time.monotonic() - started, failed=False)
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-backend EWMAs and how often the router explored or failed over"""
+        with self._lock:
+            return {
+                **self.metrics,
+                "preferred": min(
+                    self.backends, key=lambda b: (b.error_rate > self.max_error_rate, self._score(b))
+                ).name,
+                "backends": {b.name: b.stats() for b in self.backends}
+            }
@@ -0,0 +1,164 @@
+from typing import Dict, Any, Optional
+import copy
+import json
+
+# Player action: public message plus coin transfers, with optional private thinking
+ACTION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "thinking": {"type": "string"},
+        "message": {"type": "string"},
+        "transfers": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "recipient": {"type": "string"},
+                    "amount": {"type": "integer"}
+                },
+                "required": ["recipient", "amount"]
+            }
+        }
+    },
+    "required": ["message", "transfers"]
+}
+
+# Combined turn: private analysis and the public move in one response
+TURN_SCHEMA: Dict[str, Any] = {**ACTION_SCHEMA, "required": ["thinking", "message", "transfers"]}
+
+_BILINGUAL = {
+    "type": "object",
+    "properties": {
+        "en": {"type": "string"},
+        "zh": {"type": "string"}
+    },
+    "required": ["en", "zh"]
+}
+
+# Coordinator round summary
+SUMMARY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "round_summary": {
+            "type": "object",
+            "properties": {
+                "highlights": _BILINGUAL,
+                "alliances": _BILINGUAL,
+                "impact": _BILINGUAL,
+                "next_round": _BILINGUAL
+            },
+            "required": ["highlights", "alliances", "impact", "next_round"]
+        }
+    },
+    "required": ["round_summary"]
+}
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool
+}
+
+def matches_schema(data: Any, schema: Dict[str, Any]) -> bool:
+    """Check data against the JSON Schema subset used here (type/properties/required/items)"""
+    types = schema.get("type")
+    if types is not None:
+        types = types if isinstance(types, list) else [types]
+        if data is None:
+            return "null" in types
+        expected = tuple(t for name in types if name != "null" for t in (
+            _TYPES[name] if isinstance(_TYPES[name], tuple) else (_TYPES[name],)
+        ))
+        # bool is an int subclass but never a valid number here
+        if isinstance(data, bool) and bool not in expected:
+            return False
+        if not isinstance(data, expected):
+            return False
+    if isinstance(data, dict):
+        if any(key not in data for key in schema.get("required", [])):
+            return False
+        properties = schema.get("properties", {})
+        return all(matches_schema(data[key], sub) for key, sub in properties.items() if key in data)
+    if isinstance(data, list) and "items" in schema:
+        return all(matches_schema(item, schema["items"]) for item in data)
+    return True
+
+def parse_structured(text: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a structured-output response, raising ValueError if it does not match"""
+    if "```json" in text:
+        text = text.split("```json")[-1].split("```")[0]
+    data = _drop_optional_nulls(json.loads(text), schema)
+    if not matches_schema(data, schema):
+        raise ValueError(f"Response does not match schema: {text[:200]}")
+    return data
+
+def _drop_optional_nulls(data: Any, schema: Dict[str, Any]) -> Any:
+    """Remove the nulls strict mode emits for optional fields"""
+    if isinstance(data, dict) and "properties" in schema:
+        required = schema.get("required", [])
+        return {
+            key: _drop_optional_nulls(value, schema["properties"].get(key, {}))
+            for key, value in data.items()
+            if value is not None or key in required
+        }
+    if isinstance(data, list) and "items" in schema:
+        return [_drop_optional_nulls(item, schema["items"]) for item in data]
+    return data
+
+def strict_json_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI-style strict variant: closed objects, optional fields made nullable"""
+    schema = copy.deepcopy(schema)
+    if schema.get("type") == "object":
+        properties = schema.get("properties", {})
+        required = set(schema.get("required", []))
+        for key, sub in properties.items():
+            properties[key] = strict_json_schema(sub)
+            if key not in required:
+                properties[key]["type"] = [properties[key]["type"], "null"]
+        schema["required"] = list(properties)
+        schema["additionalProperties"] = False
+    elif schema.get("type") == "array" and "items" in schema:
+        schema["items"] = strict_json_schema(schema["items"])
+    return schema
+
+def gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Gemini response_schema variant (OpenAPI subset: upper-case types, nullable flag)"""
+    converted: Dict[str, Any] = {}
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        converted["nullable"] = "null" in kind
+        kind = next(t for t in kind if t != "null")
+    if kind:
+        converted["type"] = kind.upper()
+    if "properties" in schema:
+        converted["properties"] = {key: gemini_schema(sub) for key, sub in schema["properties"].items()}
+    if "required" in schema:
+        converted["required"] = list(schema["required"])
+    if "items" in schema:
+        converted["items"] = gemini_schema(schema["items"])
+    return converted
+
+def example_for(schema: Dict[str, Any]) -> Any:
+    """Smallest value satisfying a schema (used by the offline stub provider)"""
+    kind = schema.get("type")
+    kind = kind[0] if isinstance(kind, list) else kind
+    if kind == "object":
+        return {key: example_for(schema["properties"][key]) for key in schema.get("required", [])}
+    if kind == "array":
+        return []
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    return "stub"
+
+def response_schema_name(schema: Optional[Dict[str, Any]]) -> str:
+    """Name for a schema in provider requests"""
+    if schema is SUMMARY_SCHEMA:
+        return "round_summary"
+    if schema is TURN_SCHEMA:
+        return "player_turn"
+    return "player_action" if schema is ACTION_SCHEMA else "response"
@@ -0,0 +1,32 @@
+from typing import Optional, Union
+import json
+
+SSE_DONE = "[DONE]"
+
+class StreamDone(Exception):
+    """Raised when an OpenAI-style stream sends its ``[DONE]`` sentinel"""
+
+def parse_sse_delta(line: Union[str, bytes]) -> Optional[str]:
+    """Extract the content delta from one line of a chat completion stream
+
+    OpenAI-compatible APIs (OpenRouter, Deepseek) send ``data: {json}``
+    lines, ``:`` comment keep-alives and a final ``data: [DONE]``.
+    Returns ``None`` for lines that carry no content.
+    """
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    line = line.strip()
+    if not line or line.startswith(":") or not line.startswith("data:"):
+        return None
+
+    data = line[len("data:"):].strip()
+    if data == SSE_DONE:
+        raise StreamDone()
+
+    chunk = json.loads(data)
+    if chunk.get("error"):
+        raise RuntimeError(f"Stream error: {chunk['error']}")
+    choices = chunk.get("choices") or []
+    if choices:
+        return choices[0].get("delta", {}).get("content") or None
+    return None
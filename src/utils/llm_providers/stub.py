@@ -0,0 +1,103 @@
+from typing import Optional, Dict, Any
+import itertools
+import json
+import threading
+from .base import BaseLLMProvider
+from .context_cache import ContextCacheManager
+from .limiter import estimate_tokens
+from .schemas import example_for
+from .metrics import MetricsRegistry
+
+class StubProvider(BaseLLMProvider):
+    """Offline provider with canned replies and simulated context caching
+
+    Useful for tests and demos without API keys: static prefixes are
+    "registered" with an in-process ContextCacheManager exactly as a real
+    provider would, and the input tokens billed vs. served from cache are
+    counted so the savings can be checked. Calls are recorded in
+    ``metrics`` when a MetricsRegistry is given.
+    """
+
+    def __init__(
+        self,
+        model: str = "stub",
+        response: Optional[str] = None,
+        min_prefix_tokens: int = 0,
+        context_cache: Optional[ContextCacheManager] = None,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        self.model = model
+        self.metrics = metrics
+        self.response = response
+        self.min_prefix_tokens = min_prefix_tokens
+        self.context_cache = context_cache or ContextCacheManager()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0  # billed at the full rate
+        self.cached_tokens = 0  # served from cached context
+
+    def _register(self, prefix: str, ttl_seconds: float):
+        return f"stub-cache/{next(self._ids)}", None
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        stop: Optional[list] = None,
+        static_prefix: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> str:
+        """Return the canned reply, accounting for cached prefix tokens
+
+        With ``response_schema`` the reply is the minimal conforming object.
+        """
+        billed = estimate_tokens(prompt) + estimate_tokens(system_prompt)
+        cached = 0
+        if static_prefix:
+            handle = self.context_cache.lookup(
+                "stub", self.model, static_prefix, self._register, self.min_prefix_tokens
+            )
+            if handle and handle.uses:
+                cached = handle.tokens
+            else:
+                billed += estimate_tokens(static_prefix)
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += billed
+            self.cached_tokens += cached
+            call = self.calls
+        reply = self._reply(call, response_schema)
+        if self.metrics:
+            with self.metrics.track("stub", self.model, prompt) as record:
+                record.usage(billed + cached, None)
+                record.complete(reply)
+        return reply
+
+    def _reply(self, call: int, response_schema: Optional[Dict[str, Any]]) -> str:
+        if self.response is not None:
+            return self.response
+        if response_schema:
+            reply = example_for(response_schema)
+            if "message" in reply:
+                reply["message"] = f"Stub reply #{call}"
+            return json.dumps(reply)
+        return json.dumps({"message": f"Stub reply #{call}", "transfers": []})
+
+    def stats(self) -> Dict[str, Any]:
+        """Billed and cached input tokens plus context cache metrics"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "input_tokens": self.input_tokens,
+                "cached_tokens": self.cached_tokens,
+                "context_cache": self.context_cache.stats()
+            }
+
+    @staticmethod
+    def get_config() -> Dict[str, Any]:
+        """Get provider configuration"""
+        return {"name": "stub", "models": {"stub": {"context_length": 1000000}}}
@@ -0,0 +1,342 @@
+"""Stand-in LLM HTTP server for offline load testing
+
+Speaks the OpenAI-style ``/v1/chat/completions`` protocol used by
+OpenRouterProvider and DeepseekProvider, plus Gemini's
+``/v1beta/models/{model}:generateContent`` REST API, and answers with valid
+merchants action / thinking / summary replies. Latency, error rate, 429
+bursts and stream pacing are configurable, so throughput and connection
+pooling can be measured end-to-end without spending real quota.
+
+Point the providers at it with::
+
+    OPENROUTER_API_BASE=http://127.0.0.1:8001/v1
+    DEEPSEEK_API_BASE=http://127.0.0.1:8001/v1
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8001
+
+(any non-empty API keys will do).
+"""
+from typing import Optional, Dict, Any, List
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from aiohttp import web
+from .limiter import estimate_tokens
+from .schemas import SUMMARY_SCHEMA, example_for
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+class StubBehaviour:
+    """Latency and fault model for the stub server"""
+
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 100.0,
+        distribution: str = "lognormal",
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        throttle_burst: int = 5,
+        retry_after: float = 1.0,
+        chunk_delay_ms: float = 20.0,
+        seed: Optional[int] = None
+    ):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.throttle_burst = throttle_burst
+        self.retry_after = retry_after
+        self.chunk_delay_ms = chunk_delay_ms
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._throttled_left = 0
+
+    def latency(self) -> float:
+        """Sample a response latency in seconds"""
+        with self._lock:
+            if self.distribution == "fixed":
+                ms = self.latency_ms
+            elif self.distribution == "uniform":
+                ms = self._random.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+            elif self.distribution == "normal":
+                ms = self._random.gauss(self.latency_ms, self.jitter_ms)
+            else:
+                # Long right tail around the median, like real model latencies
+                sigma = self.jitter_ms / self.latency_ms if self.latency_ms else 0.0
+                ms = self.latency_ms * self._random.lognormvariate(0.0, sigma)
+        return max(ms, 0.0) / 1000.0
+
+    def fault(self) -> Optional[int]:
+        """HTTP status to fail this request with, or None to serve it
+
+        A throttle event starts a burst: the next ``throttle_burst``
+        requests all get 429, as a provider would while over quota.
+        """
+        with self._lock:
+            if self._throttled_left > 0:
+                self._throttled_left -= 1
+                return 429
+            if self.throttle_rate and self._random.random() < self.throttle_rate:
+                self._throttled_left = self.throttle_burst - 1
+                return 429
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self._random.choice([500, 502, 503])
+        return None
+
+def reply_for(prompt: str, json_mode: bool = False, schema: Optional[Dict[str, Any]] = None, n: int = 0) -> str:
+    """Plausible reply for a merchants prompt: summary, action JSON or thinking prose"""
+    if schema:
+        reply = example_for(schema)
+        if isinstance(reply, dict) and "message" in reply:
+            reply["message"] = f"Stub offer #{n}"
+        return json.dumps(reply)
+    if "round_summary" in prompt:
+        return json.dumps(example_for(SUMMARY_SCHEMA))
+    if json_mode or ('"message"' in prompt and '"transfers"' in prompt):
+        return json.dumps({
+            "thinking": f"Stub analysis #{n}",
+            "message": f"Stub offer #{n}",
+            "transfers": []
+        })
+    return (
+        f"Stub analysis #{n}: the other merchant is cautious, so I will "
+        "offer a small gesture of trust and keep most of my coins."
+    )
+
+def _chunks(text: str, size: int = 16) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+def _message_text(messages: List[Dict[str, Any]]) -> str:
+    """Flatten chat messages, including multi-part (cache_control) content"""
+    texts = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            texts.extend(part.get("text", "") for part in content if isinstance(part, dict))
+        else:
+            texts.append(str(content))
+    return "\n".join(texts)
+
+def _lower_types(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Gemini sends upper-case OpenAPI types"""
+    converted = dict(schema)
+    if isinstance(converted.get("type"), str):
+        converted["type"] = converted["type"].lower()
+    if "properties" in converted:
+        converted["properties"] = {key: _lower_types(sub) for key, sub in converted["properties"].items()}
+    if "items" in converted:
+        converted["items"] = _lower_types(converted["items"])
+    return converted
+
+class StubLLMServer:
+    """aiohttp application serving canned replies under a StubBehaviour"""
+
+    def __init__(self, behaviour: Optional[StubBehaviour] = None):
+        self.behaviour = behaviour or StubBehaviour()
+        self._ids = itertools.count(1)
+        self.started_at = time.time()
+        self.metrics: Dict[str, Any] = {
+            "requests": 0,
+            "streams": 0,
+            "statuses": {},
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.chat_completions)
+        app.router.add_post("/chat/completions", self.chat_completions)
+        app.router.add_post("/v1beta/models/{target}", self.gemini)
+        app.router.add_post("/v1beta/cachedContents", self.gemini_cached_content)
+        app.router.add_get("/stats", self.stats)
+        app.router.add_get("/health", self.health)
+        return app
+
+    def _count(self, status: int, prompt_tokens: int = 0, completion_tokens: int = 0):
+        statuses = self.metrics["statuses"]
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+        self.metrics["prompt_tokens"] += prompt_tokens
+        self.metrics["completion_tokens"] += completion_tokens
+
+    async def _admit(self) -> Optional[web.Response]:
+        """Simulate latency and injected faults; returns an error response if faulted"""
+        self.metrics["requests"] += 1
+        self.metrics["in_flight"] += 1
+        self.metrics["max_in_flight"] = max(self.metrics["max_in_flight"], self.metrics["in_flight"])
+        status = self.behaviour.fault()
+        if status == 429:
+            self.metrics["in_flight"] -= 1
+            self._count(status)
+            return web.json_response(
+                {"error": {"code": 429, "message": "Rate limit exceeded (stub)"}},
+                status=429,
+                headers={"Retry-After": str(self.behaviour.retry_after)}
+            )
+        await asyncio.sleep(self.behaviour.latency())
+        if status:
+            self.metrics["in_flight"] -= 1
+            self._count(status)
+            return web.json_response({"error": {"code": status, "message": "Injected failure (stub)"}}, status=status)
+        return None
+
+    async def _stream(self, request: web.Request, text: str, encode) -> web.StreamResponse:
+        """Send ``text`` as server-sent events, one chunk per event"""
+        self.metrics["streams"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+        for chunk in _chunks(text):
+            await response.write(f"data: {json.dumps(encode(chunk))}\n\n".encode("utf-8"))
+            await asyncio.sleep(self.behaviour.chunk_delay_ms / 1000.0)
+        return response
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        error = await self._admit()
+        if error is not None:
+            return error
+        try:
+            prompt = _message_text(body.get("messages", []))
+            response_format = body.get("response_format") or {}
+            schema = (response_format.get("json_schema") or {}).get("schema")
+            n = next(self._ids)
+            text = reply_for(prompt, json_mode=response_format.get("type") == "json_object", schema=schema, n=n)
+            model = body.get("model", "stub")
+            prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+            self._count(200, prompt_tokens, completion_tokens)
+
+            if body.get("stream"):
+                response = await self._stream(
+                    request, text,
+                    lambda chunk: {"id": f"stub-{n}", "model": model, "choices": [{"index": 0, "delta": {"content": chunk}}]}
+                )
+                await response.write(b"data: [DONE]\n\n")
+                return response
+            return web.json_response({
+                "id": f"stub-{n}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+        finally:
+            self.metrics["in_flight"] -= 1
+
+    async def gemini(self, request: web.Request) -> web.StreamResponse:
+        model, _, method = request.match_info["target"].partition(":")
+        if method not in ("generateContent", "streamGenerateContent"):
+            return web.json_response({"error": {"code": 404, "message": f"Unknown method: {method}"}}, status=404)
+        body = await request.json()
+        error = await self._admit()
+        if error is not None:
+            return error
+        try:
+            prompt = "\n".join(
+                part.get("text", "")
+                for content in body.get("contents", [])
+                for part in content.get("parts", [])
+            )
+            config = body.get("generationConfig") or body.get("generation_config") or {}
+            schema = config.get("responseSchema") or config.get("response_schema")
+            mime_type = config.get("responseMimeType") or config.get("response_mime_type")
+            n = next(self._ids)
+            text = reply_for(
+                prompt,
+                json_mode=mime_type == "application/json",
+                schema=_lower_types(schema) if schema else None,
+                n=n
+            )
+            prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+            self._count(200, prompt_tokens, completion_tokens)
+            usage = {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": completion_tokens,
+                "totalTokenCount": prompt_tokens + completion_tokens
+            }
+
+            def candidate(chunk: str) -> Dict[str, Any]:
+                return {
+                    "candidates": [{
+                        "content": {"role": "model", "parts": [{"text": chunk}]},
+                        "finishReason": "STOP",
+                        "index": 0
+                    }],
+                    "usageMetadata": usage,
+                    "modelVersion": model
+                }
+
+            if method == "streamGenerateContent":
+                return await self._stream(request, text, candidate)
+            return web.json_response(candidate(text))
+        finally:
+            self.metrics["in_flight"] -= 1
+
+    async def gemini_cached_content(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({
+            "name": f"cachedContents/stub-{next(self._ids)}",
+            "model": body.get("model", "models/stub"),
+            "usageMetadata": {"totalTokenCount": 0}
+        })
+
+    async def stats(self, request: web.Request) -> web.Response:
+        uptime = time.time() - self.started_at
+        return web.json_response({
+            **self.metrics,
+            "uptime_seconds": round(uptime, 3),
+            "requests_per_second": round(self.metrics["requests"] / uptime, 3) if uptime else 0.0
+        })
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+def main(argv: Optional[List[str]] = None):
+    """Run the stub server from the command line"""
+    parser = argparse.ArgumentParser(description="Stand-in LLM server for offline load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 5xx")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="chance a request starts a 429 burst")
+    parser.add_argument("--throttle-burst", type=int, default=5, help="requests per 429 burst")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    behaviour = StubBehaviour(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        throttle_burst=args.throttle_burst,
+        retry_after=args.retry_after,
+        chunk_delay_ms=args.chunk_delay_ms,
+        seed=args.seed
+    )
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Stub LLM server on http://{args.host}:{args.port} ({args.distribution} {args.latency_ms}ms)")
+    web.run_app(StubLLMServer(behaviour).app(), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from typing import Optional, Dict, Any, List, Pattern
+from collections import deque
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Secrets that must never reach a trace file
+DEFAULT_REDACT_PATTERNS = [
+    r"sk-[A-Za-z0-9_\-]{16,}",  # OpenAI / OpenRouter keys
+    r"AIza[0-9A-Za-z_\-]{30,}",  # Google API keys
+    r"Bearer\s+[A-Za-z0-9._\-]{16,}"
+]
+
+class TraceRecorder:
+    """Sampled capture of LLM prompt/response payloads, off the request path
+
+    ``record`` only makes the sampling decision and enqueues references;
+    truncation, redaction, the in-memory ring buffer and the JSONL file are
+    handled by a background writer thread. When the queue is full, traces
+    are dropped (and counted) rather than blocking a game.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.1,
+        always_sample_errors: bool = True,
+        max_chars: int = 4000,
+        buffer_size: int = 1000,
+        queue_size: int = 10000,
+        path: Optional[str] = None,
+        redact_patterns: Optional[List[str]] = None
+    ):
+        self.sample_rate = sample_rate
+        self.always_sample_errors = always_sample_errors
+        self.max_chars = max_chars
+        self.path = path
+        self._redact: List[Pattern] = [
+            re.compile(p) for p in (DEFAULT_REDACT_PATTERNS if redact_patterns is None else redact_patterns)
+        ]
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self.metrics = {"recorded": 0, "sampled_out": 0, "dropped": 0, "written": 0, "write_errors": 0}
+
+    def _count(self, metric: str):
+        """Bump a counter; callers' threads and the writer thread all update them"""
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _sampled(self, failed: bool) -> bool:
+        if failed and self.always_sample_errors:
+            return True
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt: Optional[str],
+        response: Optional[str],
+        game_id: Optional[str] = None,
+        phase: Optional[str] = None,
+        latency: Optional[float] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """Queue one call for tracing; returns whether it was sampled"""
+        if not self._sampled(error is not None):
+            self._count("sampled_out")
+            return False
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((time.time(), provider, model, game_id, phase, prompt, response, latency, error))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("recorded")
+        return True
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._drain, name="llm-trace-writer", daemon=True)
+                    self._writer.start()
+
+    def _clean(self, text: Optional[str]) -> Optional[str]:
+        """Redact secrets and cap payload size"""
+        if text is None:
+            return None
+        for pattern in self._redact:
+            text = pattern.sub("[REDACTED]", text)
+        if len(text) > self.max_chars:
+            text = f"{text[:self.max_chars]}... [{len(text) - self.max_chars} chars truncated]"
+        return text
+
+    def _build(self, item: tuple) -> Dict[str, Any]:
+        ts, provider, model, game_id, phase, prompt, response, latency, error = item
+        return {
+            "timestamp": datetime.fromtimestamp(ts).isoformat(),
+            "provider": provider,
+            "model": model,
+            "game_id": game_id,
+            "phase": phase,
+            "latency": round(latency, 4) if latency is not None else None,
+            "prompt": self._clean(prompt),
+            "response": self._clean(response),
+            "error": self._clean(error)
+        }
+
+    def _drain(self):
+        """Background writer: build traces, keep them in the ring buffer, append to JSONL"""
+        handle = None
+        while True:
+            item = self._queue.get()
+            try:
+                trace = self._build(item)
+                with self._lock:
+                    self._buffer.append(trace)
+                if self.path:
+                    if handle is None:
+                        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                        handle = open(self.path, "a", encoding="utf-8")
+                    handle.write(json.dumps(trace, ensure_ascii=False) + "\n")
+                    if self._queue.empty():
+                        handle.flush()
+                self._count("written")
+            except Exception as e:
+                self._count("write_errors")
+                logger.warning(f"Failed to write LLM trace: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued trace has been processed"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def recent(self, game_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent traces, newest last, optionally for one game"""
+        with self._lock:
+            traces = [t for t in self._buffer if game_id is None or t["game_id"] == game_id]
+        return traces[-limit:] if limit else traces
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "buffered": len(self._buffer),
+                "queued": self._queue.qsize(),
+                **self.metrics
+            }
+
+_recorder: Optional[TraceRecorder] = None
+_recorder_lock = threading.Lock()
+
+def get_trace_recorder() -> Optional[TraceRecorder]:
+    """Get the process-wide trace recorder from ``llm.tracing`` (None when disabled)"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            settings = Config().llm_config.get('tracing', {}) or {}
+            if not settings.get('enabled', False):
+                return None
+            _recorder = TraceRecorder(
+                sample_rate=settings.get('sample_rate', 0.1),
+                always_sample_errors=settings.get('always_sample_errors', True),
+                max_chars=settings.get('max_chars', 4000),
+                buffer_size=settings.get('buffer_size', 1000),
+                queue_size=settings.get('queue_size', 10000),
+                path=settings.get('path'),
+                redact_patterns=settings.get('redact_patterns')
+            )
+        return _recorder
@@ -24,25 +24,27 @@ class GameLogger:
         self.logger = logging.getLogger(f"game_{log_id}")
         self.logger.setLevel(logging.DEBUG)
         
-        # Create file handler
-        log_file = os.path.join(log_dir, f"{log_id}.log")
-        fh = logging.FileHandler(log_file)
-        fh.setLevel(logging.DEBUG)
-        
-        # Create console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        fh.setFormatter(formatter)
-        ch.setFormatter(formatter)
+        # Loggers are shared by name; only the first GameLogger for an id attaches handlers
+        if not self.logger.handlers:
+            # Create file handler
+            log_file = os.path.join(log_dir, f"{log_id}.log")
+            fh = logging.FileHandler(log_file)
+            fh.setLevel(logging.DEBUG)
+        
+            # Create console handler
+            ch = logging.StreamHandler()
+            ch.setLevel(logging.INFO)
+        
+            # Create formatter
+            formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            fh.setFormatter(formatter)
+            ch.setFormatter(formatter)
         
-        # Add handlers
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
+            # Add handlers
+            self.logger.addHandler(fh)
+            self.logger.addHandler(ch)
         
         self.logger.info(f"Game logger initialized with ID: {log_id}")
         
@@ -0,0 +1,53 @@
+import json
+import logging
+from src.spaces.merchants_multi.agents.players import ArenaPlayer
+from src.spaces.merchants_multi.runtime.negotiation import NegotiationScene
+from src.utils.llm_providers.stub import StubProvider
+
+class PromptRecorder(StubProvider):
+    """Stub that gives coins to the first neighbour listed in the prompt and records prompt sizes"""
+
+    def __init__(self):
+        super().__init__()
+        self.sizes = []
+
+    def generate(self, prompt, *args, **kwargs):
+        self.sizes.append(len(prompt))
+        super().generate(prompt, *args, **kwargs)
+        neighbours = prompt.split("Your neighbours' coins: ")[1].split("\n")[0]
+        recipient = neighbours.split("'")[1]
+        return json.dumps({"message": "deal?", "transfers": [{"recipient": recipient, "amount": 1}]})
+
+def arena(size: int, provider: StubProvider) -> NegotiationScene:
+    scene = NegotiationScene(
+        max_rounds=2,
+        logger=logging.getLogger("test_arena"),
+        players=[f"Merchant {i + 1}" for i in range(size)],
+        llm_provider=StubProvider()
+    )
+    for player in scene.players.values():
+        player.llm_provider = provider
+        player.llm = provider
+    scene.coordinator.llm = StubProvider()
+    return scene
+
+def test_arena_builds_n_players_with_ring_neighbourhoods():
+    scene = arena(20, StubProvider())
+    assert scene.arena and len(scene.players) == 20
+    assert all(isinstance(p, ArenaPlayer) for p in scene.players.values())
+    assert scene.neighbours["Merchant 1"] == ["Merchant 20", "Merchant 2", "Merchant 19", "Merchant 3"]
+
+def test_prompt_size_does_not_grow_with_market_size():
+    small, large = PromptRecorder(), PromptRecorder()
+    arena(6, small).run_scene()
+    result = arena(40, large).run_scene()
+    # Only the seat count and leader names differ; no per-player history is added
+    assert max(large.sizes) - max(small.sizes) < 40
+    assert sum(result["final_statuses"].values()) == 40 * 10
+
+def test_transfers_outside_the_neighbourhood_are_rejected():
+    scene = arena(10, StubProvider())
+    context, statuses = scene._turn_view("Merchant 1")
+    assert "Merchant 6" not in statuses and "Your rank" in context
+    valid, _ = scene.coordinator.validate_transfer("Merchant 1", "Merchant 6", 1, statuses)
+    assert not valid
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+from src.utils.llm_providers.base import BaseLLMProvider
+
+class EchoProvider(BaseLLMProvider):
+    """Blocking provider that records which thread served the call"""
+
+    def __init__(self):
+        self.threads = []
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=None, stop=None):
+        self.threads.append(threading.get_ident())
+        return f"echo: {prompt}"
+
+    @staticmethod
+    def get_config():
+        return {"name": "echo", "models": {}}
+
+def test_default_agenerate_runs_off_the_event_loop():
+    """The default agenerate delegates to generate in a worker thread"""
+    provider = EchoProvider()
+
+    async def run():
+        loop_thread = threading.get_ident()
+        result = await provider.agenerate("hello", temperature=0.1)
+        return loop_thread, result
+
+    loop_thread, result = asyncio.run(run())
+    assert result == "echo: hello"
+    assert provider.threads and provider.threads[0] != loop_thread
+
+def test_agenerate_calls_run_concurrently():
+    """Several async calls can be gathered on one loop"""
+    provider = EchoProvider()
+
+    async def run():
+        return await asyncio.gather(*(provider.agenerate(f"p{i}") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert results == [f"echo: p{i}" for i in range(5)]
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+import src.api  # noqa: F401  (resolves the router <-> runtime import cycle)
+from src.api.events.manager import GameEventManager
+from src.core.checkpoint import CheckpointStore
+from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+from src.utils.llm_providers.stub import StubProvider
+
+class CrashingStub(StubProvider):
+    """Stub that dies on call number ``crash_on``, like a worker going away"""
+
+    def __init__(self, crash_on: int):
+        super().__init__()
+        self.crash_on = crash_on
+
+    def generate(self, *args, **kwargs):
+        if self.calls + 1 == self.crash_on:
+            raise KeyboardInterrupt("worker died")
+        return super().generate(*args, **kwargs)
+
+def test_resume_continues_after_last_completed_turn(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    manager = GameEventManager("g1")
+    recordings = CheckpointStore(str(tmp_path / "recordings"))
+    # Each turn makes two calls: die during round 2, player 2's turn
+    runtime = NegotiationRuntime(
+        event_manager=manager,
+        concurrent_turns=False,
+        checkpoints=store,
+        recordings=recordings,
+        llm_provider=CrashingStub(crash_on=7)
+    )
+    runtime.set_strategy("Always cooperate")
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(runtime.run_game())
+
+    checkpoint = store.load("g1")
+    assert (checkpoint["round"], checkpoint["turns_done"]) == (2, 1)
+    assert checkpoint["player1_strategy"] == "Always cooperate"
+
+    resumed_manager = GameEventManager("g1", history=checkpoint["events"])
+    provider = StubProvider()
+    resumed = NegotiationRuntime.from_checkpoint(
+        checkpoint, event_manager=resumed_manager, checkpoints=store, recordings=recordings, llm_provider=provider
+    )
+    asyncio.run(resumed.run_game())
+
+    assert resumed.state == "complete"
+    # Only the unfinished turn of round 2 and the later rounds are played again
+    assert provider.calls == 2 * (1 + 2 * (resumed.max_rounds - 2))
+    names = [e["name"] for e in resumed_manager.get_event_history()]
+    assert names.count("round_started") == resumed.max_rounds
+    assert "game_resumed" in names and names[-1] == "game_ended"
+    offsets = [e["playback_offset"] for e in resumed_manager.get_event_history()]
+    assert offsets == sorted(offsets)
+    assert store.load("g1") is None
+
+def test_store_rejects_path_like_ids(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.save("../escape", {})
+    store.save("g2", {"round": 3})
+    assert store.list_games() == ["g2"]
+
+def test_coordinator_narrative_is_written_in_background_and_checkpointed(tmp_path):
+    runtime = NegotiationRuntime(
+        concurrent_turns=False, checkpoints=CheckpointStore(str(tmp_path)), llm_provider=StubProvider()
+    )
+    runtime.memory = type(runtime.memory)(keep_rounds=1)
+    runtime.memory_settings = {"keep_rounds": 1, "max_context_tokens": None}
+    runtime.llm_summary = True
+    for r in (1, 2, 3):
+        runtime.memory.add_transfer("Marco Polo", "Trader Joe", r, round_num=r)
+
+    async def summarize():
+        runtime._schedule_history_summary()
+        await runtime._summary_task
+    asyncio.run(summarize())
+
+    assert runtime.memory.narrative_through == 2
+    assert "Stub reply" in runtime.memory.get_recent_context()
+    restored = NegotiationRuntime.from_checkpoint(
+        runtime.snapshot(), checkpoints=CheckpointStore(str(tmp_path)), llm_provider=StubProvider()
+    )
+    assert restored.memory.narrative == runtime.memory.narrative
+    assert restored.memory.folded_through == 2
+
+def test_checkpoint_leaves_out_streamed_thinking_chunks(tmp_path):
+    manager = GameEventManager("g4")
+    runtime = NegotiationRuntime(
+        event_manager=manager, checkpoints=CheckpointStore(str(tmp_path)), llm_provider=StubProvider()
+    )
+
+    async def emit_and_save():
+        await manager.emit("player", "player_thinking_delta", {"player": "Marco Polo", "delta": "Hm"})
+        await manager.emit("player", "player_thinking", {"player": "Marco Polo", "content": "Hm"})
+        await runtime._checkpoint()
+    asyncio.run(emit_and_save())
+
+    assert [e["name"] for e in runtime.checkpoints.load("g4")["events"]] == ["player_thinking"]
+
+def test_none_turns_persistence_off():
+    runtime = NegotiationRuntime(llm_provider=StubProvider(), checkpoints=None, recordings=None)
+    assert runtime.checkpoints is None and runtime.recordings is None
+    asyncio.run(runtime.run_game())
+    assert runtime.state == "complete"
@@ -0,0 +1,62 @@
+import threading
+import time
+import pytest
+from src.utils.llm_providers.breaker import CircuitBreaker, CircuitOpenError, CLOSED, OPEN, HALF_OPEN
+
+class StatusError(Exception):
+    def __init__(self, status):
+        self.status = status
+
+def fail(breaker, error=None):
+    with pytest.raises(Exception):
+        with breaker.guard():
+            raise error or StatusError(503)
+
+def test_opens_on_error_rate_and_rejects_calls():
+    breaker = CircuitBreaker("m", window=4, min_calls=4, failure_threshold=0.5)
+    for _ in range(2):
+        with breaker.guard():
+            pass
+    fail(breaker)
+    assert breaker.state == CLOSED
+    fail(breaker)
+    assert breaker.state == OPEN
+    assert not breaker.available()
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+    assert breaker.stats()["rejected"] == 1
+
+def test_client_errors_do_not_trip():
+    breaker = CircuitBreaker("m", min_calls=2)
+    for _ in range(4):
+        fail(breaker, StatusError(400))
+    assert breaker.state == CLOSED
+
+def test_slow_calls_trip():
+    breaker = CircuitBreaker("m", min_calls=2, slow_call_seconds=0.0, slow_call_threshold=1.0)
+    for _ in range(2):
+        with breaker.guard():
+            pass
+    assert breaker.state == OPEN
+
+def test_half_open_live_probe_closes_on_success():
+    breaker = CircuitBreaker("m", min_calls=1, open_seconds=0.0)
+    fail(breaker)
+    assert breaker.state == OPEN
+    with breaker.guard():
+        assert breaker.state == HALF_OPEN
+    assert breaker.state == CLOSED
+
+def test_background_probe_keeps_traffic_off_until_recovered():
+    probed = threading.Event()
+    breaker = CircuitBreaker("m", min_calls=1, open_seconds=0.0, probe=probed.set)
+    fail(breaker)
+    assert not breaker.available()  # starts the probe, traffic stays on the backup
+    assert probed.wait(1.0)
+    for _ in range(100):
+        if breaker.state == CLOSED:
+            break
+        time.sleep(0.01)
+    assert breaker.state == CLOSED
+    assert breaker.available()
@@ -0,0 +1,78 @@
+import time
+from src.utils.llm_providers.context_cache import ContextCacheManager
+from src.utils.llm_providers.prompt import PromptBuilder
+from src.utils.llm_providers.stub import StubProvider
+
+ROLE = "You are Player 1 in a two-player negotiation game. " * 40
+
+def turn_prompt(round_num):
+    return (
+        PromptBuilder()
+        .static(ROLE)
+        .static("Respond with JSON.")
+        .dynamic(f"Current round: {round_num} of 5")
+        .build()
+    )
+
+def test_prompt_builder_separates_static_and_dynamic():
+    first, second = turn_prompt(1), turn_prompt(2)
+    assert first.static == second.static
+    assert first.prefix_key == second.prefix_key
+    assert first.dynamic != second.dynamic
+    assert first.text.startswith(ROLE.strip())
+    assert first.text.endswith("Current round: 1 of 5")
+
+def test_stub_provider_reports_tokens_saved():
+    """The prefix is billed once, then served from the cached handle"""
+    provider = StubProvider()
+    for round_num in range(1, 6):
+        prompt = turn_prompt(round_num)
+        provider.generate(prompt.dynamic, static_prefix=prompt.static)
+
+    stats = provider.stats()
+    assert stats["calls"] == 5
+    assert stats["context_cache"]["created"] == 1
+    assert stats["context_cache"]["hits"] == 4
+    assert stats["cached_tokens"] == stats["context_cache"]["tokens_saved"] > 0
+
+def test_small_prefixes_are_sent_inline():
+    provider = StubProvider(min_prefix_tokens=100000)
+    prompt = turn_prompt(1)
+    provider.generate(prompt.dynamic, static_prefix=prompt.static)
+    provider.generate(prompt.dynamic, static_prefix=prompt.static)
+    assert provider.stats()["cached_tokens"] == 0
+    assert provider.stats()["context_cache"]["skipped"] == 2
+
+def test_handles_are_refreshed_before_expiry():
+    manager = ContextCacheManager(ttl_seconds=0.2, refresh_margin=0.1)
+    names = iter(["first", "second"])
+    create = lambda prefix, ttl: (next(names), None)
+
+    assert manager.lookup("p", "m", "prefix", create).name == "first"
+    assert manager.lookup("p", "m", "prefix", create).name == "first"
+    time.sleep(0.15)
+    assert manager.lookup("p", "m", "prefix", create).name == "second"
+    assert manager.stats()["refreshed"] == 1
+
+def test_observe_credits_implicit_prompt_caching():
+    manager = ContextCacheManager()
+    assert not manager.observe("openrouter", "m", ROLE)
+    assert manager.observe("openrouter", "m", ROLE)
+    assert manager.stats()["tokens_saved"] > 0
+
+def test_gemini_registers_cached_content_off_the_event_loop(monkeypatch):
+    """Creating the cached content is a blocking call; the async path runs it on a thread"""
+    import asyncio
+    import threading
+    from src.utils.llm_providers import gemini
+    provider = gemini.GeminiProvider(api_key="test")
+    monkeypatch.setattr(gemini, "context_cache_settings", lambda name: {"enabled": True})
+    threads = []
+
+    def prepare(*args):
+        threads.append(threading.current_thread())
+        return None, "prompt"
+    monkeypatch.setattr(provider, "_prepare", prepare)
+
+    asyncio.run(provider._aprepare(False, "hello", None, ROLE))
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,54 @@
+import asyncio
+import time
+from src.utils.llm_providers.fallback import FallbackProvider
+
+HEDGING = {"enabled": True, "default_deadline": 0.05, "min_samples": 100}
+
+class SlowPrimaryProvider:
+    """Gemini stand-in whose primary model is slow"""
+    default_model_name = "primary"
+    backup_model_name = "backup"
+
+    def __init__(self, primary_delay=0.5, backup_delay=0.0):
+        self.primary_delay = primary_delay
+        self.backup_delay = backup_delay
+        self.cancelled = False
+
+    def generate(self, prompt, use_backup=False, fallback=True, **kwargs):
+        time.sleep(self.backup_delay if use_backup else self.primary_delay)
+        return "backup" if use_backup else "primary"
+
+    async def agenerate(self, prompt, use_backup=False, fallback=True, **kwargs):
+        try:
+            await asyncio.sleep(self.backup_delay if use_backup else self.primary_delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "backup" if use_backup else "primary"
+
+def test_fast_primary_is_not_hedged():
+    provider = FallbackProvider(HEDGING, SlowPrimaryProvider(primary_delay=0.0))
+    assert provider.generate("p") == "primary"
+    assert provider.stats()["hedged"] == 0
+
+def test_slow_primary_hedges_to_backup():
+    provider = FallbackProvider(HEDGING, SlowPrimaryProvider())
+    assert provider.generate("p") == "backup"
+    stats = provider.stats()
+    assert stats["hedged"] == 1
+    assert stats["backup_wins"] == 1
+    assert stats["hedge_rate"] == 1.0
+
+def test_async_hedge_cancels_loser():
+    inner = SlowPrimaryProvider()
+    provider = FallbackProvider(HEDGING, inner)
+    assert asyncio.run(provider.agenerate("p")) == "backup"
+    assert inner.cancelled
+
+def test_deadline_learned_from_latency_quantile():
+    hedging = {"enabled": True, "min_samples": 5, "quantile": 0.9, "min_deadline": 0.0}
+    provider = FallbackProvider(hedging, SlowPrimaryProvider())
+    assert provider.hedge_deadline() == 2.0  # default until enough samples
+    for seconds in (0.1, 0.2, 0.3, 0.4, 1.0):
+        provider.latency.observe("primary", seconds)
+    assert provider.hedge_deadline() == 1.0
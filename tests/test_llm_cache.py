@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from src.utils.llm_providers.base import BaseLLMProvider
+from src.utils.llm_providers.cache import (
+    CachedProvider,
+    ResponseCache,
+    CacheMissError,
+    RECORD,
+    REPLAY
+)
+
+class CountingProvider(BaseLLMProvider):
+    """Provider that counts how often it is actually called"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=None, stop=None, **kwargs):
+        self.calls += 1
+        return f'{{"message": "reply to {prompt}", "transfers": []}}'
+
+    @staticmethod
+    def get_config():
+        return {"name": "counting", "models": {}}
+
+def test_repeated_request_hits_memory(tmp_path):
+    """Identical requests are answered from the memory tier"""
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=str(tmp_path / "cache.sqlite3")))
+
+    first = cached.generate("hello", temperature=0.7)
+    second = cached.generate("hello", temperature=0.7)
+
+    assert first == second
+    assert provider.calls == 1
+    assert cached.cache.stats()["memory_hits"] == 1
+
+def test_default_model_is_part_of_key(tmp_path):
+    """The same prompt to a different default model is a miss"""
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=str(tmp_path / "cache.sqlite3")))
+
+    provider.default_model = "model-a"
+    cached.generate("hello")
+    provider.default_model = "model-b"
+    cached.generate("hello")
+    provider.default_model = "model-a"
+    cached.generate("hello")
+
+    assert provider.calls == 2
+
+def test_fallback_models_are_part_of_key(tmp_path):
+    """A wrapper without a model of its own is keyed by the models it wraps"""
+    from src.utils.llm_providers.fallback import FallbackProvider
+    provider = CountingProvider()
+    provider.default_model_name, provider.backup_model_name = "model-a", "backup-a"
+    cached = CachedProvider(FallbackProvider(hedging={}, provider=provider), ResponseCache(path=str(tmp_path / "cache.sqlite3")))
+
+    cached.generate("hello")
+    provider.backup_model_name = "backup-b"
+    cached.generate("hello")
+
+    assert provider.calls == 2
+    assert "model-a" in cached.namespace and "backup-b" in cached.namespace
+
+def test_different_parameters_miss(tmp_path):
+    """Temperature is part of the cache key"""
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=str(tmp_path / "cache.sqlite3")))
+
+    cached.generate("hello", temperature=0.7)
+    cached.generate("hello", temperature=0.9)
+
+    assert provider.calls == 2
+
+def test_disk_tier_survives_new_process(tmp_path):
+    """A fresh cache on the same path serves recorded responses from disk"""
+    path = str(tmp_path / "cache.sqlite3")
+    CachedProvider(CountingProvider(), ResponseCache(path=path)).generate("hello")
+
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=path), mode=REPLAY)
+    assert "reply to hello" in cached.generate("hello")
+    assert provider.calls == 0
+    assert cached.cache.stats()["disk_hits"] == 1
+
+def test_replay_mode_raises_on_miss(tmp_path):
+    """Replay-only mode never reaches the network"""
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=str(tmp_path / "cache.sqlite3")), mode=REPLAY)
+
+    with pytest.raises(CacheMissError):
+        cached.generate("never recorded")
+    assert provider.calls == 0
+
+def test_record_mode_always_refreshes(tmp_path):
+    """Record mode bypasses lookups but keeps writing"""
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=str(tmp_path / "cache.sqlite3")), mode=RECORD)
+
+    cached.generate("hello")
+    cached.generate("hello")
+
+    assert provider.calls == 2
+    assert cached.cache.stats()["writes"] == 2
+
+def test_lru_eviction_and_ttl():
+    """The memory tier is bounded and entries expire"""
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+    expiring = ResponseCache(ttl_seconds=-1)
+    expiring.put("k", "v")
+    assert expiring.get("k") is None
+
+def test_async_generate_uses_cache(tmp_path):
+    """agenerate shares entries with generate"""
+    provider = CountingProvider()
+    cached = CachedProvider(provider, ResponseCache(path=str(tmp_path / "cache.sqlite3")))
+
+    cached.generate("hello")
+    result = asyncio.run(cached.agenerate("hello"))
+
+    assert "reply to hello" in result
+    assert provider.calls == 1
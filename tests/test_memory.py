@@ -0,0 +1,96 @@
+from src.core.memory import ConversationMemory
+
+def test_rounds_are_indexed_as_messages_arrive():
+    memory = ConversationMemory(players_per_round=3)
+    for i in range(7):
+        memory.add_message(f"p{i % 3}", f"m{i}")
+        memory.add_transfer(f"p{i % 3}", "p0", 1)
+    assert [m.message for m in memory.round_messages(2)] == ["m3", "m4", "m5"]
+    # A transfer belongs to the round of the message it followed
+    assert [t.round for t in memory.round_transfers(1)] == [1, 1, 1]
+    assert memory.round_messages(9) == []
+    assert memory.messages[0]["speaker"] == "p0"
+
+def test_recent_context_matches_last_window():
+    memory = ConversationMemory()
+    for i in range(8):
+        memory.add_message("Marco Polo", f"offer {i}", round_num=i + 1)
+    memory.add_transfer("Marco Polo", "Trader Joe", 3, round_num=8)
+    context = memory.get_recent_context()
+    assert "offer 2" not in context and "offer 3" in context and "offer 7" in context
+    assert context.endswith("Round 8 - Marco Polo → Trader Joe: 3 coins\n")
+    assert memory.get_recent_context() is context  # cached until the next append
+    assert memory.get_recent_context(2).count("offer") == 2
+
+def test_to_dict_is_json_ready():
+    memory = ConversationMemory()
+    memory.add_message("Trader Joe", "hello")
+    data = memory.to_dict()
+    assert data["messages"][0]["round"] == 1
+    assert isinstance(data["messages"][0]["timestamp"], str)
+    assert data["transfers"] == []
+
+def play_rounds(memory, rounds):
+    for r in range(1, rounds + 1):
+        memory.add_message("Marco Polo", f"offer {r} " + "x" * 40, round_num=r)
+        memory.add_message("Trader Joe", f"reply {r}", round_num=r)
+        memory.add_transfer("Marco Polo", "Trader Joe", 2, round_num=r)
+
+def test_compaction_keeps_recent_rounds_and_folds_the_rest():
+    memory = ConversationMemory(keep_rounds=2)
+    play_rounds(memory, 100)
+    context = memory.get_recent_context()
+    assert memory.folded_through == 98
+    assert "Earlier rounds (1-98)" in context
+    assert "Marco Polo → Trader Joe: 196 coins in 98 transfers" in context
+    assert "offer 97" not in context and "offer 99" in context and "reply 100" in context
+    # Folded context stays flat as the game goes on
+    short = ConversationMemory(keep_rounds=2)
+    play_rounds(short, 10)
+    assert len(context) - len(short.get_recent_context()) < 30  # only the counters grow
+
+def test_context_token_cap_drops_oldest_verbatim_lines():
+    memory = ConversationMemory(keep_rounds=5, max_context_tokens=100)
+    play_rounds(memory, 20)
+    context = memory.get_recent_context()
+    assert len(context) // 4 <= 100
+    assert "offer 20" in context and "offer 16" not in context
+
+def test_narrative_covers_only_newly_folded_rounds():
+    memory = ConversationMemory(keep_rounds=1)
+    play_rounds(memory, 3)
+    through, text = memory.pending_narrative()
+    assert through == 2 and "offer 1" in text and "offer 3" not in text
+    memory.set_narrative("Marco keeps paying Joe.", through)
+    assert memory.pending_narrative() is None
+    assert "Marco keeps paying Joe." in memory.get_recent_context()
+    play_rounds(memory, 4)  # replays rounds 1-4; only round 3 is newly folded
+    through, text = memory.pending_narrative()
+    assert through == 3 and text.startswith("Story so far (rounds 1-2)") and "offer 1 " not in text
+    memory.set_narrative("stale", 2)
+    assert memory.narrative == "Marco keeps paying Joe."
+
+def test_round_trip_keeps_folded_history():
+    memory = ConversationMemory(keep_rounds=1)
+    for r in (1, 2, 3):
+        memory.add_message("A", f"round {r}", round_num=r)
+        memory.add_transfer("A", "B", r, round_num=r)
+    restored = ConversationMemory.from_dict(memory.to_dict(), keep_rounds=1)
+    assert restored._flows == memory._flows == {("A", "B"): [3, 2]}
+    assert restored.get_recent_context() == memory.get_recent_context()
+
+def test_runtime_remembers_each_players_message():
+    import asyncio
+    import src.api  # noqa: F401  (resolves the router <-> runtime import cycle)
+    from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+    from src.utils.llm_providers.stub import StubProvider
+    runtime = NegotiationRuntime(llm_provider=StubProvider(), checkpoints=None, recordings=None)
+    runtime.memory = ConversationMemory(keep_rounds=1)
+    asyncio.run(runtime.run_game())
+
+    messages = runtime.memory.messages
+    assert [(m.speaker, m.round) for m in messages[:2]] == [("Marco Polo", 1), ("Trader Joe", 1)]
+    assert len(messages) == 2 * runtime.max_rounds
+    context = runtime.memory.get_recent_context()
+    assert f": {messages[-1].message}\n" in context
+    assert f": {messages[0].message}\n" not in context  # folded into the summary of earlier rounds
@@ -0,0 +1,56 @@
+import asyncio
+from src.utils.llm_providers.metrics import MetricsRegistry, call_labels, current_labels
+from src.utils.llm_providers.stub import StubProvider
+
+PRICING = {"stub": {"input_per_million": 1.0, "output_per_million": 2.0}}
+
+def test_labels_propagate_to_worker_threads():
+    async def run():
+        with call_labels(game_id="g1"):
+            with call_labels(phase="action"):
+                return await asyncio.to_thread(current_labels)
+
+    assert asyncio.run(run()) == ("g1", "action")
+    assert current_labels() == (None, None)
+
+def test_per_game_usage_by_phase():
+    metrics = MetricsRegistry(pricing=PRICING)
+    provider = StubProvider(metrics=metrics)
+    with call_labels(game_id="g1"):
+        with call_labels(phase="thinking"):
+            provider.generate("x" * 400)
+        with call_labels(phase="action"):
+            provider.generate("y" * 400)
+    provider.generate("unattributed")
+
+    usage = metrics.end_game("g1")
+    assert usage["total"]["calls"] == 2
+    assert usage["total"]["prompt_tokens"] == 200
+    assert set(usage["by_phase"]) == {"thinking", "action"}
+    assert usage["total"]["cost_usd"] > 0
+    # Ending a game drops its aggregate
+    assert metrics.game_summary("g1")["total"]["calls"] == 0
+
+def test_errors_and_streams():
+    metrics = MetricsRegistry()
+    try:
+        with metrics.track("stub", "stub"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    def stream():
+        with metrics.track("stub", "stub", "prompt") as call:
+            for chunk in ("abcd", "efgh"):
+                call.output(chunk)
+                yield chunk
+
+    chunks = stream()
+    next(chunks)
+    chunks.close()  # caller stops early: not a failure
+
+    text = metrics.render_prometheus()
+    assert 'llm_calls_total{provider="stub",model="stub",phase="other",status="error"} 1' in text
+    assert 'llm_calls_total{provider="stub",model="stub",phase="other",status="ok"} 1' in text
+    assert 'llm_time_to_first_token_seconds_count{provider="stub",model="stub",phase="other"} 1' in text
+    assert 'le="+Inf"' in text
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import src.api  # noqa: F401  (resolves the router <-> runtime import cycle)
+from src.api.events.manager import GameEventManager
+from src.core.checkpoint import CheckpointStore
+from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+from src.utils.llm_providers.stub import StubProvider
+
+class ConnectedRequest:
+    async def is_disconnected(self):
+        return False
+
+async def received(manager: GameEventManager, count: int, paced: bool):
+    """Subscribe, emit ``count`` events half a second of playback apart, and time their delivery"""
+    stream = manager.subscribe(ConnectedRequest(), paced=paced)
+    await stream.__anext__()  # initial ping registers the subscriber
+    for i in range(count):
+        await manager.emit("system", "tick", {"i": i})
+        manager.pace(0.25)
+    times = []
+    while len(times) < count:
+        chunk = await stream.__anext__()
+        if chunk.startswith("data:"):
+            times.append(time.monotonic())
+    await stream.aclose()
+    return times
+
+def test_events_are_stamped_with_playback_offsets():
+    manager = GameEventManager("g1")
+    assert manager.playback_offset() == 0.0
+    manager.pace(1.5)
+    assert 1.5 <= manager.playback_offset() < 1.6
+
+def test_subscriber_paces_and_unpaced_does_not():
+    paced = asyncio.run(received(GameEventManager("g1"), 3, paced=True))
+    assert paced[2] - paced[0] >= 0.45
+    unpaced = asyncio.run(received(GameEventManager("g2"), 3, paced=False))
+    assert unpaced[2] - unpaced[0] < 0.1
+
+def test_game_runs_at_compute_speed(tmp_path):
+    manager = GameEventManager("g3")
+    runtime = NegotiationRuntime(
+        event_manager=manager,
+        checkpoints=CheckpointStore(str(tmp_path / "checkpoints")),
+        recordings=CheckpointStore(str(tmp_path / "recordings")),
+        llm_provider=StubProvider()
+    )
+    started = time.perf_counter()
+    asyncio.run(runtime.run_game())
+    # Five rounds used to sleep at least 15s between events
+    assert time.perf_counter() - started < 2.0
+    assert runtime.state == "complete"
+    assert manager.playback_offset() >= runtime.max_rounds * (4 * runtime.turn_delay + runtime.round_delay)
+
+def test_thinking_deltas_reach_subscribers_but_not_history():
+    manager = GameEventManager("g4")
+    queue = asyncio.Queue()
+    manager.subscribers.append(queue)
+
+    async def emit():
+        await manager.emit("player", "player_thinking_delta", {"player": "Marco Polo", "delta": "Hm"})
+        await manager.emit("player", "player_thinking", {"player": "Marco Polo", "thinking": "Hm"})
+    asyncio.run(emit())
+
+    assert queue.qsize() == 2
+    assert [e["name"] for e in manager.history] == ["player_thinking"]
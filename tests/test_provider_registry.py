@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import pytest
+from src.utils.llm_providers.base import BaseLLMProvider
+from src.utils.llm_providers.pool import HTTPPool
+from src.utils.llm_providers.registry import ProviderRegistry
+
+@pytest.fixture(autouse=True)
+def api_keys(monkeypatch):
+    """Config validates that provider keys are present"""
+    for key in ("OPENROUTER_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY"):
+        monkeypatch.setenv(key, "test-key")
+
+class StaticProvider(BaseLLMProvider):
+    def __init__(self, model):
+        self.model = model
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=None, stop=None):
+        return self.model
+
+    @staticmethod
+    def get_config():
+        return {"name": "static", "models": {}}
+
+def test_registry_shares_instances_per_model():
+    """The same provider/model pair always maps to one instance"""
+    registry = ProviderRegistry()
+    builds = []
+    registry.register("static", lambda model: builds.append(model) or StaticProvider(model))
+
+    first = registry.get("static", "model-a")
+    assert registry.get("static", "model-a") is first
+    assert registry.get("static", "model-b") is not first
+    assert builds == ["model-a", "model-b"]
+
+def test_registry_builds_once_under_contention():
+    """Concurrent lookups never build duplicate providers"""
+    registry = ProviderRegistry()
+    builds = []
+    registry.register("static", lambda model: builds.append(model) or StaticProvider(model))
+
+    threads = [threading.Thread(target=registry.get, args=("static", "m")) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == ["m"]
+
+def test_unknown_provider_rejected():
+    with pytest.raises(ValueError):
+        ProviderRegistry().get("nope")
+
+def test_pool_tracks_utilisation():
+    """In-flight and peak counters follow tracked requests"""
+    pool = HTTPPool(maxsize=4)
+    with pool.track():
+        with pool.track():
+            assert pool.stats()["in_flight"] == 2
+    stats = pool.stats()
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == 2
+    assert stats["requests_total"] == 2
+
+def test_pool_evicts_sessions_of_closed_loops():
+    """A new event loop never gets a session bound to a closed one"""
+    pool = HTTPPool()
+
+    async def session():
+        return pool.async_session()
+
+    async def session_and_close():
+        session, sessions = pool.async_session(), pool.stats()["async_sessions"]
+        await pool.aclose()
+        return session, sessions
+    first = asyncio.run(session())
+    second, sessions = asyncio.run(session_and_close())
+
+    assert second is not first
+    assert first.closed
+    assert sessions == 1
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.utils.llm_providers.limiter import ModelLimiter, TokenBucket, classify_error, OVERLOADED, NEUTRAL
+
+class StatusError(Exception):
+    def __init__(self, status):
+        self.status = status
+
+def test_concurrency_cap_bounds_in_flight_calls():
+    """No more than the cap's worth of calls run at once"""
+    limiter = ModelLimiter("m", initial_concurrency=2, max_concurrency=2)
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with limiter.limit_call():
+            with lock:
+                peak.append(limiter.in_flight)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    assert limiter.stats()["admitted"] == 6
+    assert limiter.stats()["queue_time_max"] > 0
+
+def test_aimd_shrinks_on_overload_and_grows_on_success():
+    limiter = ModelLimiter("m", initial_concurrency=8, decrease_cooldown=0)
+    with pytest.raises(StatusError):
+        with limiter.limit_call():
+            raise StatusError(429)
+    assert limiter.stats()["concurrency_limit"] == 4
+
+    for _ in range(8):
+        with limiter.limit_call():
+            pass
+    assert limiter.stats()["concurrency_limit"] == 5
+
+def test_throttle_pauses_admission():
+    """A 429 with Retry-After holds back the next call"""
+    limiter = ModelLimiter("m", throttle_backoff=0.1)
+    with limiter.limit_call() as permit:
+        permit.throttled()
+    started = time.monotonic()
+
+    async def call():
+        async with limiter.alimit_call():
+            pass
+
+    asyncio.run(call())
+    assert time.monotonic() - started >= 0.05
+
+def test_token_bucket_wait_time():
+    bucket = TokenBucket(rate_per_minute=60, burst=1)
+    now = time.monotonic()
+    assert bucket.wait_time(1, now) == 0
+    bucket.consume(1)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+
+def test_classify_error():
+    assert classify_error(StatusError(429)) == OVERLOADED
+    assert classify_error(StatusError(503)) == OVERLOADED
+    assert classify_error(StatusError(400)) == NEUTRAL
+    assert classify_error(ValueError("bad json")) == NEUTRAL
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+import src.api  # noqa: F401  (resolves the router <-> runtime import cycle)
+from src.api.events.manager import GameEventManager
+from src.core.checkpoint import CheckpointStore
+from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+from src.spaces.merchants_1o1.runtime.replay import GameReplay, ReplayError, ReplayVerifier, verify_recording
+from src.utils.llm_providers.stub import StubProvider
+
+def event(name, data, offset=0.0):
+    return {"type": "system", "name": name, "data": data, "playback_offset": offset}
+
+def action(player, *transfers):
+    return event("player_action", {
+        "player": player,
+        "action": {"message": "hi", "transfers": [{"recipient": r, "amount": a} for r, a in transfers]}
+    })
+
+def recorded_game(round_mode, actions, standings, winner):
+    return [
+        event("game_started", {"initial_state": {"Marco Polo": 10, "Trader Joe": 10}, "round_mode": round_mode, "round": 1}),
+        event("round_started", {"round": 1, "standings": {"Marco Polo": 10, "Trader Joe": 10}}, 0.5),
+        *actions,
+        event("game_ended", {"winner": winner, "final_standings": standings}, 2.0)
+    ]
+
+def test_verifier_applies_the_game_rules():
+    events = recorded_game("sequential", [
+        action("Marco Polo", ("Trader Joe", 4)),
+        action("Trader Joe", ("Marco Polo", 30), ("Nobody", 1))  # both refused by the rules
+    ], {"Marco Polo": 6, "Trader Joe": 14}, "Trader Joe")
+    report = verify_recording(events)
+    assert report["final_standings"] == {"Marco Polo": 6, "Trader Joe": 14}
+
+    events[-1]["data"]["final_standings"] = {"Marco Polo": 10, "Trader Joe": 10}
+    report = ReplayVerifier(events).verify()
+    assert not report["ok"] and "game_ended" in report["mismatches"][0]
+    with pytest.raises(ReplayError):
+        verify_recording(events)
+
+def test_simultaneous_rounds_settle_from_round_start_coins():
+    # Trader Joe cannot forward the coins Marco Polo sends in the same round
+    events = recorded_game("simultaneous", [
+        action("Marco Polo", ("Trader Joe", 10)),
+        action("Trader Joe", ("Marco Polo", 10), ("Marco Polo", 5))
+    ], {"Marco Polo": 10, "Trader Joe": 10}, "Tie")
+    assert verify_recording(events)["ok"]
+
+def test_finished_game_is_recorded_verified_and_replayed(tmp_path):
+    recordings = CheckpointStore(str(tmp_path))
+    runtime = NegotiationRuntime(event_manager=GameEventManager("g1"), recordings=recordings, llm_provider=StubProvider())
+    asyncio.run(runtime.run_game())
+
+    recording = recordings.load("g1")
+    names = {e["name"] for e in recording["events"]}
+    assert "player_thinking" in names and "player_thinking_delta" not in names
+    assert verify_recording(recording)["rounds"] == runtime.max_rounds
+
+    events = recording["events"]
+    manager = GameEventManager("r1")
+    replay = GameReplay(events, speed=2.0, game_id="r1")
+    assert asyncio.run(replay.play(manager)) == len(events)
+    assert [e["name"] for e in manager.history] == [e["name"] for e in events]
+    assert manager.history[-1]["playback_offset"] == round(events[-1]["playback_offset"] / 2, 3)
+
+    fastest = GameEventManager("r2")
+    asyncio.run(GameReplay(events, speed=0).play(fastest))
+    assert {e["playback_offset"] for e in fastest.history} == {0.0}
+
+def test_replays_are_kept_apart_from_live_games(tmp_path, monkeypatch):
+    from fastapi import HTTPException
+    from src.api.routers import merchants_1o1 as router
+
+    monkeypatch.setattr(router, "active_replays", type(router.active_replays)())
+    monkeypatch.setattr(router, "MAX_REPLAYS", 1)
+    runtime = NegotiationRuntime(
+        event_manager=GameEventManager("g2"), recordings=CheckpointStore(str(tmp_path)), llm_provider=StubProvider()
+    )
+    asyncio.run(runtime.run_game())
+    events = runtime.get_event_history()
+
+    first = asyncio.run(router.create_replay(router.ReplayRequest(events=events, speed=0)))["game_id"]
+    assert first not in router.active_games
+    assert router.get_event_manager(first).history
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(router.run_game(first))
+    assert error.value.status_code == 404
+
+    second = asyncio.run(router.create_replay(router.ReplayRequest(events=events, speed=0)))["game_id"]
+    assert list(router.active_replays) == [second]
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import pytest
+from src.utils.llm_providers.routing import RoutingProvider
+
+class TimedProvider:
+    """Backend stand-in with a fixed delay that can be made to fail"""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        assert "model" not in kwargs
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} down")
+        return self.name
+
+    async def agenerate(self, prompt, **kwargs):
+        return self.generate(prompt, **kwargs)
+
+    def stream(self, prompt, **kwargs):
+        yield self.generate(prompt, **kwargs)
+
+def test_prefers_fastest_backend():
+    fast, slow = TimedProvider("fast"), TimedProvider("slow", delay=0.02)
+    router = RoutingProvider("r", {"slow": slow, "fast": fast}, exploration=0.0)
+    results = [router.generate("p", model="ignored") for _ in range(10)]
+    # Each backend is measured once, then the fast one takes the traffic
+    assert slow.calls == 1
+    assert results[-1] == "fast"
+    assert router.stats()["preferred"] == "fast"
+
+def test_fails_over_and_avoids_unhealthy_backend():
+    broken, ok = TimedProvider("broken", fail=True), TimedProvider("ok", delay=0.01)
+    router = RoutingProvider("r", {"broken": broken, "ok": ok}, exploration=0.0, alpha=0.5)
+    assert router.generate("p") == "ok"
+    assert router.stats()["failovers"] == 1
+    for _ in range(5):
+        assert router.generate("p") == "ok"
+    assert broken.calls == 1
+    assert router.stats()["backends"]["broken"]["error_rate_ewma"] == 0.5
+
+def test_raises_when_every_backend_fails():
+    router = RoutingProvider("r", {"a": TimedProvider("a", fail=True), "b": TimedProvider("b", fail=True)})
+    with pytest.raises(ConnectionError):
+        router.generate("p")
+
+def test_exploration_keeps_sampling_other_backends():
+    fast, slow = TimedProvider("fast"), TimedProvider("slow", delay=0.001)
+    router = RoutingProvider("r", {"fast": fast, "slow": slow}, exploration=1.0, seed=7)
+    for _ in range(30):
+        asyncio.run(router.agenerate("p"))
+    assert slow.calls > 1
+    assert router.stats()["explored"] > 0
+
+def test_stream_routes_and_fails_over():
+    router = RoutingProvider("r", {"down": TimedProvider("down", fail=True), "up": TimedProvider("up")})
+    assert list(router.stream("p")) == ["up"]
@@ -0,0 +1,50 @@
+import json
+import pytest
+from src.utils.llm_providers.schemas import (
+    ACTION_SCHEMA, SUMMARY_SCHEMA, TURN_SCHEMA, matches_schema, parse_structured,
+    strict_json_schema, gemini_schema, example_for
+)
+from src.utils.llm_providers.stub import StubProvider
+
+def test_action_schema_matching():
+    assert matches_schema({"message": "hi", "transfers": [{"recipient": "Trader Joe", "amount": 2}]}, ACTION_SCHEMA)
+    assert matches_schema({"thinking": "plan", "message": "hi", "transfers": []}, ACTION_SCHEMA)
+    assert not matches_schema({"message": "hi"}, ACTION_SCHEMA)
+    assert not matches_schema({"message": "hi", "transfers": [{"recipient": "x", "amount": "2"}]}, ACTION_SCHEMA)
+    assert not matches_schema({"message": "hi", "transfers": [{"recipient": "x", "amount": True}]}, ACTION_SCHEMA)
+
+def test_parse_structured_drops_strict_mode_nulls():
+    data = parse_structured('{"thinking": null, "message": "hi", "transfers": []}', ACTION_SCHEMA)
+    assert data == {"message": "hi", "transfers": []}
+    with pytest.raises(ValueError):
+        parse_structured('{"message": null, "transfers": []}', ACTION_SCHEMA)
+    with pytest.raises(ValueError):
+        parse_structured('not json', ACTION_SCHEMA)
+
+def test_strict_schema_requires_every_field():
+    strict = strict_json_schema(ACTION_SCHEMA)
+    assert strict["additionalProperties"] is False
+    assert set(strict["required"]) == {"thinking", "message", "transfers"}
+    assert strict["properties"]["thinking"]["type"] == ["string", "null"]
+    assert strict["properties"]["transfers"]["items"]["additionalProperties"] is False
+    # The shared schema is left untouched
+    assert "additionalProperties" not in ACTION_SCHEMA
+
+def test_gemini_schema_uses_openapi_types():
+    converted = gemini_schema(strict_json_schema(ACTION_SCHEMA))
+    assert converted["type"] == "OBJECT"
+    assert converted["properties"]["thinking"] == {"nullable": True, "type": "STRING"}
+    assert converted["properties"]["transfers"]["items"]["properties"]["amount"]["type"] == "INTEGER"
+    assert "additionalProperties" not in converted
+
+def test_examples_conform():
+    for schema in (ACTION_SCHEMA, SUMMARY_SCHEMA, TURN_SCHEMA):
+        assert matches_schema(example_for(schema), schema)
+    assert not matches_schema({"message": "hi", "transfers": []}, TURN_SCHEMA)
+
+def test_stub_provider_honours_response_schema():
+    provider = StubProvider()
+    action = json.loads(provider.generate("Your move", response_schema=ACTION_SCHEMA))
+    assert action == {"message": "Stub reply #1", "transfers": []}
+    summary = json.loads(provider.generate("Summarize", response_schema=SUMMARY_SCHEMA))
+    assert matches_schema(summary, SUMMARY_SCHEMA)
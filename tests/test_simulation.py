@@ -0,0 +1,29 @@
+from src.simulation import BatchSimulator, summarize
+from src.utils.llm_providers.stub import StubProvider
+
+def test_batch_runs_1o1_games_concurrently(tmp_path):
+    result = BatchSimulator(games=6, concurrency=3, provider="stub", rounds=2, output_dir=str(tmp_path)).run()
+    summary = result["summary"]
+    assert summary["completed"] == 6 and summary["failed"] == 0
+    assert sum(summary["wins"].values()) == 6
+    assert set(summary["coins"]) == {"Marco Polo", "Trader Joe"}
+    assert [g["index"] for g in result["games"]] == list(range(6))
+    assert len(list(tmp_path.glob("*_games.jsonl"))) == 1
+    assert len(list(tmp_path.glob("*_summary.json"))) == 1
+
+def test_batch_runs_multi_games_with_shared_provider():
+    provider = StubProvider()
+    result = BatchSimulator(space="merchants_multi", games=2, provider=provider, rounds=1).run()
+    assert result["summary"]["completed"] == 2
+    assert provider.calls > 0
+
+def test_summary_counts_failures_and_distributions():
+    summary = summarize([
+        {"winner": "A", "final_statuses": {"A": 12, "B": 8}, "error": None},
+        {"winner": "Tie", "final_statuses": {"A": 10, "B": 10}, "error": None},
+        {"winner": None, "final_statuses": {}, "error": "boom"}
+    ], elapsed=6.0)
+    assert summary["failed"] == 1
+    assert summary["win_rate"] == {"A": 0.5, "Tie": 0.5}
+    assert summary["coins"]["B"]["histogram"] == {8: 1, 10: 1}
+    assert summary["games_per_minute"] == 30.0
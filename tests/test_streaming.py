@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from src.utils.llm_providers.base import BaseLLMProvider
+from src.utils.llm_providers.cache import CachedProvider, ResponseCache
+from src.utils.llm_providers.sse import parse_sse_delta, StreamDone
+
+def test_parse_sse_delta_lines():
+    """OpenAI-style stream lines are parsed as SSE, not raw JSON"""
+    assert parse_sse_delta(b'data: {"choices": [{"delta": {"content": "Hel"}}]}') == "Hel"
+    assert parse_sse_delta('data: {"choices": [{"delta": {}}]}') is None
+    assert parse_sse_delta(": OPENROUTER PROCESSING") is None
+    assert parse_sse_delta(b"") is None
+    with pytest.raises(StreamDone):
+        parse_sse_delta("data: [DONE]")
+
+class ChunkedProvider(BaseLLMProvider):
+    """Provider that streams a fixed response word by word"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, system_prompt=None, temperature=0.7, max_tokens=None, stop=None):
+        self.calls += 1
+        return "thinking about the next move"
+
+    def stream(self, prompt, **kwargs):
+        self.calls += 1
+        for word in ["thinking ", "about ", "the ", "next ", "move"]:
+            yield word
+
+    @staticmethod
+    def get_config():
+        return {"name": "chunked", "models": {}}
+
+def test_default_astream_yields_full_response():
+    """Providers without streaming yield one chunk"""
+    provider = ChunkedProvider()
+
+    async def collect():
+        return [chunk async for chunk in provider.astream("p")]
+
+    assert asyncio.run(collect()) == ["thinking about the next move"]
+
+def test_cached_stream_records_joined_chunks():
+    """A streamed miss is recorded and later replayed whole"""
+    provider = ChunkedProvider()
+    cached = CachedProvider(provider, ResponseCache())
+
+    assert list(cached.stream("p")) == ["thinking ", "about ", "the ", "next ", "move"]
+    assert list(cached.stream("p")) == ["thinking about the next move"]
+    assert provider.calls == 1
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import pytest
+
+pytest.importorskip("aiohttp.web")
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+from src.utils.llm_providers.schemas import ACTION_SCHEMA, strict_json_schema, gemini_schema, matches_schema
+from src.utils.llm_providers.sse import parse_sse_delta, StreamDone
+from src.utils.llm_providers.stub_server import StubBehaviour, StubLLMServer
+
+def serve(behaviour, calls):
+    """Run ``calls(session, base_url)`` against a fresh stub server"""
+    async def run():
+        server = TestServer(StubLLMServer(behaviour).app())
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                return await calls(session, str(server.make_url("")).rstrip("/"))
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+def test_behaviour_throttle_bursts():
+    behaviour = StubBehaviour(throttle_rate=1.0, throttle_burst=3, seed=1)
+    assert [behaviour.fault() for _ in range(3)] == [429, 429, 429]
+    behaviour.throttle_rate = 0.0
+    assert behaviour.fault() is None
+
+def test_chat_completion_honours_json_schema():
+    payload = {
+        "model": "google/gemini-2.0-flash-001",
+        "messages": [{"role": "user", "content": "Your move"}],
+        "response_format": {"type": "json_schema", "json_schema": {"name": "player_action", "schema": strict_json_schema(ACTION_SCHEMA)}}
+    }
+
+    async def calls(session, base):
+        async with session.post(f"{base}/v1/chat/completions", json=payload) as response:
+            return response.status, await response.json()
+
+    status, data = serve(StubBehaviour(latency_ms=0, distribution="fixed"), calls)
+    assert status == 200
+    action = json.loads(data["choices"][0]["message"]["content"])
+    assert matches_schema(action, ACTION_SCHEMA)
+    assert data["usage"]["prompt_tokens"] > 0
+
+def test_chat_completion_stream_parses_with_sse_client():
+    payload = {"model": "stub", "stream": True, "messages": [{"role": "user", "content": "Think it over"}]}
+
+    async def calls(session, base):
+        text = ""
+        async with session.post(f"{base}/v1/chat/completions", json=payload) as response:
+            async for line in response.content:
+                try:
+                    text += parse_sse_delta(line) or ""
+                except StreamDone:
+                    break
+        return text
+
+    text = serve(StubBehaviour(latency_ms=0, distribution="fixed", chunk_delay_ms=0), calls)
+    assert text.startswith("Stub analysis #1")
+
+def test_gemini_adapter_and_rate_limit_burst():
+    body = {
+        "contents": [{"role": "user", "parts": [{"text": "Your move"}]}],
+        "generationConfig": {"responseMimeType": "application/json", "responseSchema": gemini_schema(ACTION_SCHEMA)}
+    }
+
+    behaviour = StubBehaviour(latency_ms=0, distribution="fixed", throttle_rate=1.0, throttle_burst=1)
+
+    async def calls(session, base):
+        url = f"{base}/v1beta/models/gemini-2.0-flash:generateContent"
+        async with session.post(url, json=body) as throttled:
+            first, retry_after = throttled.status, throttled.headers.get("Retry-After")
+        behaviour.throttle_rate = 0.0
+        async with session.post(url, json=body) as response:
+            return first, retry_after, response.status, await response.json()
+
+    first, retry_after, status, data = serve(behaviour, calls)
+    assert first == 429 and retry_after == "1.0"
+    assert status == 200
+    text = data["candidates"][0]["content"]["parts"][0]["text"]
+    assert matches_schema(json.loads(text), ACTION_SCHEMA)
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from src.simulation import EloRatings, PairingTest, Tournament
+
+STRATEGIES = {"greedy": "take everything", "fair": "split evenly", "meek": "give coins away"}
+STRENGTH = {"take everything": 3, "split evenly": 2, "give coins away": 1}
+
+def scripted_tournament(**kwargs) -> Tournament:
+    """Tournament whose games are decided by a fixed strength order instead of an LLM"""
+    tournament = Tournament(STRATEGIES, concurrency=3, **kwargs)
+
+    async def play_1o1(strategy, opponent_strategy):
+        await asyncio.sleep(0)
+        winner = "Marco Polo" if STRENGTH[strategy] > STRENGTH[opponent_strategy] else "Trader Joe"
+        return {"game_id": "g", "winner": winner, "final_statuses": {}, "usage": {"total": {"cost_usd": 0.01}}}
+
+    tournament.simulator.play_1o1 = play_1o1
+    return tournament
+
+def test_sequential_test_stops_decided_pairings_early():
+    standings = scripted_tournament(games_per_pairing=50).run()
+    assert [row["strategy"] for row in standings["leaderboard"]] == ["greedy", "fair", "meek"]
+    decisions = {(p["a"], p["b"]): (p["decision"], p["games"]) for p in standings["pairings"]}
+    assert decisions[("greedy", "fair")][0] == "greedy"
+    # A perfectly one-sided pairing is settled long before the 50 game cap
+    assert all(games < 15 for _, games in decisions.values())
+    assert standings["stopped_by"] == "decided"
+
+def test_budget_caps_scheduling():
+    standings = scripted_tournament(budget_usd=0.05).run()
+    assert standings["games_played"] <= 6
+    assert standings["stopped_by"] == "budget"
+
+def test_swiss_pairs_each_strategy_once_per_wave():
+    tournament = scripted_tournament(format="swiss", max_games=4)
+    wave = tournament._swiss_wave()
+    assert len(wave) == 1  # three strategies: one pair plays, one sits out
+    assert tournament.run()["games_played"] == 4
+
+def test_elo_and_even_pairings():
+    ratings = EloRatings(["a", "b"])
+    ratings.update("a", "b", 1.0)
+    assert ratings.ratings["a"] == pytest.approx(1512.0)
+    test = PairingTest("a", "b", margin=0.3, max_games=100)
+    while not test.decided:
+        test.add(0.5)
+    assert test.decision == "even"
+
+def test_failing_games_end_the_tournament():
+    tournament = Tournament({"a": "x", "b": "y"}, max_errors=3)
+
+    async def play_1o1(strategy, opponent_strategy):
+        raise RuntimeError("provider down")
+
+    tournament.simulator.play_1o1 = play_1o1
+    standings = tournament.run()
+    assert standings["pairings"][0]["decision"] == "failed"
+    assert standings["games_played"] == standings["games_failed"] == 3
+
+    capped = Tournament({"a": "x", "b": "y"}, max_games=2)
+    capped.simulator.play_1o1 = play_1o1
+    assert capped.run()["stopped_by"] == "max_games"
@@ -0,0 +1,52 @@
+import json
+from src.utils.llm_providers.metrics import MetricsRegistry, call_labels
+from src.utils.llm_providers.stub import StubProvider
+from src.utils.llm_providers.tracing import TraceRecorder
+
+def test_sampling_keeps_errors():
+    recorder = TraceRecorder(sample_rate=0.0)
+    assert not recorder.record("stub", "stub", "prompt", "reply")
+    assert recorder.record("stub", "stub", "prompt", None, error="RuntimeError: boom")
+    recorder.flush()
+    traces = recorder.recent()
+    assert len(traces) == 1 and traces[0]["error"] == "RuntimeError: boom"
+    assert recorder.stats()["sampled_out"] == 1
+
+def test_counters_are_exact_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    recorder = TraceRecorder(sample_rate=1.0)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: recorder.record("stub", "stub", f"prompt {i}", "reply"), range(400)))
+    recorder.flush()
+    stats = recorder.stats()
+    assert stats["recorded"] == stats["written"] == 400
+
+def test_redaction_and_truncation(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    recorder = TraceRecorder(sample_rate=1.0, max_chars=40, path=str(path))
+    recorder.record("openrouter", "m", "key sk-abcdefghijklmnopqrstuvwxyz in prompt", "x" * 100)
+    recorder.flush()
+    trace = json.loads(path.read_text().strip())
+    assert "sk-abc" not in trace["prompt"] and "[REDACTED]" in trace["prompt"]
+    assert trace["response"].endswith("[60 chars truncated]")
+
+def test_full_queue_drops_instead_of_blocking():
+    recorder = TraceRecorder(sample_rate=1.0, queue_size=1)
+    recorder._writer = object()  # pretend the writer is busy so nothing drains
+    assert recorder.record("stub", "stub", "a", "b")
+    assert not recorder.record("stub", "stub", "c", "d")
+    assert recorder.stats()["dropped"] == 1
+
+def test_metrics_feed_traces_with_labels():
+    recorder = TraceRecorder(sample_rate=1.0)
+    provider = StubProvider(metrics=MetricsRegistry(tracer=recorder))
+    with call_labels(game_id="g1", phase="action"):
+        reply = provider.generate("Your move")
+    provider.generate("unattributed")
+    recorder.flush()
+
+    traces = recorder.recent(game_id="g1")
+    assert len(traces) == 1
+    assert traces[0]["phase"] == "action"
+    assert traces[0]["prompt"] == "Your move" and traces[0]["response"] == reply
+    assert len(recorder.recent()) == 2
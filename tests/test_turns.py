@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+import time
+import src.api  # noqa: F401  (resolves the router <-> runtime import cycle)
+from src.spaces.merchants_1o1.runtime.negotiation import NegotiationRuntime
+from src.utils.llm_providers.stub import StubProvider
+
+class SlowStubProvider(StubProvider):
+    """Stub whose every call takes ``delay`` seconds"""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def generate(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super().generate(*args, **kwargs)
+
+def make_runtime(concurrent_turns: bool, delay: float = 0.2) -> NegotiationRuntime:
+    return NegotiationRuntime(concurrent_turns=concurrent_turns, llm_provider=SlowStubProvider(delay))
+
+def test_concurrent_turn_overlaps_thinking_and_action():
+    runtime = make_runtime(concurrent_turns=True)
+    started = time.perf_counter()
+    events = asyncio.run(runtime.aprocess_player2_turn())
+    elapsed = time.perf_counter() - started
+
+    assert [e["name"] for e in events] == ["player_thinking", "player_action"]
+    assert "Stub reply" in events[0]["data"]["thinking"]
+    timing = events[1]["data"]["timing"]
+    assert elapsed < 0.35
+    assert timing["saved_seconds"] > 0.1
+    assert runtime.latency_saved > 0.1
+
+def test_sequential_turn_keeps_event_contract():
+    runtime = make_runtime(concurrent_turns=False, delay=0.0)
+    events = runtime.process_player2_turn()
+    assert [e["name"] for e in events] == ["player_thinking", "player_action"]
+    assert "timing" not in events[1]["data"]
+
+def test_sync_concurrent_turn_uses_worker_threads():
+    runtime = make_runtime(concurrent_turns=True)
+    started = time.perf_counter()
+    events = runtime.process_player2_turn()
+    assert time.perf_counter() - started < 0.35
+    assert events[1]["data"]["action"]["transfers"] == []
+
+def test_combined_turn_makes_one_call_and_splits_events():
+    provider = StubProvider()
+    runtime = NegotiationRuntime(combined_turns=True, llm_provider=provider)
+    events = asyncio.run(runtime.aprocess_player1_turn())
+
+    assert provider.calls == 1
+    assert runtime.turn_mode == "combined"
+    assert [e["name"] for e in events] == ["player_thinking", "player_action"]
+    assert events[0]["data"]["thinking"] == "stub"
+    assert events[1]["data"]["action"] == {"message": "Stub reply #1", "transfers": []}
+
+def test_simultaneous_round_overlaps_players():
+    runtime = make_runtime(concurrent_turns=False)
+    runtime.round_mode = "simultaneous"
+    started = time.perf_counter()
+    events = asyncio.run(runtime.aprocess_simultaneous_round())
+
+    # Two sequential calls per player run side by side: ~0.4s instead of ~0.8s
+    assert time.perf_counter() - started < 0.6
+    assert [(e["data"]["player"], e["name"]) for e in events] == [
+        ("Marco Polo", "player_thinking"), ("Marco Polo", "player_action"),
+        ("Trader Joe", "player_thinking"), ("Trader Joe", "player_action")
+    ]
+    assert runtime.latency_saved > 0.2
+
+def test_simultaneous_transfers_use_round_start_coins():
+    runtime = make_runtime(concurrent_turns=False, delay=0.0)
+    runtime.player1.coins, runtime.player2.coins = 10, 0
+    runtime._apply_simultaneous_transfers({
+        "Marco Polo": {"transfers": [{"recipient": "Trader Joe", "amount": 4}]},
+        # Trader Joe started the round with nothing, so cannot pass the 4 coins back
+        "Trader Joe": {"transfers": [{"recipient": "Marco Polo", "amount": 4}]}
+    })
+    assert runtime.get_player_statuses() == {"Marco Polo": 6, "Trader Joe": 4}
+    assert len(runtime.memory.transfers) == 1
+
+def test_unknown_round_mode_is_rejected():
+    with pytest.raises(ValueError):
+        NegotiationRuntime(round_mode="parallel")
+
+class SlowActionStubProvider(StubProvider):
+    """Stub whose structured (action) calls take ``delay`` seconds"""
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+
+    def generate(self, *args, response_schema=None, **kwargs):
+        if response_schema:
+            time.sleep(self.delay)
+        return super().generate(*args, response_schema=response_schema, **kwargs)
+
+def test_concurrent_turn_emits_thinking_before_the_action_finishes():
+    from datetime import datetime
+    from src.api.events.manager import GameEventManager
+    manager = GameEventManager("t1")
+    runtime = NegotiationRuntime(
+        event_manager=manager, concurrent_turns=True, llm_provider=SlowActionStubProvider(0.3)
+    )
+    events = asyncio.run(runtime.aprocess_player2_turn())
+    asyncio.run(runtime._emit_turn_events(events))
+
+    sent = [e for e in manager.history if e["name"] in ("player_thinking", "player_action")]
+    assert [e["name"] for e in sent] == ["player_thinking", "player_action"]
+    thinking_at, action_at = (datetime.fromisoformat(e["timestamp"]) for e in sent)
+    assert (action_at - thinking_at).total_seconds() > 0.2
+
+def test_concurrent_turns_are_opt_in():
+    assert NegotiationRuntime(llm_provider=StubProvider()).concurrent_turns is False